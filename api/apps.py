@@ -4,3 +4,19 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        # Register UserProfile save/delete receivers for the auth profile cache
+        from . import profile_cache  # noqa: F401
+        # ...the Post receivers that bump feed ETag versions
+        from . import conditional  # noqa: F401
+        # ...the Interest receivers that reload the interest catalog
+        from . import interest_catalog  # noqa: F401
+        # ...the Post delete receiver that drops interest index rows
+        from . import interest_feed  # noqa: F401
+        # ...the Post save receiver that copies location into indexed columns
+        from . import nearby  # noqa: F401
+        # ...the Post/UserProfile receivers that maintain search documents
+        from . import search  # noqa: F401
+        # ...and the BlockedUser receivers that drop cached block sets
+        from . import blocks  # noqa: F401
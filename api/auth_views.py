@@ -2,21 +2,34 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.contrib.auth.hashers import check_password, make_password
+from rest_framework.exceptions import AuthenticationFailed
+from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
-from .models import UserProfile, Interest, OTPVerification, PendingSignup
-from .serializers import UserProfileSerializer, InterestSerializer
+from .models import UserProfile, OTPVerification, PendingSignup
+from .serializers import UserProfileSerializer
 from .headers_util import (
     get_headers, get_or_create_guest_user, is_debug_mode,
     get_otp_for_debug_mode, verify_otp_in_debug_or_production,
     get_otp_message
 )
 from .sendmator_service import SendmatorService
+from .ratelimit import rate_limit_response
+from .profile_cache import invalidate_auth_profile
+from .passwords import check_password_bounded, PasswordHashBusy
+from .db_router import tolerates_replica_lag
+from .instrumentation import track_external
+from .conditional import not_modified, set_validators
+from .interest_catalog import get_catalog
+from .interest_ranking import get_area_index, rank_interests
+from .blocks import block_set
+from .interest_feed import build_interest_feed
+from .renderers import encode_json
 import uuid
 import requests
 import random
 import re
 from datetime import timedelta
+from django.http import HttpResponse
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
@@ -317,7 +330,8 @@ def get_location_details(lat, long):
 
         # Use Google Maps Geocoding API
         url = f"https://maps.googleapis.com/maps/api/geocode/json?latlng={lat},{long}&key={settings.GOOGLE_MAPS_API_KEY}"
-        response = requests.get(url, timeout=10)
+        with track_external('google_geocoding'):
+            response = requests.get(url, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -459,6 +473,9 @@ class SignupView(APIView):
         if not email_id and not number:
             return Response({'error': 'Either email_id or number is required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        if (email_id and not isinstance(email_id, str)) or (number and not isinstance(number, str)):
+            return Response({'error': 'email_id and number must be strings'}, status=status.HTTP_400_BAD_REQUEST)
+        
         if not lat or not long:
             return Response({'error': 'Location (lat, long) is required'}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -474,6 +491,15 @@ class SignupView(APIView):
         if not coords_valid:
             return Response({'error': coords_error}, status=status.HTTP_400_BAD_REQUEST)
         
+        # Throttle before geocoding, DB lookups or OTP sends
+        limited = rate_limit_response(
+            request, 'otp_send',
+            identifier=email_id.strip().lower() if email_id else number,
+            device_id=device_id
+        )
+        if limited:
+            return limited
+        
         # Get location details from coordinates
         location_details = get_location_details(lat, long)
         
@@ -703,6 +729,9 @@ class LoginView(APIView):
         if not email_id and not number:
             return Response({'error': 'Either email_id or number is required'}, status=status.HTTP_400_BAD_REQUEST)
         
+        if (email_id and not isinstance(email_id, str)) or (number and not isinstance(number, str)):
+            return Response({'error': 'email_id and number must be strings'}, status=status.HTTP_400_BAD_REQUEST)
+        
         # Validate phone number if provided
         if number:
             is_valid, phone_result = validate_phone_number(number)
@@ -710,6 +739,15 @@ class LoginView(APIView):
                 return Response({'error': phone_result}, status=status.HTTP_400_BAD_REQUEST)
             number = phone_result  # Use cleaned phone number
         
+        # Throttle before the user lookup and password check
+        limited = rate_limit_response(
+            request, 'login',
+            identifier=email_id.strip().lower() if email_id else number,
+            device_id=get_headers(request)[0]
+        )
+        if limited:
+            return limited
+        
         # Try to find user by email or phone
         try:
             if email_id:
@@ -719,10 +757,21 @@ class LoginView(APIView):
         except UserProfile.DoesNotExist:
             return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Verify password
-        if not user.password or not check_password(password, user.password):
+        # Verify password on the bounded hashing pool so login bursts can't occupy every worker
+        try:
+            password_ok, upgraded_hash = check_password_bounded(password, user.password)
+        except PasswordHashBusy:
+            response = Response({'error': 'Too many logins in progress. Please try again.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '1'
+            return response
+        
+        if not password_ok:
             return Response({'error': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
         
+        # Transparently move outdated hashes to the preferred hasher
+        if upgraded_hash:
+            UserProfile.objects.filter(userId=user.userId).update(password=upgraded_hash)
+        
         # Generate JWT tokens
         refresh = RefreshToken.for_user(user)
         
@@ -971,6 +1020,11 @@ class ResendOTPView(APIView):
         debug_body = request.data.get('debug', False)
         debug = debug_header or bool(debug_body)
 
+        # Throttle before any OTP send or DB write
+        limited = rate_limit_response(request, 'otp_send', identifier=identifier, device_id=device_id)
+        if limited:
+            return limited
+
         otp_result = handle_otp(identifier=identifier, is_email=is_email, app_mode=app_mode, debug=debug)
 
         if otp_result.get('session_token') or otp_result.get('otp'):
@@ -1165,29 +1219,14 @@ class SaveInterestsView(APIView):
     
     Requires authentication
     """
-    authentication_classes = []
-    permission_classes = []
+    permission_classes = []  # Missing credentials get the message-style body below
     
     def post(self, request):
-        # Get token from Authorization header
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Authentication credentials were not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        token = auth_header.replace('Bearer ', '').strip()
-        
-        # Decode and validate token
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-        except Exception:
+        # Token is validated once by UserProfileJWTAuthentication; only the id is needed here
+        if not request.user.is_authenticated:
             return Response({'message': 'Authentication credentials were not provided'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        # Get user
-        try:
-            user = UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return Response({'message': 'Authentication credentials were not provided'}, status=status.HTTP_401_UNAUTHORIZED)
+        user_id = request.user.userId
         
         # Get interests from request
         interests = request.data.get('interests')
@@ -1211,21 +1250,26 @@ class SaveInterestsView(APIView):
         if len(unique_interests) > 10:
             return Response({'message': 'Maximum 10 interests allowed'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Validate that all interest IDs exist in the master interests table
+        # Validate that all interest IDs exist in the master interests table (in-memory catalog)
+        catalog = get_catalog()
         valid_interests = []
         for interest_id in unique_interests:
-            try:
-                interest_obj = Interest.objects.get(interest_id=interest_id)
-                valid_interests.append({
-                    'id': interest_obj.interest_id,
-                    'name': interest_obj.name
-                })
-            except Interest.DoesNotExist:
+            interest = catalog.get(interest_id)
+            if interest is None:
                 return Response({'message': 'One or more interests are invalid'}, status=status.HTTP_404_NOT_FOUND)
-        
-        # Update user interests (replace, not append)
-        user.interests = unique_interests
-        user.save()
+            valid_interests.append({
+                'id': interest['id'],
+                'name': interest['name']
+            })
+        
+        # Update user interests (replace, not append) with a single UPDATE, no profile read
+        updated = UserProfile.objects.filter(userId=user_id).update(
+            interests=unique_interests,
+            updatedAt=timezone.now()
+        )
+        if not updated:
+            return Response({'message': 'Authentication credentials were not provided'}, status=status.HTTP_401_UNAUTHORIZED)
+        invalidate_auth_profile(user_id)  # .update() bypasses the post_save receiver
         
         return Response({
             'message': 'Interests updated successfully',
@@ -1236,34 +1280,20 @@ class SaveInterestsView(APIView):
 class GetInterestsView(APIView):
     """
     POST /get-interests/
-    Get available interests based on location
+    Get available interests, most popular near the given location first
     Request: {"lat": "...", "long": "..."}
     Requires authentication (Bearer token for logged-in or guest users)
     """
-    authentication_classes = []  # Disable DRF default authentication
-    permission_classes = []  # Disable DRF default permissions
+    permission_classes = []  # Missing credentials get the error body below
+    query_budget = 5  # catalog and area index versions and reloads (after a change), area ranking
     
+    @tolerates_replica_lag  # Catalog reads; the caller's own writes don't affect it
     def post(self, request):
-        # Get token from Authorization header
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
+        # Token is validated by UserProfileJWTAuthentication; the catalog
+        # doesn't depend on the profile, so no user row is loaded
+        if not request.user.is_authenticated:
             return Response({'error': 'No authentication token provided'}, status=status.HTTP_401_UNAUTHORIZED)
         
-        token = auth_header.replace('Bearer ', '').strip()
-        
-        # Decode and validate token
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-        except Exception:
-            return Response({'error': 'Invalid or expired token'}, status=status.HTTP_401_UNAUTHORIZED)
-        
-        # Verify user exists (can be regular user or guest)
-        try:
-            user = UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
-        
         lat = request.data.get('lat')
         long = request.data.get('long')
         
@@ -1275,11 +1305,22 @@ class GetInterestsView(APIView):
         if not coords_valid:
             return Response({'error': coords_error}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Return all interests (location can be used for future filtering)
-        interests = Interest.objects.all()
-        serializer = InterestSerializer(interests, many=True)
-        
-        return Response({'interests': serializer.data}, status=status.HTTP_200_OK)
+        # Catalog and nearest area both come from the worker's in-memory copies
+        catalog = get_catalog()
+        area_index = get_area_index()
+        pincode = area_index.nearest(lat_float, long_float, settings.INTEREST_AREA_MAX_KM)
+        etag = f'{catalog.version}.{area_index.version}.{pincode or "-"}'
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        
+        if pincode:
+            body = encode_json({'interests': rank_interests(catalog.interests, pincode)})
+        else:
+            # No known area nearby: catalog order, body already encoded
+            body = catalog.response_body
+        response = HttpResponse(body, content_type='application/json', status=status.HTTP_200_OK)
+        return set_validators(response, etag)
 
 
 class GuestLoginView(APIView):
@@ -1462,22 +1503,13 @@ class AppInitView(APIView):
     """
     def post(self, request):
         # Get and validate headers
-        device_id, app_mode, auth_token, headers_valid, headers_error = get_headers(request)
+        device_id, app_mode, _, headers_valid, headers_error = get_headers(request)
         if not headers_valid:
             return Response({'error': headers_error}, status=status.HTTP_400_BAD_REQUEST)
         
-        # If user has auth token, verify user exists
-        if auth_token:
-            try:
-                access_token = AccessToken(auth_token)
-                user_id = access_token['user_id']
-            except Exception:
-                return Response({'error': 'Invalid or expired token'}, status=status.HTTP_401_UNAUTHORIZED)
-            
-            try:
-                user = UserProfile.objects.get(userId=user_id)
-            except UserProfile.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        # If user has auth token (validated by UserProfileJWTAuthentication), return that user
+        if request.user.is_authenticated:
+            user = request.user
             
             # Return authenticated user
             return Response({
@@ -1518,32 +1550,17 @@ class GetFeedView(APIView):
     Request: {"lat": "...", "long": "..."}
     Requires authentication
     """
-    authentication_classes = []  # Disable DRF default authentication
-    permission_classes = []  # Disable DRF default permissions
+    permission_classes = []  # Missing credentials get the error body below
+    query_budget = 15  # profile, block set, catalog/area index versions and reloads, one scan per interest (max 5), posts, authors, likes, comments
 
     def post(self, request):
-        try:
-            # Get token from Authorization header
-            auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-            if not auth_header.startswith('Bearer '):
-                return Response({'error': 'No authentication token provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-            token = auth_header.replace('Bearer ', '').strip()
-
-            # Decode and validate token
-            from rest_framework_simplejwt.tokens import AccessToken
-            try:
-                access_token = AccessToken(token)
-                user_id = access_token['user_id']
-            except Exception as e:
-                return Response({'error': 'Invalid or expired token'}, status=status.HTTP_401_UNAUTHORIZED)
-
-            # Get user
-            try:
-                user = UserProfile.objects.get(userId=user_id)
-            except UserProfile.DoesNotExist:
-                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+        # Token is validated by UserProfileJWTAuthentication; the profile is
+        # loaded (once) on first attribute access below
+        if not request.user.is_authenticated:
+            return Response({'error': 'No authentication token provided'}, status=status.HTTP_401_UNAUTHORIZED)
+        user = request.user
 
+        try:
             lat = request.data.get('lat')
             long = request.data.get('long')
 
@@ -1559,7 +1576,8 @@ class GetFeedView(APIView):
             user_interests = user.interests if user.interests else []
 
             # Generate feed based on user's interests
-            feed_data = self.generate_interest_based_feed(user_interests, lat_float, long_float, user.is_guest)
+            feed_data = self.generate_interest_based_feed(user_interests, lat_float, long_float, user.is_guest,
+                                                         user.userId)
 
             return Response({
                 'feed': feed_data,
@@ -1573,19 +1591,19 @@ class GetFeedView(APIView):
                 }
             }, status=status.HTTP_200_OK)
 
+        except AuthenticationFailed:
+            # Token user no longer exists; let DRF render the 401
+            raise
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def generate_interest_based_feed(self, user_interests, lat, long, is_guest):
+    def generate_interest_based_feed(self, user_interests, lat, long, is_guest, user_id):
         """
-        Generate mock feed data based on user's interests
-        In production, this would query actual posts/content from database
+        Feed of real posts tagged with the user's interests, ranked by
+        recency and distance from (lat, long); see interest_feed
         """
-        import random
         import uuid
-        from datetime import datetime, timedelta
-
-        feed_items = []
+        from datetime import datetime
 
         # If no interests selected, return general feed
         if not user_interests:
@@ -1598,37 +1616,7 @@ class GetFeedView(APIView):
                 'location': {'lat': lat, 'long': long}
             }]
 
-        # Generate feed items for each interest
-        for interest in user_interests[:5]:  # Limit to first 5 interests for demo
-            # Create 2-3 posts per interest
-            for i in range(random.randint(2, 3)):
-                feed_item = {
-                    'id': str(uuid.uuid4()),
-                    'type': 'interest_post',
-                    'interest': interest,
-                    'title': f"{interest} Update #{i+1}",
-                    'content': self.generate_content_for_interest(interest),
-                    'image_url': f"https://picsum.photos/400/300?random={random.randint(1,1000)}",
-                    'author': {
-                        'name': f"User_{random.randint(1000,9999)}",
-                        'is_guest': random.choice([True, False])
-                    },
-                    'timestamp': (datetime.now() - timedelta(hours=random.randint(1, 24))).isoformat(),
-                    'location': {
-                        'lat': float(lat) + random.uniform(-0.01, 0.01),
-                        'long': float(long) + random.uniform(-0.01, 0.01),
-                        'distance': f"{random.uniform(0.5, 5.0):.1f} km away"
-                    },
-                    'engagement': {
-                        'likes': random.randint(0, 50),
-                        'comments': random.randint(0, 20),
-                        'shares': random.randint(0, 10)
-                    }
-                }
-                feed_items.append(feed_item)
-
-        # Sort by timestamp (most recent first)
-        feed_items.sort(key=lambda x: x['timestamp'], reverse=True)
+        feed_items = build_interest_feed(user_interests, lat, long, excluded_authors=block_set(user_id))
 
         # Add a welcome message for guest users
         if is_guest and feed_items:
@@ -1642,75 +1630,4 @@ class GetFeedView(APIView):
             }
             feed_items.insert(0, welcome_item)
 
-        return feed_items[:20]  # Return max 20 items
-
-    def generate_content_for_interest(self, interest):
-        """
-        Generate sample content based on interest category
-        """
-        content_templates = {
-            'Art': [
-                'Check out this amazing digital artwork I created! 🎨',
-                'Art exhibition opening tonight - who\'s coming?',
-                'Learning watercolor painting, here\'s my progress!',
-                'Street art in the city is incredible!'
-            ],
-            'Travel': [
-                'Just arrived in an amazing new city! ✈️',
-                'Hidden gems you must visit in this location',
-                'Travel tips for budget backpacking',
-                'Sunset views from the mountain top!'
-            ],
-            'Food': [
-                'Homemade pasta that turned out amazing! 🍝',
-                'Street food adventure - trying local delicacies',
-                'New restaurant review: must-try dishes!',
-                'Cooking tutorial: easy 30-minute meals'
-            ],
-            'Technology': [
-                'Latest gadget review - is it worth it? 📱',
-                'Coding project I\'m working on',
-                'Tech news: major breakthrough announced!',
-                'Setting up my home automation system'
-            ],
-            'Fashion': [
-                'Outfit of the day! What do you think? 👗',
-                'Thrifting finds that I\'m loving',
-                'Fashion tips for different body types',
-                'Sustainable fashion brands to check out'
-            ],
-            'Fitness': [
-                'Morning workout complete! 💪 Feeling energized',
-                'New exercise routine that\'s working great',
-                'Healthy meal prep for the week',
-                'Running my first 10k - training updates!'
-            ],
-            'Photography': [
-                'Captured this amazing sunset shot 📸',
-                'Photography tips for beginners',
-                'Editing workflow that I use',
-                'Street photography collection'
-            ],
-            'Music': [
-                'New song I\'m working on 🎵',
-                'Concert review: best show ever!',
-                'Music discovery: check out this artist',
-                'Learning to play guitar - progress update'
-            ],
-            'Sports': [
-                'Game day! Let\'s go team! ⚽',
-                'Training session was intense today',
-                'Sports analysis: breaking down the match',
-                'Weekend hike completed - amazing views!'
-            ],
-            'DIY': [
-                'DIY project completed! So proud of this 🛠️',
-                'Upcycling old furniture into something new',
-                'Home improvement tips and tricks',
-                'Crafting tutorial: easy weekend projects'
-            ]
-        }
-
-        import random
-        templates = content_templates.get(interest, ['Sharing something interesting about ' + interest])
-        return random.choice(templates)
+        return feed_items
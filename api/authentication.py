@@ -1,15 +1,81 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth.models import AnonymousUser
+from django.utils.functional import SimpleLazyObject
+from .db_router import PRIMARY_DB
 from .models import UserProfile
+from .profile_cache import get_cached_auth_profile, set_cached_auth_profile
+
+
+# Columns loaded for the authenticated user. Large JSON blobs (followers,
+# following) and address text stay deferred and are only fetched if a view
+# actually touches them; interests and coordinates are small and read when
+# creating posts or saving the profile (UserProfile.save derives geo_cell).
+AUTH_PROFILE_FIELDS = (
+    'userId', 'name', 'email', 'phone_number', 'profilePhoto', 'bio', 'is_guest', 'device_id',
+    'latitude', 'longitude', 'pincode', 'city', 'state', 'country',
+    'home_pincode', 'home_city', 'home_state',
+    'office_pincode', 'office_city', 'office_state',
+    'home_latitude', 'home_longitude', 'office_latitude', 'office_longitude',
+    'interests', 'updatedAt',
+)
+
+
+def load_auth_profile(user_id):
+    """
+    Fetch the authenticated user's profile with the auth column projection.
+    Served from the short-TTL profile cache when possible; on a miss the row
+    is read with .only() and cached for subsequent requests.
+
+    The instance is bound to the primary: views save it, and Django only
+    limits a deferred instance's save to its loaded fields when it is saved
+    to the database it was read from.
+    """
+    payload = get_cached_auth_profile(user_id)
+    if payload is not None:
+        # Rebuild a model instance with the same deferred fields as .only()
+        concrete_fields = UserProfile._meta.concrete_fields
+        values = [payload[f.attname] for f in concrete_fields if f.attname in payload]
+        return UserProfile.from_db(PRIMARY_DB, list(payload), values)
+
+    try:
+        profile = UserProfile.objects.using(PRIMARY_DB).only(*AUTH_PROFILE_FIELDS).get(userId=user_id)
+    except UserProfile.DoesNotExist:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+
+    set_cached_auth_profile(user_id, {field: getattr(profile, field) for field in AUTH_PROFILE_FIELDS})
+    return profile
+
+
+class LazyUserProfile(SimpleLazyObject):
+    """
+    Authenticated principal built from a validated token.
+    `userId` and the auth flags are answered from the token; the profile row
+    is loaded on first access to any other attribute and then reused for the
+    rest of the request (DRF memoizes request.user).
+    """
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.__dict__['userId'] = user_id
+        super().__init__(lambda: load_auth_profile(user_id))
+
+    def __bool__(self):
+        return True
+
+    def get_username(self):
+        return self.userId
+
 
 class UserProfileJWTAuthentication(JWTAuthentication):
     """Custom JWT authentication that maps token to UserProfile instead of default Django User model"""
     user_id_claim = 'user_id'  # Set the claim name
 
     def get_user(self, validated_token):
-        """Return a UserProfile object based on token claims.
+        """Return a lazily loaded UserProfile based on token claims.
         Will attempt to read the `user_id` claim. For our custom tokens, this should
-        match `UserProfile.userId`.
+        match `UserProfile.userId`. No query runs until the view needs more than the id.
         """
         user_id = validated_token.get(self.user_id_claim)
         # Fallback to common names
@@ -19,7 +85,4 @@ class UserProfileJWTAuthentication(JWTAuthentication):
         if not user_id:
             return AnonymousUser()
 
-        try:
-            return UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return AnonymousUser()
+        return LazyUserProfile(user_id)
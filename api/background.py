@@ -0,0 +1,64 @@
+"""
+Post-commit side effects, run off the request on a small per-process pool.
+
+run_after_commit(fn, *args) queues fn(*args) once the current transaction
+commits (straight away outside one) on BACKGROUND_WORKERS threads, so the
+response doesn't wait on derived writes such as search documents and
+interest tags. Tasks may run in any order, here or in another process, so
+each one must re-check the rows it derives from rather than trust arguments
+captured at commit (see search.reindex, interest_feed.tag_post). Failures are
+logged and dropped, and tasks still queued when a worker exits are lost:
+queue only work that a rebuild command can redo (rebuild_search_index,
+backfill_post_interests).
+
+With BACKGROUND_TASKS_INLINE (the default under tests) tasks run in the
+committing thread instead, errors propagate, and their queries aren't
+charged to the request's query_budget, as they wouldn't be in production.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from .instrumentation import detached_metrics
+
+
+logger = logging.getLogger('api.background')
+
+_executor = None
+_init_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2), thread_name_prefix='background'
+                )
+    return _executor
+
+
+def _run(fn, args):
+    # Same connection hygiene as a request: drop connections past CONN_MAX_AGE or broken
+    close_old_connections()
+    try:
+        fn(*args)
+    except Exception:
+        logger.exception('Background task %s failed', getattr(fn, '__qualname__', fn))
+    finally:
+        close_old_connections()
+
+
+def _run_inline(fn, args):
+    with detached_metrics():
+        fn(*args)
+
+
+def run_after_commit(fn, *args):
+    """Run fn(*args) in the background after the current transaction commits"""
+    if getattr(settings, 'BACKGROUND_TASKS_INLINE', False):
+        transaction.on_commit(lambda: _run_inline(fn, args))
+    else:
+        transaction.on_commit(lambda: _get_executor().submit(_run, fn, args))
@@ -0,0 +1,77 @@
+"""
+Block lists.
+
+A block hides each user from the other, so every check uses the viewer's
+bidirectional block set: the users they blocked plus the users who blocked
+them, read with one indexed query. With a shared cache (SHARED_CACHE, i.e.
+REDIS_URL) sets are cached per user (empty ones too, which is most viewers)
+and dropped for both users once a block or unblock commits. Per-process
+caches are never used: a block made through one worker must hide both users
+in every worker straight away.
+Feed queries apply the set as one NOT IN on the author column, so a LIMITed
+page still comes back full.
+
+Bulk writes (bulk_create, .update()) bypass the receivers; callers must call
+invalidate_block_sets() themselves.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .metrics import record_cache_lookup
+from .models import BlockedUser
+
+
+# Bump when the cached value's shape changes
+BLOCK_SET_CACHE_VERSION = 1
+BLOCK_SET_TTL = 24 * 3600
+
+
+def _cache_key(user_id):
+    return f'blocks:v{BLOCK_SET_CACHE_VERSION}:{user_id}'
+
+
+def _load_block_set(user_id):
+    pairs = BlockedUser.objects.filter(Q(blockerUserId=user_id) | Q(blockedUserId=user_id)) \
+        .order_by().values_list('blockerUserId', 'blockedUserId')
+    return frozenset(blocked if blocker == user_id else blocker for blocker, blocked in pairs)
+
+
+def block_set(user_id):
+    """frozenset of users user_id has blocked or been blocked by"""
+    if not settings.SHARED_CACHE:
+        return _load_block_set(user_id)
+    key = _cache_key(user_id)
+    cached = cache.get(key)
+    record_cache_lookup('block_set', cached is not None)
+    if cached is not None:
+        return frozenset(cached)
+    blocked = _load_block_set(user_id)
+    cache.set(key, sorted(blocked), timeout=BLOCK_SET_TTL)
+    return blocked
+
+
+def invalidate_block_sets(*user_ids):
+    """Drop the cached sets after the current transaction commits"""
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def block_user(blocker_id, blocked_id):
+    """Returns: True if a new block was created"""
+    _, created = BlockedUser.objects.get_or_create(blockerUserId=blocker_id, blockedUserId=blocked_id)
+    return created
+
+
+def unblock_user(blocker_id, blocked_id):
+    """Returns: True if a block was removed"""
+    deleted, _ = BlockedUser.objects.filter(blockerUserId=blocker_id, blockedUserId=blocked_id).delete()
+    return bool(deleted)
+
+
+@receiver(post_save, sender=BlockedUser)
+@receiver(post_delete, sender=BlockedUser)
+def _invalidate_on_block_change(sender, instance, **kwargs):
+    invalidate_block_sets(instance.blockerUserId, instance.blockedUserId)
@@ -0,0 +1,83 @@
+"""
+Per-process circuit breakers for outbound integrations (Sendmator, Google).
+
+After CIRCUIT_BREAKER_FAILURE_THRESHOLD consecutive failed calls (timeouts,
+connection errors) the breaker opens and calls fail fast with
+CircuitOpenError for CIRCUIT_BREAKER_RESET_SECONDS; then one trial call is
+let through (half-open) and its outcome closes or re-opens the breaker.
+CircuitOpenError is a requests ConnectionError, so existing handlers around
+requests calls treat it like the service being unreachable.
+"""
+import threading
+import time
+import requests
+from django.conf import settings
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of calling a service whose breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state(time.monotonic())
+
+    def _state(self, now):
+        if self._opened_at is None:
+            return CLOSED
+        if now - self._opened_at >= getattr(settings, 'CIRCUIT_BREAKER_RESET_SECONDS', 30):
+            return HALF_OPEN
+        return OPEN
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through"""
+        with self._lock:
+            state = self._state(time.monotonic())
+            if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+                raise CircuitOpenError(f'{self.name} circuit is open')
+            if state == HALF_OPEN:
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= getattr(settings, 'CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5):
+                self._opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker(name))
+    return breaker
+
+
+def breaker_states():
+    """{service: state} for every breaker used by this process"""
+    return {name: breaker.state for name, breaker in sorted(_breakers.items())}
@@ -0,0 +1,96 @@
+"""
+Conditional requests (ETag / Last-Modified) for read endpoints that mobile
+clients re-fetch on every app open: the home feed, the interest catalog and
+user profiles.
+
+Validators come from cheap version values rather than the response body, so
+a matching If-None-Match is answered with 304 before the main queries run
+and before anything is serialized:
+
+- feed: per-pincode version token, bumped on any Post save/delete in that
+  pincode and when a post is hidden or restored, plus the request parameters and a time
+  bucket of FEED_ETAG_MAX_AGE seconds (bounds how stale relative times like
+  "5min" and author names can get)
+- interests: the interest catalog version (see interest_catalog)
+- profiles: userId + updatedAt, also sent as Last-Modified
+
+Feed versions are data_versions tokens, replaced in the writing transaction,
+so every worker sees a new post as soon as it commits (a per-process cache
+would keep answering 304 on the others). Bulk writes (bulk_create,
+.update()) bypass the signals; callers must call bump_feed_version()
+themselves.
+
+HomeFeedView and GetInterestsView are POST reads, so a match returns 304
+there too instead of the 412 RFC 9110 prescribes for unsafe methods.
+"""
+import hashlib
+import time
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from .data_versions import bump_version, current_version
+from .models import Post
+
+
+FEED_VERSION_PREFIX = 'feed'
+
+
+def _feed_version_name(pincode):
+    return f'{FEED_VERSION_PREFIX}:{pincode}'
+
+
+def feed_version(pincode):
+    """Version of the posts in pincode; one primary key lookup"""
+    return current_version(_feed_version_name(pincode))
+
+
+def bump_feed_version(pincode):
+    """Give pincode's feed a new version as part of the current transaction"""
+    bump_version(_feed_version_name(pincode))
+
+
+def feed_etag(user_id, pincode, params):
+    """ETag for a feed page: pincode version + request parameters + time bucket"""
+    bucket = int(time.time() // getattr(settings, 'FEED_ETAG_MAX_AGE', 300))
+    raw = repr((feed_version(pincode), user_id, pincode, sorted(params.items()), bucket))
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    304 response when the client's If-None-Match (or, without one,
+    If-Modified-Since) matches; None means the view should build the body.
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        # Weak comparison: W/"x" matches "x"
+        matched = '*' in etags or quote_etag(etag) in [e.removeprefix('W/') for e in etags]
+    elif last_modified is not None:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        matched = since is not None and int(last_modified.timestamp()) <= since
+    else:
+        matched = False
+    if not matched:
+        return None
+    return set_validators(HttpResponseNotModified(), etag, last_modified)
+
+
+def set_validators(response, etag, last_modified=None):
+    """Attach ETag/Last-Modified; clients must revalidate before reusing"""
+    response['ETag'] = quote_etag(etag)
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def _bump_feed_on_post_change(sender, instance, **kwargs):
+    if instance.pincode:
+        bump_feed_version(instance.pincode)
+
@@ -0,0 +1,32 @@
+"""
+Version tokens for data that every worker keeps an in-memory copy of
+(the interest catalog, the interest ranking area grid) or validates
+clients' copies against (per-pincode feed ETags).
+
+A writer replaces the token inside its own transaction, so the new version
+becomes visible exactly when the data does and can't be lost between the
+commit and a cache write. Readers compare the token (one primary key
+lookup) with the version of their copy and reload when it differs. Unlike a
+token in a per-process cache, this reaches every worker and process. Tokens
+are random rather than counters, so a rolled back or restored row never
+matches a copy loaded from data that no longer exists.
+"""
+from uuid import uuid4
+from django.db import connections, router
+from .models import DataVersion
+
+
+def current_version(name):
+    """Current token for name; '' until it is first bumped"""
+    return DataVersion.objects.filter(name=name).values_list('version', flat=True).first() or ''
+
+
+def bump_version(name):
+    """Give name a new token as part of the current transaction"""
+    connection = connections[router.db_for_write(DataVersion)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'INSERT INTO data_versions (name, version) VALUES (%s, %s) '
+            'ON CONFLICT (name) DO UPDATE SET version = excluded.version',
+            [name, uuid4().hex],
+        )
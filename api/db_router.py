@@ -0,0 +1,93 @@
+"""
+Database router for the primary + read-replica setup.
+
+Writes and migrations always go to `default`. Inside a request (see
+ReplicaStickinessMiddleware) reads are spread over the replica aliases
+(settings.DATABASE_REPLICAS, or every alias other than `default`), except:
+- while a transaction is open on `default`, so it can see its own writes
+- after the request itself wrote, and for DB_REPLICA_STICKY_SECONDS after a
+  client's last write (read-your-writes), unless the view is decorated with
+  @tolerates_replica_lag
+Reads outside a request (management commands, scripts) stay on `default`.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.db import connections
+
+
+PRIMARY_DB = 'default'
+
+
+class RoutingState:
+    """Per-request routing flags"""
+    __slots__ = ('pinned_to_primary', 'wrote', 'tolerates_lag')
+
+    def __init__(self, pinned_to_primary=False):
+        self.pinned_to_primary = pinned_to_primary
+        self.wrote = False
+        self.tolerates_lag = False
+
+
+_state = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases():
+    """Replica aliases configured for this process"""
+    configured = getattr(settings, 'DATABASE_REPLICAS', None)
+    if configured is None:
+        configured = [alias for alias in settings.DATABASES if alias != PRIMARY_DB]
+    return [alias for alias in configured if alias in settings.DATABASES]
+
+
+@contextmanager
+def request_routing(pinned_to_primary=False):
+    """Scope replica routing to one request; yields its RoutingState"""
+    state = RoutingState(pinned_to_primary)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def tolerates_replica_lag(view_method):
+    """Let a view read from replicas even right after the client wrote"""
+    @wraps(view_method)
+    def wrapper(*args, **kwargs):
+        state = _state.get()
+        if state is None:
+            return view_method(*args, **kwargs)
+        previous = state.tolerates_lag
+        state.tolerates_lag = True
+        try:
+            return view_method(*args, **kwargs)
+        finally:
+            state.tolerates_lag = previous
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or connections[PRIMARY_DB].in_atomic_block:
+            return PRIMARY_DB
+        if not state.tolerates_lag and (state.pinned_to_primary or state.wrote):
+            return PRIMARY_DB
+        replicas = replica_aliases()
+        return random.choice(replicas) if replicas else PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # All aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY_DB
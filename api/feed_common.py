@@ -0,0 +1,95 @@
+"""
+Pieces shared by the paged feed-style endpoints (nearby posts and people,
+search, blocks, reports, the moderation queue).
+
+Keyset cursors are opaque to clients: the last row's sort key, joined with
+':' and base64 encoded. Each paged module declares the types of its key
+(e.g. NEARBY_CURSOR_TYPES) and views decode with those, so a cursor from
+one endpoint or a hand-edited one is rejected instead of misread.
+
+FeedViewMixin gives views the feed error body
+({"error": {"code", "message"}}) and the request parsing they have in common.
+"""
+import base64
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def encode_cursor(*parts):
+    """Cursor for a sort key of floats, ints and strings (only the last part may contain ':')"""
+    # str() of a float round-trips exactly
+    return base64.urlsafe_b64encode(':'.join(str(part) for part in parts).encode()).decode()
+
+
+def decode_cursor(cursor, *types):
+    """
+    The parts of an encode_cursor() cursor, each converted with types (e.g. float, int, str).
+    Raises ValueError if malformed
+    """
+    try:
+        parts = base64.urlsafe_b64decode(cursor.encode()).decode().split(':', len(types) - 1)
+    except (AttributeError, UnicodeError, TypeError) as exc:
+        raise ValueError('malformed cursor') from exc
+    if len(parts) != len(types):
+        raise ValueError('malformed cursor')
+    return tuple(convert(part) for convert, part in zip(types, parts))
+
+
+class FeedViewMixin:
+    """Feed-style error responses and shared request parsing for APIViews"""
+
+    def _error(self, message, code='INVALID_REQUEST', http_status=status.HTTP_400_BAD_REQUEST):
+        return Response({
+            'error': {
+                'code': code,
+                'message': message
+            }
+        }, status=http_status)
+
+    def _unauthorized(self):
+        return self._error('Authentication credentials were not provided', 'UNAUTHORIZED',
+                           status.HTTP_401_UNAUTHORIZED)
+
+    def _parse_limit(self, request, default, maximum):
+        """The body's limit, or default when it is missing or outside 1 .. maximum"""
+        try:
+            limit = int(request.data.get('limit', default))
+        except (ValueError, TypeError):
+            return default
+        return limit if 1 <= limit <= maximum else default
+
+    def _parse_location(self, request, default=None):
+        """
+        (lat, long) from the body, or default ((lat, long)) when neither is given.
+        Returns: ((lat, long), error message or None)
+        """
+        lat, long = request.data.get('lat'), request.data.get('long')
+        if lat is None and long is None and default is not None:
+            lat, long = default
+        try:
+            lat, long = float(lat), float(long)
+        except (TypeError, ValueError):
+            return None, 'lat and long are required numbers'
+        if not (-90 <= lat <= 90 and -180 <= long <= 180):
+            return None, 'lat must be within [-90, 90] and long within [-180, 180]'
+        return (lat, long), None
+
+    def _parse_radius(self, request, default, maximum):
+        """Returns: (radius_km from the body or default, error message or None)"""
+        try:
+            radius_km = float(request.data.get('radius_km', default))
+        except (TypeError, ValueError):
+            radius_km = -1
+        if not 0 < radius_km <= maximum:
+            return None, f'radius_km must be greater than 0 and at most {maximum:g}'
+        return radius_km, None
+
+    def _parse_cursor(self, request, types):
+        """Returns: (decode_cursor() of the body's cursor, or None without one; error message or None)"""
+        cursor = request.data.get('cursor')
+        if not cursor:
+            return None, None
+        try:
+            return decode_cursor(cursor, *types), None
+        except ValueError:
+            return None, 'Invalid cursor'
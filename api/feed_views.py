@@ -1,18 +1,40 @@
+import logging
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
 from django.db.models import Count, Q, Prefetch
 from django.utils import timezone
+from django.conf import settings
 from .models import (
     UserProfile, Post, PostLike, PostSave, PostComment, 
     BlockedUser, ReportedContent, Follower
 )
 from .constants import PINCODE_HOME_ID, PINCODE_OFFICE_ID, PINCODE_PREFIX
+from .blocks import block_set, block_user, unblock_user
+from .conditional import feed_etag, not_modified, set_validators
+from .db_router import tolerates_replica_lag
+from .feed_common import FeedViewMixin
+from .moderation import (
+    MAX_REASON_LENGTH, QUEUE_CURSOR_TYPES, QUEUE_MAX_PAGE_SIZE, QUEUE_PAGE_SIZE, REPORTABLE_TYPES, RESOLUTIONS,
+    content_exists, is_moderator, moderation_queue, report_content, resolve_report
+)
+from .nearby import (
+    NEARBY_CURSOR_TYPES, NEARBY_DEFAULT_RADIUS_KM, NEARBY_PAGE_SIZE, NEARBY_MAX_PAGE_SIZE, nearby_posts
+)
+from .people_nearby import (
+    PEOPLE_CURSOR_TYPES, PEOPLE_DEFAULT_RADIUS_KM, PEOPLE_PAGE_SIZE, PEOPLE_MAX_PAGE_SIZE, nearby_people
+)
+from .post_creation import create_post, validate_post
+from .search import (
+    MIN_QUERY_LENGTH, SEARCH_CURSOR_TYPES, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE, query_terms, search
+)
 import math
 
 
-class HomeFeedView(APIView):
+logger = logging.getLogger(__name__)
+
+
+class HomeFeedView(FeedViewMixin, APIView):
     """
     POST /home-feed
 
@@ -20,10 +42,12 @@ class HomeFeedView(APIView):
     Request body: {"filters": ["entertainment", "sports"], "page_id": "", "limit": 10, "pin_code": "560034"}
     Supports authenticated users, guest users with PIN, and guest users without PIN
     """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 6  # profile, block set, feed version, page cursor, posts, authors
 
     def _get_pin_scoped_feed(self, user, pin_code, filters, page_id, limit):
         """Generate PIN-scoped personal feed for authenticated users"""
-        posts_query = Post.objects.all()
+        posts_query = Post.objects.filter(hidden=False)
         
         # PIN Code = Feed Namespace: Filter posts by PIN code
         # Users in the same PIN see each other's posts (shared feed room)
@@ -72,7 +96,7 @@ class HomeFeedView(APIView):
 
     def _get_pin_scoped_feed(self, user, user_pincodes, filters, page_id, limit):
         """Generate PIN-scoped personal feed for authenticated users"""
-        posts_query = Post.objects.all()
+        posts_query = Post.objects.filter(hidden=False)
         
         # PIN Codes = Feed Namespaces: Filter posts by any of user's PIN codes
         # Users see posts from all their associated PIN codes (multiple shared feed rooms)
@@ -121,7 +145,7 @@ class HomeFeedView(APIView):
 
     def _get_random_exploratory_feed(self, user, filters, page_id, limit):
         """Generate random exploratory feed for authenticated users without PIN"""
-        posts_query = Post.objects.all()
+        posts_query = Post.objects.filter(hidden=False)
         
         # Apply filters if provided
         if filters:
@@ -169,58 +193,42 @@ class HomeFeedView(APIView):
         Return home feed with all posts
         Authentication required
         """
-        # Authentication is ALWAYS required
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({
-                'error': {
-                    'code': 'UNAUTHORIZED',
-                    'message': 'Authentication credentials were not provided'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.replace('Bearer ', '').strip()
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-            current_user = UserProfile.objects.get(userId=user_id)
-        except Exception:
-            return Response({
-                'error': {
-                    'code': 'INVALID_TOKEN',
-                    'message': 'Invalid or expired authentication token'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
+        # Authentication is ALWAYS required (token already validated by UserProfileJWTAuthentication)
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
 
         # Parse request parameters
         filters = request.data.get('filters', [])
         page_id = request.data.get('page_id', '')
-        limit = request.data.get('limit', 10)
+        limit = self._parse_limit(request, 10, 50)
         pin_code = request.data.get('pin_code')  # Optional pincode override
         
-        try:
-            limit = int(limit)
-            if limit < 1 or limit > 50:
-                limit = 10 
-        except (ValueError, TypeError):
-            limit = 10
-        
         # Determine pincode to use for filtering
         if pin_code:
             # Validate provided pincode
             if not pin_code.isdigit() or len(pin_code) != 6:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_PINCODE',
-                        'message': 'pin_code must be a valid 6-digit pincode'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
+                return self._error('pin_code must be a valid 6-digit pincode', 'INVALID_PINCODE')
             user_pincode = pin_code
         else:
             # Use user's default pincode or default to 110059
             user_pincode = current_user.home_pincode or current_user.pincode or "110059"
         
-        posts_query = Post.objects.filter(pincode=user_pincode)
+        # Authors hidden by a block either way; part of the ETag so (un)blocking changes it
+        blocked = block_set(current_user.userId)
+
+        # Unchanged since the client's copy: answer 304 before querying posts
+        etag = feed_etag(current_user.userId, user_pincode, {
+            'filters': filters, 'page_id': page_id, 'limit': limit, 'blocked': sorted(blocked)
+        })
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        
+        posts_query = Post.objects.filter(pincode=user_pincode, hidden=False)
+        if blocked:
+            # One NOT IN in the page query, so LIMIT still fills the page
+            posts_query = posts_query.exclude(userId__in=blocked)
         
         # Apply filters if provided
         if filters:
@@ -256,23 +264,24 @@ class HomeFeedView(APIView):
             except (Post.DoesNotExist, ValueError):
                 pass
         
-        posts = posts_query.order_by('-timestamp')[:limit]
-        
-        # Determine if there are more posts available
-        has_more = len(posts) == limit
-        
-        # Debug info
-        total_posts = posts_query.count()
+        # One extra row tells whether there is another page, without counting the pincode's posts
+        posts = list(posts_query.order_by('-timestamp')[:limit + 1])
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+
+        # Load every author on the page in one query
+        authors = UserProfile.objects.filter(
+            userId__in={post.userId for post in posts}
+        ).only('userId', 'name', 'profilePhoto').in_bulk()
         
         # Format posts for the feed
         feed_posts = []
         for post in posts:
-            # Get user profile for the post author
-            try:
-                post_user = UserProfile.objects.get(userId=post.userId)
+            post_user = authors.get(post.userId)
+            if post_user is not None:
                 author_name = post_user.name or f"User {post.userId[:8]}"
                 author_avatar = post_user.profilePhoto or "https://i.pravatar.cc/150?img=33"
-            except UserProfile.DoesNotExist:
+            else:
                 author_name = f"User {post.userId[:8]}"
                 author_avatar = "https://i.pravatar.cc/150?img=33"
             
@@ -510,65 +519,38 @@ class HomeFeedView(APIView):
             }
         }
         
-        return Response({
+        response = Response({
             'results': feed_posts,
             'has_more': has_more,
             'header': header,
             'debug': {
-                'total_pincode_posts': total_posts,
                 'returned_posts': len(feed_posts),
                 'user_id': current_user.userId,
                 'pincode': user_pincode
             }
         }, status=status.HTTP_200_OK)
+        return set_validators(response, etag)
 
-class CreatePostView(APIView):
+class CreatePostView(FeedViewMixin, APIView):
     """
     PUT /create-post - Returns the UI schema for the create post screen
     POST /create-post - Creates a new post with provided data
 
     Both methods require authentication
     """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 5  # profile, catalog version and reload (after a change), insert, feed version; tags and search document follow after commit
 
     def put(self, request):
         """
         Return the exact structure from expect.json
         Requires authentication
         """
-        # Step 1: Authentication Validation
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({
-                'error': {
-                    'code': 'UNAUTHORIZED',
-                    'message': 'Authentication credentials were not provided'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.replace('Bearer ', '').strip()
-
-        # Decode and validate token
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-        except Exception:
-            return Response({
-                'error': {
-                    'code': 'INVALID_TOKEN',
-                    'message': 'Invalid or expired authentication token'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        # Get user and verify account status
-        try:
-            current_user = UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return Response({
-                'error': {
-                    'code': 'USER_NOT_FOUND',
-                    'message': 'User account not found'
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+        # Step 1: Authentication Validation (token already validated by UserProfileJWTAuthentication;
+        # the profile row is loaded on first use of current_user)
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
 
         # Check if user is guest (guests shouldn't access create post)
         # if current_user.is_guest:
@@ -739,432 +721,425 @@ class CreatePostView(APIView):
 
 
     def post(self, request):
-        """
-        Create a new post with the provided data
-        Requires authentication
-        """
-        # Step 1: Authentication Validation
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({
-                'error': {
-                    'code': 'UNAUTHORIZED',
-                    'message': 'Authentication credentials were not provided'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.replace('Bearer ', '').strip()
-
-        # Decode and validate token
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-        except Exception:
-            return Response({
-                'error': {
-                    'code': 'INVALID_TOKEN',
-                    'message': 'Invalid or expired authentication token'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        # Get user and verify account status
-        try:
-            current_user = UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return Response({
-                'error': {
-                    'code': 'USER_NOT_FOUND',
-                    'message': 'User account not found'
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+        """Create a post in the user's home or office pincode (pincode_id: pincode_<home|office>_<pincode>)"""
+        return _create_post_response(self, request, profile_ids=False,
+                                     success_message='Post created successfully', failure_message='Failed to create post')
 
-        # Check if user is guest (guests shouldn't create posts)
-        # if current_user.is_guest:
-        #     return Response({
-        #         'error': {
-        #             'code': 'ACCESS_DENIED',
-        #             'message': 'Guest users cannot create posts'
-        #         }
-        #     }, status=status.HTTP_403_FORBIDDEN)
 
-        # Step 2: Request Validation
-        post_type = request.data.get('post_type')
-        content = request.data.get('content', '').strip()
-        photo_url = request.data.get('photo_url')
-        pincode_id = request.data.get('pincode_id')
-
-        # Validate post_type
-        valid_types = ['post', 'question', 'alert', 'recommendation']
-        if not post_type or post_type not in valid_types:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': f'post_type is required and must be one of: {", ".join(valid_types)}'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate content (required)
-        if not content:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'content is required'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate content length (max 500 chars)
-        if len(content) > 500:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'content must not exceed 500 characters'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate pincode_id (required)
-        if not pincode_id:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'pincode_id is required'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Parse pincode_id and ensure it refers to user's home or office pincode
-        try:
-            pincode_parts = pincode_id.split('_')
-            if len(pincode_parts) >= 3 and pincode_parts[0] == PINCODE_PREFIX:
-                pincode_type = pincode_parts[1]  # 'home' or 'office'
-                pincode = pincode_parts[-1].strip()
-            else:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_REQUEST',
-                        'message': 'Invalid pincode_id format'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-        except (IndexError, AttributeError):
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'Invalid pincode_id format'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate pincode format (6 digits)
-        if not pincode.isdigit() or len(pincode) != 6:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'Invalid pincode format'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Ensure pincode_id type (home/office) and that the pincode belongs to the user
-        if pincode_type == 'home':
-            expected = (getattr(current_user, 'home_pincode', None) or getattr(current_user, 'pincode', None))
-            if not expected:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_REQUEST',
-                        'message': 'User has no home pincode set'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-            if str(expected).strip() != pincode:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_REQUEST',
-                        'message': 'Provided pincode does not match user home pincode'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-        elif pincode_type == 'office':
-            expected = getattr(current_user, 'office_pincode', None)
-            if not expected:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_REQUEST',
-                        'message': 'User has no office pincode set'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-            if str(expected).strip() != pincode:
-                return Response({
-                    'error': {
-                        'code': 'INVALID_REQUEST',
-                        'message': 'Provided pincode does not match user office pincode'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'pincode_id must reference home or office'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Step 3: Create the post
-        try:
-            # Determine media type and URL
-            if photo_url and photo_url.strip():
-                media_type = 'image'
-                media_url = photo_url.strip()
-            else:
-                media_type = 'text'  # Use text for posts without images
-                media_url = None  # No media URL for text posts
-
-            # Create the post
-            post = Post.objects.create(
-                userId=user_id,
-                post_type=post_type,
-                description=content,
-                mediaType=media_type,
-                mediaURL=media_url,
-                pincode=pincode,
-                location={}  # Empty location object for now
-            )
-
-            # Build dynamic response based on actual saved data
-            response_data = {
-                'post_id': post.postId,
-                'user_id': post.userId,
-                'post_type': post.post_type,
-                'content': post.description,
-                'pincode': post.pincode,
-                'pincode_id': pincode_id,  # Include original pincode_id for reference
-                'timestamp': post.timestamp.isoformat(),
-                'media_type': post.mediaType,
+class SavePostView(FeedViewMixin, APIView):
+    """
+    POST /save-post
+
+    Saves a new post with validation
+    Requires authentication
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 5  # profile, catalog version and reload (after a change), insert, feed version; tags and search document follow after commit
+
+    def post(self, request):
+        """Save a post; pincode_id may also be PINCODE_HOME_ID / PINCODE_OFFICE_ID"""
+        return _create_post_response(self, request, profile_ids=True,
+                                     success_message='Post saved successfully', failure_message='Failed to save post')
+
+
+def _create_post_response(view, request, profile_ids, success_message, failure_message):
+    """POST handler shared by CreatePostView and SavePostView (see api/post_creation.py)"""
+    # Authentication Validation (token already validated by UserProfileJWTAuthentication;
+    # the profile row is loaded on first use of current_user)
+    current_user = request.user
+    if not current_user.is_authenticated:
+        return view._unauthorized()
+
+    draft, error = validate_post(current_user, request.data, profile_ids)
+    if error:
+        return view._error(error)
+
+    try:
+        post = create_post(current_user.userId, draft)
+    except Exception as e:
+        logger.exception(failure_message)
+        return Response({
+            'error': {
+                'code': 'INTERNAL_ERROR',
+                'message': failure_message,
+                'details': str(e) if settings.DEBUG else None
             }
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-            # Only include media_url if it exists
-            if post.mediaURL:
-                response_data['media_url'] = post.mediaURL
-
-            # Include original photo_url if provided (for debugging)
-            if photo_url:
-                response_data['original_photo_url'] = photo_url
-
-            return Response({
-                'success': True,
-                'message': 'Post created successfully',
-                'data': response_data
-            }, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            print(f"Error creating post: {e}")  # Add logging for debugging
-            return Response({
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to create post',
-                    'details': str(e) if settings.DEBUG else None
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    # Build dynamic response based on actual saved data
+    response_data = {
+        'post_id': post.postId,
+        'user_id': post.userId,
+        'post_type': post.post_type,
+        'content': post.description,
+        'pincode': post.pincode,
+        'pincode_id': request.data.get('pincode_id'),  # Include original pincode_id for reference
+        'timestamp': post.timestamp.isoformat(),
+        'media_type': post.mediaType,
+        'interests': draft['interest_ids'],
+        'location': post.location,
+    }
+
+    # Only include media_url if it exists
+    if post.mediaURL:
+        response_data['media_url'] = post.mediaURL
+
+    # Include original photo_url if provided (for debugging)
+    photo_url = request.data.get('photo_url')
+    if photo_url:
+        response_data['original_photo_url'] = photo_url
+
+    return Response({
+        'success': True,
+        'message': success_message,
+        'data': response_data
+    }, status=status.HTTP_201_CREATED)
 
 
-class SavePostView(APIView):
+class NearbyPostsView(FeedViewMixin, APIView):
     """
-    POST /save-post
+    POST /nearby-posts
 
-    Saves a new post with validation
+    Returns posts within radius_km of a point, nearest first
+    Request body: {"lat": 12.97, "long": 77.59, "radius_km": 5, "limit": 20, "cursor": ""}
+    Pass the response's next_cursor as cursor to get the following page
     Requires authentication
     """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 4  # block set, bounding-box candidates, posts, authors
+
     def post(self, request):
-        # Step 1: Authentication Validation
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({
-                'error': {
-                    'code': 'UNAUTHORIZED',
-                    'message': 'Authentication credentials were not provided'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.replace('Bearer ', '').strip()
-
-        # Decode and validate token
-        try:
-            access_token = AccessToken(token)
-            user_id = access_token['user_id']
-        except Exception:
-            return Response({
-                'error': {
-                    'code': 'INVALID_TOKEN',
-                    'message': 'Invalid or expired authentication token'
-                }
-            }, status=status.HTTP_401_UNAUTHORIZED)
-
-        # Get user and verify account status
-        try:
-            current_user = UserProfile.objects.get(userId=user_id)
-        except UserProfile.DoesNotExist:
-            return Response({
-                'error': {
-                    'code': 'USER_NOT_FOUND',
-                    'message': 'User account not found'
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
 
-        # Check if user is guest (guests shouldn't create posts)
-        # if current_user.is_guest:
-        #     return Response({
-        #         'error': {
-        #             'code': 'ACCESS_DENIED',
-        #             'message': 'Guest users cannot create posts'
-        #         }
-        # #     }, status=status.HTTP_403_FORBIDDEN)
-
-        # Step 2: Request Validation
-        post_type = request.data.get('post_type')
-        content = request.data.get('content', '').strip()
-        pincode_id = request.data.get('pincode_id')
-        photo_url = request.data.get('photo_url')
-
-        # Validate post_type
-        valid_types = ['post', 'question', 'alert', 'recommendation']
-        if not post_type or post_type not in valid_types:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': f'post_type is required and must be one of: {", ".join(valid_types)}'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate content (required)
-        if not content:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'content is required'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate content length (max 500 chars)
-        if len(content) > 500:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'content must not exceed 500 characters'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate pincode_id (required)
-        if not pincode_id:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'pincode_id is required'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # pincode_id should be one of the constants (PINCODE_HOME_ID / PINCODE_OFFICE_ID)
-        # If it matches a constant, fetch the actual pincode from the user's profile.
-        # Otherwise, fall back to legacy format `pincode_home_201301` and extract the pincode.
-        try:
-            if pincode_id == PINCODE_HOME_ID:
-                pincode = (getattr(current_user, 'home_pincode', None) or getattr(current_user, 'pincode', None))
-                if not pincode:
-                    return Response({
-                        'error': {
-                            'code': 'INVALID_REQUEST',
-                            'message': 'User has no home pincode set'
-                        }
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            elif pincode_id == PINCODE_OFFICE_ID:
-                pincode = getattr(current_user, 'office_pincode', None)
-                if not pincode:
-                    return Response({
-                        'error': {
-                            'code': 'INVALID_REQUEST',
-                            'message': 'User has no office pincode set'
-                        }
-                    }, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                # Legacy support: allow `pincode_home_201301` style ids
-                pincode_parts = pincode_id.split('_')
-                if len(pincode_parts) >= 3 and pincode_parts[0] == PINCODE_PREFIX:
-                    pincode = pincode_parts[-1].strip()
-                else:
-                    return Response({
-                        'error': {
-                            'code': 'INVALID_REQUEST',
-                            'message': 'Invalid pincode_id format'
-                        }
-                    }, status=status.HTTP_400_BAD_REQUEST)
-        except (IndexError, AttributeError):
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'Invalid pincode_id format'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-
-        # Validate pincode format (6 digits)
-        if not isinstance(pincode, str):
-            pincode = str(pincode)
-        if not pincode.isdigit() or len(pincode) != 6:
-            return Response({
-                'error': {
-                    'code': 'INVALID_REQUEST',
-                    'message': 'Invalid pincode format'
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        location, error = self._parse_location(request)
+        if error:
+            return self._error(error)
+        lat, long = location
+        radius_km, error = self._parse_radius(request, NEARBY_DEFAULT_RADIUS_KM, settings.NEARBY_MAX_RADIUS_KM)
+        if error:
+            return self._error(error)
+        limit = self._parse_limit(request, NEARBY_PAGE_SIZE, NEARBY_MAX_PAGE_SIZE)
+        after, error = self._parse_cursor(request, NEARBY_CURSOR_TYPES)
+        if error:
+            return self._error(error)
 
-        # Step 3: Create the post
+        page, next_cursor = nearby_posts(lat, long, radius_km, limit, after, block_set(current_user.userId))
+        posts = Post.objects.in_bulk([post_id for post_id, _ in page])
+        authors = UserProfile.objects.filter(
+            userId__in={post.userId for post in posts.values()}
+        ).only('userId', 'name', 'profilePhoto').in_bulk()
 
-        try:
-            # Determine media type and URL (match CreatePostView logic)
-            if photo_url and photo_url.strip():
-                media_type = 'image'
-                media_url = photo_url.strip()
-            else:
-                media_type = 'text'  # Use text for posts without images
-                media_url = None  # No media URL for text posts
-
-            # Create the post
-            post = Post.objects.create(
-                userId=user_id,
-                post_type=post_type,
-                description=content,
-                mediaType=media_type,
-                mediaURL=media_url,
-                pincode=pincode,
-                location={}  # Empty location object for now
-            )
-
-            # Build dynamic response based on actual saved data
-            response_data = {
+        results = []
+        for post_id, distance in page:
+            post = posts.get(post_id)
+            if post is None:  # deleted since the candidates were read
+                continue
+            author = authors.get(post.userId)
+            results.append({
                 'post_id': post.postId,
                 'user_id': post.userId,
                 'post_type': post.post_type,
                 'content': post.description,
+                'media_url': post.mediaURL,
                 'pincode': post.pincode,
-                'pincode_id': pincode_id,  # Include original pincode_id for reference
                 'timestamp': post.timestamp.isoformat(),
-                'media_type': post.mediaType,
-            }
+                'author': {
+                    'name': (author.name if author else None) or f"User {post.userId[:8]}",
+                    'avatar': author.profilePhoto if author else None
+                },
+                'location': {'lat': post.latitude, 'long': post.longitude},
+                'distance_km': round(distance, 3)
+            })
+
+        return Response({
+            'results': results,
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+class NearbyPeopleView(FeedViewMixin, APIView):
+    """
+    POST /nearby-people
+
+    Returns registered (non-guest) users within radius_km, nearest first,
+    excluding anyone the caller blocked or was blocked by
+    Request body: {"lat": 12.97, "long": 77.59, "radius_km": 5, "limit": 20, "cursor": ""}
+    lat/long default to the caller's home, else last known location
+    Pass the response's next_cursor as cursor to get the following page
+    Requires authentication
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 8  # profile, block set, one scan per ring band (at most 6 within NEARBY_MAX_RADIUS_KM)
+
+    def post(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+
+        if current_user.home_latitude is not None and current_user.home_longitude is not None:
+            default = (current_user.home_latitude, current_user.home_longitude)
+        elif current_user.latitude is not None and current_user.longitude is not None:
+            default = (current_user.latitude, current_user.longitude)
+        else:
+            default = None
+        if default is None and request.data.get('lat') is None and request.data.get('long') is None:
+            return self._error('lat and long are required when the profile has no location')
+        location, error = self._parse_location(request, default)
+        if error:
+            return self._error(error)
+        lat, long = location
+        radius_km, error = self._parse_radius(request, PEOPLE_DEFAULT_RADIUS_KM, settings.NEARBY_MAX_RADIUS_KM)
+        if error:
+            return self._error(error)
+        limit = self._parse_limit(request, PEOPLE_PAGE_SIZE, PEOPLE_MAX_PAGE_SIZE)
+        cursor, error = self._parse_cursor(request, PEOPLE_CURSOR_TYPES)
+        if error:
+            return self._error(error)
+
+        people, next_cursor = nearby_people(current_user.userId, lat, long, radius_km, limit, cursor)
+        return Response({
+            'results': people,
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+class SearchView(FeedViewMixin, APIView):
+    """
+    POST /search
+
+    Full-text search over posts and people, best match first; every word
+    of q matches as a prefix, so partial words work for type-ahead
+    Request body: {"q": "yoga cl", "type": "all", "pin_code": "560034", "limit": 20, "cursor": ""}
+    type is one of all, posts, people; pin_code optionally limits results to one pincode
+    Pass the response's next_cursor as cursor to get the following page
+    Requires authentication
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 4  # block set, search, posts, users (authors and people together)
+    SEARCH_TYPES = {'all': None, 'posts': 'post', 'people': 'user'}
+
+    @tolerates_replica_lag  # The index trails commits anyway
+    def post(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+
+        query = request.data.get('q')
+        terms = query_terms(query) if isinstance(query, str) else []
+        if sum(len(term) for term in terms) < MIN_QUERY_LENGTH:
+            return self._error(f'q must contain at least {MIN_QUERY_LENGTH} letters or digits')
+
+        search_type = request.data.get('type', 'all')
+        if search_type not in self.SEARCH_TYPES:
+            return self._error('type must be one of: all, posts, people')
+
+        pin_code = request.data.get('pin_code')
+        if pin_code and (not isinstance(pin_code, str) or not pin_code.isdigit() or len(pin_code) != 6):
+            return self._error('pin_code must be a valid 6-digit pincode')
+
+        limit = self._parse_limit(request, SEARCH_PAGE_SIZE, SEARCH_MAX_PAGE_SIZE)
+        after, error = self._parse_cursor(request, SEARCH_CURSOR_TYPES)
+        if error:
+            return self._error(error)
+
+        hits, next_cursor = search(terms, self.SEARCH_TYPES[search_type], pin_code or None, limit, after,
+                                   block_set(current_user.userId))
+        posts = Post.objects.filter(hidden=False).in_bulk(
+            [int(object_id) for kind, object_id, _ in hits if kind == 'post']
+        )
+        users = UserProfile.objects.filter(
+            userId__in={object_id for kind, object_id, _ in hits if kind == 'user'}
+            | {post.userId for post in posts.values()}
+        ).only('userId', 'name', 'bio', 'profilePhoto', 'home_pincode', 'pincode').in_bulk()
+
+        results = []
+        for kind, object_id, _ in hits:
+            if kind == 'post':
+                post = posts.get(int(object_id))
+                if post is None:  # deleted or hidden since the search ran
+                    continue
+                author = users.get(post.userId)
+                results.append({
+                    'type': 'post',
+                    'post_id': post.postId,
+                    'user_id': post.userId,
+                    'post_type': post.post_type,
+                    'content': post.description,
+                    'media_url': post.mediaURL,
+                    'pincode': post.pincode,
+                    'timestamp': post.timestamp.isoformat(),
+                    'author': {
+                        'name': (author.name if author else None) or f"User {post.userId[:8]}",
+                        'avatar': author.profilePhoto if author else None
+                    }
+                })
+            else:
+                user = users.get(object_id)
+                if user is None:
+                    continue
+                results.append({
+                    'type': 'user',
+                    'user_id': user.userId,
+                    'name': user.name,
+                    'bio': user.bio,
+                    'profile_photo': user.profilePhoto,
+                    'pincode': user.home_pincode or user.pincode
+                })
+
+        return Response({
+            'results': results,
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+
+class BlockUserView(FeedViewMixin, APIView):
+    """
+    POST /block-user - Block a user: each stops seeing the other's posts and profile in feeds and search by location
+    POST /unblock-user - Remove a block the caller created
+    GET /blocked-users - Users the caller has blocked
+    Request body (POST): {"user_id": "..."}
+    Requires authentication
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 5  # target lookup, get_or_create (read, savepoint, insert, release)
+    unblock = False
+
+    def get(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+        blocks = BlockedUser.objects.filter(blockerUserId=current_user.userId)
+        return Response({
+            'results': [
+                {'user_id': block.blockedUserId, 'blocked_at': block.createdAt.isoformat()}
+                for block in blocks
+            ]
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+
+        target_id = request.data.get('user_id')
+        if not target_id or not isinstance(target_id, str):
+            return self._error('user_id is required')
+        if target_id == current_user.userId:
+            return self._error('You cannot block yourself')
+
+        if self.unblock:
+            changed = unblock_user(current_user.userId, target_id)
+        else:
+            if not UserProfile.objects.filter(userId=target_id).exists():
+                return self._error('User not found', 'NOT_FOUND', status.HTTP_404_NOT_FOUND)
+            changed = block_user(current_user.userId, target_id)
+
+        return Response({
+            'success': True,
+            'message': ('User unblocked' if self.unblock else 'User blocked') if changed else
+                       ('User was not blocked' if self.unblock else 'User already blocked'),
+            'data': {'user_id': target_id, 'blocked': not self.unblock}
+        }, status=status.HTTP_200_OK)
+
+class ReportContentView(FeedViewMixin, APIView):
+    """
+    POST /report-content - Report a post or comment
+    Request body: {"content_type": "post" | "comment", "content_id": 123, "reason": "..."}
+    A post reported by REPORT_AUTO_HIDE_THRESHOLD users is hidden from feeds until a moderator reviews it
+    Requires authentication
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    # content lookup, report insert + counter upsert (savepoints under test), hiding the post (update, pincode)
+    query_budget = 8
+
+    def post(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+
+        content_type = request.data.get('content_type')
+        content_id = request.data.get('content_id')
+        reason = request.data.get('reason')
+        if content_type not in REPORTABLE_TYPES:
+            return self._error(f"content_type must be one of: {', '.join(REPORTABLE_TYPES)}")
+        if isinstance(content_id, bool) or not isinstance(content_id, int):
+            return self._error('content_id must be an integer')
+        if not isinstance(reason, str) or not reason.strip():
+            return self._error('reason is required')
+        if len(reason) > MAX_REASON_LENGTH:
+            return self._error(f'reason must be at most {MAX_REASON_LENGTH} characters')
+
+        if not content_exists(content_type, content_id):
+            return self._error(f'{content_type.title()} not found', 'NOT_FOUND', status.HTTP_404_NOT_FOUND)
+
+        counted = report_content(current_user.userId, content_type, content_id, reason.strip())
+        return Response({
+            'success': True,
+            'message': 'Report received' if counted else 'You have already reported this',
+            'data': {'content_type': content_type, 'content_id': content_id}
+        }, status=status.HTTP_201_CREATED if counted else status.HTTP_200_OK)
+
+
+class ModerationQueueView(FeedViewMixin, APIView):
+    """
+    POST /moderation-queue - Pending reported content, fastest-reported first
+    Request body: {"limit": 20, "cursor": "..."}
+    POST /moderation-queue/resolve - Dismiss reports (restoring a hidden post) or remove the content
+    Request body: {"content_type": "post" | "comment", "content_id": 123, "action": "dismiss" | "remove"}
+    Requires a user listed in MODERATOR_USER_IDS
+    """
+    permission_classes = []  # Unauthenticated requests get the feed-style error body below
+    query_budget = 7  # queue page and hidden flags, or resolving: counter, reports, post (update, pincode, feed version) or comment delete
+    resolve = False
+
+    def post(self, request):
+        current_user = request.user
+        if not current_user.is_authenticated:
+            return self._unauthorized()
+        if not is_moderator(current_user.userId):
+            return self._error('Moderator access required', 'FORBIDDEN', status.HTTP_403_FORBIDDEN)
+        if self.resolve:
+            return self._resolve(request)
+
+        limit = request.data.get('limit', QUEUE_PAGE_SIZE)
+        if isinstance(limit, bool) or not isinstance(limit, int) or limit < 1:
+            return self._error('limit must be a positive integer')
+        limit = min(limit, QUEUE_MAX_PAGE_SIZE)
+
+        cursor, error = self._parse_cursor(request, QUEUE_CURSOR_TYPES)
+        if error:
+            return self._error(error)
+
+        items, next_cursor = moderation_queue(limit, cursor)
+        return Response({
+            'results': items,
+            'has_more': next_cursor is not None,
+            'next_cursor': next_cursor
+        }, status=status.HTTP_200_OK)
+
+    def _resolve(self, request):
+        content_type = request.data.get('content_type')
+        content_id = request.data.get('content_id')
+        action = request.data.get('action')
+        if content_type not in REPORTABLE_TYPES:
+            return self._error(f"content_type must be one of: {', '.join(REPORTABLE_TYPES)}")
+        if isinstance(content_id, bool) or not isinstance(content_id, int):
+            return self._error('content_id must be an integer')
+        if action not in RESOLUTIONS:
+            return self._error(f"action must be one of: {', '.join(RESOLUTIONS)}")
+
+        if not resolve_report(content_type, content_id, action):
+            return self._error('No reports for this content', 'NOT_FOUND', status.HTTP_404_NOT_FOUND)
+        return Response({
+            'success': True,
+            'message': 'Reports dismissed' if action == 'dismiss' else 'Content removed',
+            'data': {'content_type': content_type, 'content_id': content_id, 'action': action}
+        }, status=status.HTTP_200_OK)
+
 
-            # Only include media_url if it exists
-            if post.mediaURL:
-                response_data['media_url'] = post.mediaURL
-
-            # Include original photo_url if provided (for debugging)
-            if photo_url:
-                response_data['original_photo_url'] = photo_url
-
-            return Response({
-                'success': True,
-                'message': 'Post saved successfully',
-                'data': response_data
-            }, status=status.HTTP_201_CREATED)
-
-        except Exception as e:
-            print(f"Error saving post: {e}")  # Add logging for debugging
-            return Response({
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to save post',
-                    'details': str(e) if settings.DEBUG else None
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        
 def _format_address(city, state):
     parts = [p.strip() for p in (city, state) if p and str(p).strip()]
     return ", ".join(parts)
@@ -0,0 +1,112 @@
+"""
+Fixed latitude/longitude grid for the nearby-people index.
+
+The globe is cut into CELL_DEGREES squares numbered row-major from
+(-90, -180), so every grid row is one contiguous range of cell numbers and
+a rectangle of cells is one BETWEEN per row. UserProfile.geo_cell holds the
+cell of a user's discovery location and is indexed.
+
+Searches walk outwards in rings: ring k is the rectangle of cells within k
+rows and about k cells' worth of kilometres (more columns away from the
+equator) of the centre cell, minus the rectangle of ring k - 1.
+"""
+import math
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+CELL_DEGREES = 0.01  # ~1.1 km north-south
+GRID_ROWS = round(180 / CELL_DEGREES)
+GRID_COLS = round(360 / CELL_DEGREES)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def grid_position(lat, lon):
+    """(row, col) of the cell containing (lat, lon)"""
+    row = min(max(math.floor((lat + 90) / CELL_DEGREES), 0), GRID_ROWS - 1)
+    col = math.floor((lon + 180) / CELL_DEGREES) % GRID_COLS
+    return row, col
+
+
+def grid_cell(lat, lon):
+    row, col = grid_position(lat, lon)
+    return row * GRID_COLS + col
+
+
+def discovery_cell(lat, lon, home_lat, home_lon, is_guest):
+    """Cell a user is found in by nearby search (home, else last known location); None for guests"""
+    if is_guest:
+        return None
+    if home_lat is not None and home_lon is not None:
+        return grid_cell(home_lat, home_lon)
+    if lat is not None and lon is not None:
+        return grid_cell(lat, lon)
+    return None
+
+
+class Rings:
+    """Ring geometry around (lat, lon)"""
+
+    def __init__(self, lat, lon):
+        self.lat, self.lon = lat, lon
+        self.row, self.col = grid_position(lat, lon)
+        self._lon_scale = max(math.cos(math.radians(lat)), 0.01)
+
+    def _half_cols(self, k):
+        """Rectangle k spans columns col - n + 1 .. col + n - 1"""
+        return min(math.ceil(k / self._lon_scale), GRID_COLS // 2 + 1)
+
+    def band_ranges(self, start, end):
+        """(first, last) cell-number ranges covering rings start .. end - 1"""
+        outer, inner = self._half_cols(end), self._half_cols(start)
+        ranges = []
+        for row in range(max(self.row - end + 1, 0), min(self.row + end, GRID_ROWS)):
+            if abs(row - self.row) < start:
+                # Rows of the inner rectangle: only the strips either side of it
+                spans = [(self.col - outer + 1, self.col - inner), (self.col + inner, self.col + outer - 1)]
+            else:
+                spans = [(self.col - outer + 1, self.col + outer - 1)]
+            base = row * GRID_COLS
+            for low, high in spans:
+                if low > high:
+                    continue
+                if high - low + 1 >= GRID_COLS:
+                    ranges.append((base, base + GRID_COLS - 1))
+                    continue
+                low, high = low % GRID_COLS, high % GRID_COLS
+                if low <= high:
+                    ranges.append((base + low, base + high))
+                else:  # wraps around the antimeridian
+                    ranges.extend([(base + low, base + GRID_COLS - 1), (base, base + high)])
+        return ranges
+
+    def covered_km(self, k):
+        """
+        Lower bound on the distance from (lat, lon) to any point outside
+        rectangle k, i.e. everything closer than this is in rings < k.
+        """
+        if k == 0:
+            return 0.0
+        bounds = []
+        top = (self.row + k) * CELL_DEGREES - 90
+        bottom = (self.row - k + 1) * CELL_DEGREES - 90
+        if top < 90:
+            bounds.append((top - self.lat) * KM_PER_DEGREE)
+        if bottom > -90:
+            bounds.append((self.lat - bottom) * KM_PER_DEGREE)
+        half = self._half_cols(k)
+        if 2 * half - 1 < GRID_COLS:
+            left = (self.col - half + 1) * CELL_DEGREES - 180
+            right = (self.col + half) * CELL_DEGREES - 180
+            cos_lat = math.cos(math.radians(self.lat))
+            for offset in (self.lon - left, right - self.lon):
+                # Distance to the meridian `offset` degrees away
+                angle = math.radians(min(offset, 90))
+                bounds.append(EARTH_RADIUS_KM * math.asin(min(1.0, cos_lat * math.sin(angle))))
+        return min(bounds) if bounds else math.inf
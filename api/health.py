@@ -0,0 +1,100 @@
+"""
+Readiness checks for the load balancer.
+
+Each worker checks its own DB connections (a worker whose connection died
+should stop receiving traffic), the shared cache, the OTP backlog and its
+outbound circuit breakers. The result is memoised per process for
+READINESS_CACHE_SECONDS so probe traffic doesn't load the database.
+"""
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+from .circuit_breaker import breaker_states
+from .db_router import PRIMARY_DB, replica_aliases
+from .models import OTPVerification
+
+
+_cached = None  # (expires_at, ready, checks)
+_lock = threading.Lock()
+
+
+def check_database(alias):
+    started = time.perf_counter()
+    connection = connections[alias]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except Exception as e:
+        # Drop the broken persistent connection so the next request reconnects
+        connection.close_if_unusable_or_obsolete()
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+    rtt_ms = (time.perf_counter() - started) * 1000
+    return {
+        'ok': rtt_ms <= getattr(settings, 'READINESS_DB_MAX_MS', 1000),
+        'rtt_ms': round(rtt_ms, 2),
+    }
+
+
+def check_cache():
+    key = f'readiness:{uuid.uuid4().hex}'
+    started = time.perf_counter()
+    try:
+        cache.set(key, 1, timeout=10)
+        ok = cache.get(key) == 1
+        cache.delete(key)
+    except Exception as e:
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+    return {'ok': ok, 'rtt_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+
+def check_otp_backlog():
+    limit = getattr(settings, 'READINESS_MAX_OTP_BACKLOG', None)
+    try:
+        pending = OTPVerification.objects.using(PRIMARY_DB).filter(
+            is_verified=False, expires_at__gt=timezone.now()
+        ).count()
+    except Exception as e:
+        return {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+    return {'ok': limit is None or pending <= limit, 'pending': pending}
+
+
+def run_checks():
+    """
+    Returns: (ready: bool, checks: dict). Replicas and circuit breakers are
+    reported but don't fail readiness: every worker shares them, so failing
+    would take the whole fleet out instead of one bad worker.
+    """
+    checks = {
+        'database': check_database(PRIMARY_DB),
+        'cache': check_cache(),
+        'otp_backlog': check_otp_backlog(),
+        'replicas': {alias: check_database(alias) for alias in replica_aliases()},
+        'circuit_breakers': breaker_states(),
+    }
+    ready = all(checks[name]['ok'] for name in ('database', 'cache', 'otp_backlog'))
+    return ready, checks
+
+
+def readiness():
+    """run_checks(), memoised for READINESS_CACHE_SECONDS"""
+    global _cached
+    now = time.monotonic()
+    cached = _cached
+    if cached is not None and cached[0] > now:
+        return cached[1], cached[2]
+    with _lock:
+        if _cached is not None and _cached[0] > now:
+            return _cached[1], _cached[2]
+        ready, checks = run_checks()
+        _cached = (now + getattr(settings, 'READINESS_CACHE_SECONDS', 5), ready, checks)
+        return ready, checks
+
+
+def reset_readiness_cache():
+    global _cached
+    _cached = None
@@ -0,0 +1,130 @@
+"""
+Per-request instrumentation: SQL query count and time, outbound HTTP time
+(Sendmator, Google) and response rendering time. RequestMetricsMiddleware
+reports them as a Server-Timing header and one JSON log line per request,
+and checks them against the view's `query_budget`. Outbound calls also go
+through the service's circuit breaker.
+"""
+import time
+from contextlib import contextmanager, ExitStack
+from contextvars import ContextVar
+from django.db import connections
+from .circuit_breaker import get_breaker
+from .metrics import DB_QUERY_SECONDS, OUTBOUND_SECONDS
+
+
+class QueryBudgetExceeded(Exception):
+    """A view ran more SQL queries than its declared query_budget"""
+
+
+class RequestMetrics:
+    """Counters for one request; times are in milliseconds"""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.external_ms = {}  # service -> total ms
+        self.render_ms = 0.0
+
+    def server_timing(self, total_ms):
+        """Server-Timing header value"""
+        parts = [f'db;dur={self.db_ms:.1f};desc="{self.queries} queries"']
+        for service, duration in sorted(self.external_ms.items()):
+            parts.append(f'{service};dur={duration:.1f}')
+        parts.append(f'render;dur={self.render_ms:.1f}')
+        parts.append(f'total;dur={total_ms:.1f}')
+        return ', '.join(parts)
+
+    def as_dict(self):
+        return {
+            'queries': self.queries,
+            'db_ms': round(self.db_ms, 2),
+            'external_ms': {service: round(duration, 2) for service, duration in self.external_ms.items()},
+            'render_ms': round(self.render_ms, 2),
+        }
+
+
+_current = ContextVar('request_metrics', default=None)
+
+
+def current_metrics():
+    """RequestMetrics of the request being served, or None"""
+    return _current.get()
+
+
+@contextmanager
+def detached_metrics():
+    """Don't charge queries in the block to the current request (background work run inline)"""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def collect_request_metrics(metrics=None):
+    """
+    Record queries on every DB alias for the duration of the block.
+    metrics: RequestMetrics to keep adding to (a streamed body), else a new one
+    """
+    if metrics is None:
+        metrics = RequestMetrics()
+
+    def record_query(execute, sql, params, many, context):
+        if _current.get() is not metrics:  # background work run inline (detached_metrics)
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.queries += 1
+            metrics.db_ms += elapsed * 1000
+            DB_QUERY_SECONDS.observe(elapsed)
+
+    token = _current.set(metrics)
+    try:
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(record_query))
+            yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def track_external(service):
+    """
+    Time an outbound call and guard it with the service's circuit breaker:
+    `with track_external('sendmator'): requests.post(...)`
+    Raises CircuitOpenError without calling when the breaker is open.
+    """
+    breaker = get_breaker(service)
+    breaker.before_call()
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        breaker.record_failure()
+        raise
+    else:
+        breaker.record_success()
+    finally:
+        elapsed = time.perf_counter() - started
+        OUTBOUND_SECONDS.labels(service=service).observe(elapsed)
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.external_ms[service] = metrics.external_ms.get(service, 0.0) + elapsed * 1000
+
+
+def view_query_budget(request):
+    """
+    The `query_budget` attribute of the view class that served the request
+    (APIView or ViewSet), or None when it doesn't declare one.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'cls', None) or getattr(match.func, 'view_class', None)
+    return getattr(view_class, 'query_budget', None)
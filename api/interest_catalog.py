@@ -0,0 +1,73 @@
+"""
+Per-worker copy of the interest catalog.
+
+The catalog is small and rarely edited, so each worker keeps it in memory
+with a lookup by id and the GetInterestsView response body already encoded.
+A version token in the database (api/data_versions.py) says which copy is
+current: any Interest save/delete replaces it in the same transaction, and
+every worker reloads (one query) the next time it reads a version it didn't
+load. Bulk writes (bulk_create, .update()) bypass the signals; callers must call
+bump_catalog_version() themselves.
+"""
+import threading
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .data_versions import bump_version, current_version
+from .models import Interest
+from .renderers import encode_json
+
+
+CATALOG_VERSION = 'interest_catalog'
+
+
+class InterestCatalog:
+    """One immutable snapshot of the interests table"""
+
+    def __init__(self, version, interests):
+        self.version = version
+        self.interests = interests  # [{'id', 'name', 'image'}] as InterestSerializer renders them
+        self.by_id = {interest['id']: interest for interest in interests}
+        self.response_body = encode_json({'interests': interests})
+
+    def get(self, interest_id):
+        """{'id', 'name', 'image'} or None for unknown ids"""
+        try:
+            return self.by_id.get(interest_id)
+        except TypeError:  # unhashable ids from the request body
+            return None
+
+
+_catalog = None
+_lock = threading.Lock()
+
+
+def catalog_version():
+    return current_version(CATALOG_VERSION)
+
+
+def get_catalog():
+    """Current InterestCatalog; a version read when warm, one more query after a change"""
+    global _catalog
+    version = catalog_version()
+    catalog = _catalog
+    if catalog is not None and catalog.version == version:
+        return catalog
+    with _lock:
+        if _catalog is None or _catalog.version != version:
+            # Read after the version, so the rows are at least that new
+            rows = Interest.objects.values_list('interest_id', 'name', 'image')
+            _catalog = InterestCatalog(version, [
+                {'id': interest_id, 'name': name, 'image': image} for interest_id, name, image in rows
+            ])
+        return _catalog
+
+
+def bump_catalog_version():
+    """Make every worker reload the catalog once the current transaction commits"""
+    bump_version(CATALOG_VERSION)
+
+
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+def _bump_on_interest_change(sender, instance, **kwargs):
+    bump_catalog_version()
@@ -0,0 +1,190 @@
+"""
+Interest feed for GetFeedView.
+
+Posts are tagged with interests just after they are created (the ids the
+client sends, else the author's own interests; see api/post_creation.py and
+PostViewSet) and each tag is a row in the post_interests inverted index,
+ordered by (interest_id, -timestamp).
+
+Reading a feed runs a fixed number of indexed queries whatever the data
+size: one range scan per interest (at most MAX_FEED_INTERESTS) for its
+newest CANDIDATES_PER_INTEREST posts, heap-merged newest first and
+de-duplicated, then one query each for the page's posts, their authors, and
+their like and comment counts. Candidates are ranked by recency and by
+distance between the caller and the post's pincode area centroid (from the
+in-memory area index), so only the page's posts are ever loaded.
+"""
+import heapq
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from .interest_catalog import get_catalog
+from .geo_grid import haversine_km
+from .interest_ranking import get_area_index
+from .models import Post, PostComment, PostInterest, PostLike, UserProfile
+
+
+MAX_POST_INTERESTS = 3
+MAX_FEED_INTERESTS = 5
+CANDIDATES_PER_INTEREST = 50
+FEED_PAGE_SIZE = 20
+
+# Score = recency + proximity, each in (0, 1]; halves at these ages/distances
+RECENCY_HALF_LIFE_HOURS = 24
+PROXIMITY_HALF_DISTANCE_KM = 5
+
+
+def _known_interests(catalog, interest_ids, limit):
+    """Distinct catalog ids from interest_ids (a user's stored list), at most limit"""
+    ids = [i for i in interest_ids or [] if isinstance(i, str)]
+    return [i for i in dict.fromkeys(ids) if catalog.get(i) is not None][:limit]
+
+
+def post_interest_ids(requested, author_interests):
+    """
+    Interest ids to tag a new post with: the requested ids, else the
+    author's own, limited to known interests and MAX_POST_INTERESTS.
+    Returns: (ids, error message or None)
+    """
+    catalog = get_catalog()
+    if requested is not None:
+        if not isinstance(requested, list) or any(catalog.get(i) is None for i in requested):
+            return None, 'interests must be a list of valid interest ids'
+        ids = list(dict.fromkeys(requested))
+        if len(ids) > MAX_POST_INTERESTS:
+            return None, f'A post can have at most {MAX_POST_INTERESTS} interests'
+        return ids, None
+    return _known_interests(catalog, author_interests, MAX_POST_INTERESTS), None
+
+
+def tag_post(post, interest_ids):
+    """Add post to the inverted index under interest_ids, unless it has been deleted since"""
+    with transaction.atomic():
+        # Locking the post row puts a concurrent delete (and _drop_index_rows) wholly before or after this
+        if not Post.objects.select_for_update().filter(postId=post.postId).exists():
+            return
+        PostInterest.objects.bulk_create([
+            PostInterest(interest_id=interest_id, postId=post.postId, timestamp=post.timestamp, pincode=post.pincode)
+            for interest_id in interest_ids
+        ])
+
+
+def backfill_post_interests(batch_size=1000):
+    """
+    Tag posts that have no index rows (created before tagging existed) with
+    their author's interests, batch_size posts at a time.
+    Returns: number of posts tagged
+    """
+    catalog = get_catalog()
+    tagged = 0
+    last_id = 0
+    while True:
+        posts = list(Post.objects.filter(postId__gt=last_id).order_by('postId')
+                     .only('postId', 'userId', 'timestamp', 'pincode')[:batch_size])
+        if not posts:
+            return tagged
+        last_id = posts[-1].postId
+        indexed = set(PostInterest.objects.filter(postId__in=[p.postId for p in posts]).values_list('postId', flat=True))
+        interests = dict(UserProfile.objects.filter(userId__in={p.userId for p in posts}).values_list('userId', 'interests'))
+        rows = []
+        for post in posts:
+            if post.postId in indexed:
+                continue
+            ids = _known_interests(catalog, interests.get(post.userId), MAX_POST_INTERESTS)
+            rows.extend(
+                PostInterest(interest_id=i, postId=post.postId, timestamp=post.timestamp, pincode=post.pincode)
+                for i in ids
+            )
+            tagged += bool(ids)
+        PostInterest.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def _candidates(interest_ids):
+    """Newest-first (timestamp, postId, pincode, interest_id), one per post"""
+    streams = []
+    for interest_id in interest_ids:
+        rows = PostInterest.objects.filter(interest_id=interest_id).order_by('-timestamp', '-postId') \
+            .values_list('timestamp', 'postId', 'pincode')[:CANDIDATES_PER_INTEREST]
+        streams.append([(ts, post_id, pincode, interest_id) for ts, post_id, pincode in rows])
+    seen = set()
+    for candidate in heapq.merge(*streams, key=lambda row: (row[0], row[1]), reverse=True):
+        if candidate[1] not in seen:
+            seen.add(candidate[1])
+            yield candidate
+
+
+def _score(age_hours, distance_km):
+    recency = 0.5 ** (age_hours / RECENCY_HALF_LIFE_HOURS)
+    proximity = 0.5 ** (distance_km / PROXIMITY_HALF_DISTANCE_KM) if distance_km is not None else 0.0
+    return recency + proximity
+
+
+def build_interest_feed(user_interests, lat, long, limit=FEED_PAGE_SIZE, excluded_authors=()):
+    """
+    Feed items for the user's interests, ranked by recency and distance from (lat, long)
+    excluded_authors: userIds whose posts are left out (the viewer's block set)
+    """
+    catalog = get_catalog()
+    interest_ids = _known_interests(catalog, user_interests, MAX_FEED_INTERESTS)
+    if not interest_ids:
+        return []
+
+    now = timezone.now()
+    area_index = get_area_index()
+    ranked = []
+    for timestamp, post_id, pincode, interest_id in _candidates(interest_ids):
+        centroid = area_index.centroid(pincode) if pincode else None
+        distance = haversine_km(lat, long, *centroid) if centroid else None
+        age_hours = max((now - timestamp).total_seconds(), 0) / 3600
+        ranked.append((_score(age_hours, distance), post_id, interest_id, centroid, distance))
+    page = heapq.nlargest(limit, ranked, key=lambda row: (row[0], row[1]))
+
+    post_ids = [row[1] for row in page]
+    posts = Post.objects.filter(hidden=False)
+    if excluded_authors:
+        # The index has no author column, so blocked authors' posts drop out of the page here
+        posts = posts.exclude(userId__in=excluded_authors)
+    posts = posts.in_bulk(post_ids)
+    authors = UserProfile.objects.filter(
+        userId__in={post.userId for post in posts.values()}
+    ).only('userId', 'name', 'is_guest').in_bulk()
+    likes = dict(PostLike.objects.filter(postId__in=post_ids).values_list('postId').annotate(n=Count('likeId')))
+    comments = dict(PostComment.objects.filter(postId__in=post_ids).values_list('postId').annotate(n=Count('commentId')))
+
+    items = []
+    for score, post_id, interest_id, centroid, distance in page:
+        post = posts.get(post_id)
+        if post is None:  # deleted or hidden since the candidates were read
+            continue
+        author = authors.get(post.userId)
+        items.append({
+            'id': str(post.postId),
+            'type': 'interest_post',
+            'interest': interest_id,
+            'title': catalog.get(interest_id)['name'],
+            'content': post.description or '',
+            'image_url': post.mediaURL,
+            'author': {
+                'name': (author.name if author else None) or f"User {post.userId[:8]}",
+                'is_guest': bool(author and author.is_guest)
+            },
+            'timestamp': post.timestamp.isoformat(),
+            'location': {
+                'lat': centroid[0] if centroid else None,
+                'long': centroid[1] if centroid else None,
+                'distance': f"{distance:.1f} km away" if distance is not None else None
+            },
+            'engagement': {
+                'likes': likes.get(post_id, 0),
+                'comments': comments.get(post_id, 0),
+                'shares': 0
+            }
+        })
+    return items
+
+
+@receiver(post_delete, sender=Post)
+def _drop_index_rows(sender, instance, **kwargs):
+    PostInterest.objects.filter(postId=instance.postId).delete()
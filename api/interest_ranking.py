@@ -0,0 +1,197 @@
+"""
+Local interest popularity for GetInterestsView.
+
+refresh_interest_popularity() (the refresh_interest_popularity command, run
+periodically) counts UserProfile.interests per area pincode into
+PincodeInterest and records each pincode's centroid in PincodeArea. A user's
+area is home_pincode, else pincode. Incremental runs only recount pincodes
+that have users changed since the previous run; full runs rebuild every
+pincode and are also what drops counts left behind by users who moved away.
+
+At request time a per-worker grid of area centroids maps lat/long to the
+nearest pincode without touching the database, and that area's counts are
+one range scan on pincode_interest_rank_idx. Each refresh replaces a version
+token in the database (api/data_versions.py) after its writes, so every
+worker reloads the grid and ETags change.
+"""
+import math
+import threading
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+from .data_versions import bump_version, current_version
+from .geo_grid import KM_PER_DEGREE, haversine_km
+from .models import PincodeArea, PincodeInterest, UserProfile
+
+
+RANKING_VERSION = 'interest_ranking'
+
+# Pincodes per query/transaction; two IN lists of this size stay under SQLite's 999 parameters
+DEFAULT_REFRESH_CHUNK_SIZE = 400
+
+# ---- Batch refresh ----
+
+class _AreaStats:
+    __slots__ = ('users', 'interests', 'lat_sum', 'lon_sum', 'located')
+
+    def __init__(self):
+        self.users = 0
+        self.interests = Counter()
+        self.lat_sum = self.lon_sum = 0.0
+        self.located = 0
+
+
+_USER_FIELDS = ('home_pincode', 'pincode', 'home_latitude', 'home_longitude', 'latitude', 'longitude', 'interests')
+
+
+def _aggregate(users, wanted=None):
+    """{pincode: _AreaStats} over users (values_list rows of _USER_FIELDS)"""
+    stats = defaultdict(_AreaStats)
+    for home_pincode, pincode, home_lat, home_lon, lat, lon, interests in users:
+        area = home_pincode or pincode
+        if not area or (wanted is not None and area not in wanted):
+            continue
+        entry = stats[area]
+        entry.users += 1
+        entry.interests.update({i for i in interests or () if isinstance(i, str)})
+        if home_lat is not None and home_lon is not None:
+            lat, lon = home_lat, home_lon
+        if lat is not None and lon is not None:
+            entry.lat_sum += lat
+            entry.lon_sum += lon
+            entry.located += 1
+    return stats
+
+
+def _write(pincodes, stats, refreshed_at):
+    """Replace the rows for pincodes; those missing from stats have no users left"""
+    with transaction.atomic():
+        PincodeInterest.objects.filter(pincode__in=pincodes).delete()
+        PincodeArea.objects.filter(pincode__in=pincodes).delete()
+        areas, counts = [], []
+        for pincode in pincodes:
+            entry = stats.get(pincode)
+            if entry is None:
+                continue
+            areas.append(PincodeArea(
+                pincode=pincode, users=entry.users, refreshedAt=refreshed_at,
+                latitude=entry.lat_sum / entry.located if entry.located else None,
+                longitude=entry.lon_sum / entry.located if entry.located else None,
+            ))
+            counts.extend(
+                PincodeInterest(pincode=pincode, interest_id=interest_id, users=users)
+                for interest_id, users in entry.interests.items()
+            )
+        PincodeArea.objects.bulk_create(areas)
+        PincodeInterest.objects.bulk_create(counts, batch_size=1000)
+    return len(counts)
+
+
+def _chunks(items, size):
+    items = sorted(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def refresh_interest_popularity(full=False, chunk_size=DEFAULT_REFRESH_CHUNK_SIZE):
+    """
+    Recount interests per area pincode (all of them when full, else those
+    with users changed since the last run).
+    Returns: {'pincodes': recounted pincodes, 'rows': PincodeInterest rows written}
+    """
+    started = timezone.now()
+    watermark = None if full else PincodeArea.objects.aggregate(latest=Max('refreshedAt'))['latest']
+    users = UserProfile.objects.values_list(*_USER_FIELDS)
+    rows = 0
+
+    if watermark is None:
+        # Full rebuild: one pass over every user, then drop areas nobody lives in any more
+        stats = _aggregate(users.iterator(chunk_size=2000))
+        for chunk in _chunks(stats, chunk_size):
+            rows += _write(chunk, stats, started)
+        stale = PincodeArea.objects.filter(refreshedAt__lt=started)
+        PincodeInterest.objects.filter(pincode__in=stale.values('pincode')).delete()
+        stale.delete()
+        recounted = len(stats)
+    else:
+        changed = {
+            home_pincode or pincode
+            for home_pincode, pincode in UserProfile.objects.filter(updatedAt__gte=watermark)
+            .values_list('home_pincode', 'pincode').iterator(chunk_size=2000)
+        } - {None, ''}
+        for chunk in _chunks(changed, chunk_size):
+            members = users.filter(Q(home_pincode__in=chunk) | Q(pincode__in=chunk))
+            rows += _write(chunk, _aggregate(members.iterator(chunk_size=2000), wanted=set(chunk)), started)
+        recounted = len(changed)
+
+    if recounted:
+        bump_version(RANKING_VERSION)
+    return {'pincodes': recounted, 'rows': rows}
+
+
+# ---- Request time ----
+
+class AreaIndex:
+    """Grid of area centroids for nearest-pincode lookups"""
+    CELL_DEGREES = 0.1
+
+    def __init__(self, version, areas):
+        self.version = version
+        self._cells = defaultdict(list)
+        self._centroids = {}
+        for pincode, lat, lon in areas:
+            self._cells[self._cell(lat, lon)].append((lat, lon, pincode))
+            self._centroids[pincode] = (lat, lon)
+
+    def centroid(self, pincode):
+        """(lat, lon) of the area's centroid, or None for unknown pincodes"""
+        return self._centroids.get(pincode)
+
+    def _cell(self, lat, lon):
+        return math.floor(lat / self.CELL_DEGREES), math.floor(lon / self.CELL_DEGREES)
+
+    def nearest(self, lat, lon, max_km):
+        """Pincode whose centroid is closest to (lat, lon) within max_km, or None"""
+        cell_km = KM_PER_DEGREE * self.CELL_DEGREES
+        lat_rings = math.ceil(max_km / cell_km)
+        # Longitude cells narrow towards the poles
+        lon_rings = min(math.ceil(max_km / (cell_km * max(math.cos(math.radians(lat)), 0.01))), 1800)
+        row, col = self._cell(lat, lon)
+        best_km, best = max_km, None
+        for r in range(row - lat_rings, row + lat_rings + 1):
+            for c in range(col - lon_rings, col + lon_rings + 1):
+                for area_lat, area_lon, pincode in self._cells.get((r, c), ()):
+                    km = haversine_km(lat, lon, area_lat, area_lon)
+                    if km <= best_km:
+                        best_km, best = km, pincode
+        return best
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def ranking_version():
+    return current_version(RANKING_VERSION)
+
+
+def get_area_index():
+    """Current AreaIndex; a version read when warm, one more query after a refresh"""
+    global _index
+    version = ranking_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _lock:
+        if _index is None or _index.version != version:
+            _index = AreaIndex(version, PincodeArea.objects.filter(
+                latitude__isnull=False, longitude__isnull=False
+            ).values_list('pincode', 'latitude', 'longitude'))
+        return _index
+
+
+def rank_interests(interests, pincode):
+    """interests ordered by how many users in pincode picked them (catalog order on ties)"""
+    counts = dict(PincodeInterest.objects.filter(pincode=pincode).values_list('interest_id', 'users'))
+    return sorted(interests, key=lambda interest: -counts.get(interest['id'], 0))
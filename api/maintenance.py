@@ -0,0 +1,64 @@
+"""
+Housekeeping helpers for short-lived auth tables (OTPs and pending signups)
+"""
+from datetime import timedelta
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .models import OTPVerification, PendingSignup
+
+
+DEFAULT_PURGE_BATCH_SIZE = 1000
+
+# Pending signups are only useful while their OTP can still be verified
+DEFAULT_PENDING_SIGNUP_MAX_AGE = timedelta(days=1)
+
+
+def delete_in_batches(queryset, batch_size=DEFAULT_PURGE_BATCH_SIZE):
+    """
+    Delete rows matching queryset in primary-key ordered chunks so each
+    DELETE holds its locks only briefly.
+    Returns: total number of rows deleted
+    """
+    model = queryset.model
+    total = 0
+    while True:
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            break
+        deleted, _ = model.objects.filter(pk__in=pks).delete()
+        total += deleted
+        if len(pks) < batch_size:
+            break
+    return total
+
+
+def purge_otp_verifications(batch_size=DEFAULT_PURGE_BATCH_SIZE, now=None):
+    """Remove OTP rows that are either verified or past their expiry"""
+    now = now or timezone.now()
+    stale = OTPVerification.objects.filter(Q(is_verified=True) | Q(expires_at__lt=now))
+    return delete_in_batches(stale, batch_size)
+
+
+def purge_pending_signups(max_age=DEFAULT_PENDING_SIGNUP_MAX_AGE, batch_size=DEFAULT_PURGE_BATCH_SIZE, now=None):
+    """Remove pending signups that were never completed within max_age"""
+    now = now or timezone.now()
+    stale = PendingSignup.objects.filter(created_at__lt=now - max_age)
+    return delete_in_batches(stale, batch_size)
+
+
+def auth_table_stats():
+    """
+    Row counts (and on PostgreSQL, on-disk size in bytes) for the auth tables.
+    Returns: {db_table: {'rows': int, 'bytes': int|None}}
+    """
+    stats = {}
+    for model in (OTPVerification, PendingSignup):
+        table = model._meta.db_table
+        size = None
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_total_relation_size(%s)', [table])
+                size = cursor.fetchone()[0]
+        stats[table] = {'rows': model.objects.count(), 'bytes': size}
+    return stats
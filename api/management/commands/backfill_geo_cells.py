@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.people_nearby import backfill_geo_cells
+
+
+class Command(BaseCommand):
+    help = "Recompute users' nearby-people grid cell (geo_cell) from their location, e.g. after bulk imports."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users per batch')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(self.style.ERROR('--batch-size must be at least 1'))
+            raise SystemExit(1)
+
+        updated = backfill_geo_cells(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} users'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.interest_feed import backfill_post_interests
+
+
+class Command(BaseCommand):
+    help = "Add posts created before interest tagging to the interest feed index, using their author's interests."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Posts per batch')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(self.style.ERROR('--batch-size must be at least 1'))
+            raise SystemExit(1)
+
+        tagged = backfill_post_interests(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Tagged {tagged} posts'))
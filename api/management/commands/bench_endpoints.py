@@ -0,0 +1,184 @@
+import json
+import random
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models import UserProfile
+from api.synthetic import SYNTHETIC_PASSWORD, seed_synthetic_data
+
+
+ENDPOINTS = ['home_feed', 'create_post', 'chat_messages', 'login', 'app_init']
+
+_QUERIES_RE = re.compile(r'desc="(\d+) queries"')
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))], 2)
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a throwaway test database and drive the feed, post, chat, login and app-init endpoints '
+        'with concurrent in-process clients; prints RPS, p50/p95/p99 latency and queries per request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=10000)
+        parser.add_argument('--likes', type=int, default=20000)
+        parser.add_argument('--chats', type=int, default=100)
+        parser.add_argument('--messages', type=int, default=5000)
+        parser.add_argument('--pincodes', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42, help='Seed for data generation and request mix')
+        parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous clients per endpoint')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+        parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=ENDPOINTS)
+        parser.add_argument('--rate-limits', action='store_true', help='Keep rate limiting on (off by default)')
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1')
+        if 'chat_messages' in options['endpoints'] and options['chats'] < 1:
+            raise CommandError('--chats must be at least 1 to benchmark chat_messages')
+
+        # A file-backed SQLite test database lets client threads write concurrently
+        if connection.vendor == 'sqlite':
+            test_name = str(Path(tempfile.gettempdir()) / 'bench_endpoints.sqlite3')
+            settings.DATABASES['default'].setdefault('TEST', {})['NAME'] = test_name
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = test_name
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(RATE_LIMIT_ENABLED=options['rate_limits'], QUERY_BUDGET_STRICT=False):
+                report = self._run(options)
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+
+        payload = json.dumps(report, indent=2)
+        self.stdout.write(payload)
+        if options['output']:
+            Path(options['output']).write_text(payload)
+
+    def _run(self, options):
+        seeded = seed_synthetic_data(
+            users=options['users'], posts=options['posts'], likes=options['likes'],
+            chats=options['chats'], messages=options['messages'],
+            pincodes=options['pincodes'], seed=options['seed']
+        )
+        # Tokens for a bounded sample of users; minting one per request would skew auth timings
+        sample = seeded.users(200)
+        tokens = {
+            user.userId: str(RefreshToken.for_user(user).access_token)
+            for user in UserProfile.objects.filter(userId__in=[user_id for user_id, _ in sample])
+        }
+
+        report = {
+            'commit': self._git_commit(),
+            'database': connection.vendor,
+            'seed': options['seed'],
+            'volumes': seeded.counts,
+            'concurrency': options['concurrency'],
+            'requests_per_endpoint': options['requests'],
+            'endpoints': {},
+        }
+        for endpoint in options['endpoints']:
+            make_request = getattr(self, f'_request_{endpoint}')
+            report['endpoints'][endpoint] = self._drive(
+                make_request, sample, tokens, seeded.chat_ids, options
+            )
+        return report
+
+    def _drive(self, make_request, sample, tokens, chat_ids, options):
+        latencies = []
+        queries = []
+        statuses = {}
+        lock = threading.Lock()
+        remaining = [options['requests']]
+
+        def worker(worker_index):
+            rng = random.Random(options['seed'] * 1000 + worker_index)
+            client = Client()
+            try:
+                while True:
+                    with lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                    user_id, pincode = rng.choice(sample)
+                    started = time.perf_counter()
+                    response = make_request(client, rng, user_id, pincode, tokens[user_id], chat_ids)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    match = _QUERIES_RE.search(response.get('Server-Timing', ''))
+                    with lock:
+                        latencies.append(elapsed_ms)
+                        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                        if match:
+                            queries.append(int(match.group(1)))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['concurrency'])]
+        wall_started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall_seconds = time.perf_counter() - wall_started
+
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': sum(count for code, count in statuses.items() if code >= 400),
+            'status_codes': {str(code): count for code, count in sorted(statuses.items())},
+            'rps': round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+            'p50_ms': _percentile(latencies, 0.50),
+            'p95_ms': _percentile(latencies, 0.95),
+            'p99_ms': _percentile(latencies, 0.99),
+            'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        }
+
+    def _request_home_feed(self, client, rng, user_id, pincode, token, chat_ids):
+        return client.post(reverse('home-feed'), {'limit': 10}, content_type='application/json',
+                           HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _request_create_post(self, client, rng, user_id, pincode, token, chat_ids):
+        body = {'post_type': 'post', 'content': f'Benchmark post {rng.random()}', 'pincode_id': f'pincode_home_{pincode}'}
+        return client.post(reverse('create-post'), body, content_type='application/json',
+                           HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _request_chat_messages(self, client, rng, user_id, pincode, token, chat_ids):
+        return client.get(reverse('chat-messages', args=[rng.choice(chat_ids)]),
+                          HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _request_login(self, client, rng, user_id, pincode, token, chat_ids):
+        index = int(user_id.split('_')[1])
+        body = {'email_id': f'user{index}@synthetic.local', 'password': SYNTHETIC_PASSWORD}
+        return client.post(reverse('auth-login'), body, content_type='application/json')
+
+    def _request_app_init(self, client, rng, user_id, pincode, token, chat_ids):
+        return client.post(reverse('app-init'), {}, content_type='application/json',
+                           HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_X_DEVICE_ID=f'bench-{user_id}',
+                           HTTP_APP_MODE='release')
+
+    def _git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                cwd=settings.BASE_DIR, timeout=5
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
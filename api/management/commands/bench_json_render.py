@@ -0,0 +1,79 @@
+import json
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import setup_databases, teardown_databases
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from api.feed_views import HomeFeedView
+from api.models import UserProfile
+from api.renderers import ORJSONRenderer
+from api.synthetic import seed_synthetic_data
+
+
+RENDERERS = {'drf_json': JSONRenderer, 'orjson': ORJSONRenderer}
+
+
+class Command(BaseCommand):
+    help = (
+        'Build a real HomeFeedView payload in a throwaway test database and compare how long '
+        'the stdlib JSON renderer and the orjson renderer take to encode it; prints JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help='Posts on the feed page (max 50)')
+        parser.add_argument('--iterations', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help='Also write the JSON report to this file')
+
+    def handle(self, *args, **options):
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            payload = self._feed_payload(options)
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+
+        results = {}
+        for name, renderer_class in RENDERERS.items():
+            renderer = renderer_class()
+            body = renderer.render(payload)
+            started = time.perf_counter()
+            for _ in range(options['iterations']):
+                renderer.render(payload)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                'bytes': len(body),
+                'mean_us': round(elapsed / options['iterations'] * 1e6, 2),
+            }
+
+        if json.loads(JSONRenderer().render(payload)) != json.loads(ORJSONRenderer().render(payload)):
+            raise CommandError('Renderers produced different documents')
+
+        report = {
+            'posts': len(payload['results']),
+            'iterations': options['iterations'],
+            'renderers': results,
+            'speedup': round(results['drf_json']['mean_us'] / results['orjson']['mean_us'], 2),
+        }
+        text = json.dumps(report, indent=2)
+        self.stdout.write(text)
+        if options['output']:
+            Path(options['output']).write_text(text)
+
+    def _feed_payload(self, options):
+        dataset = seed_synthetic_data(
+            users=50, posts=options['limit'] * 4, followers=0, likes=0, comments=0,
+            chats=0, messages=0, pincodes=1, seed=options['seed']
+        )
+        user = UserProfile.objects.get(userId=dataset.users(1)[0][0])
+        request = APIRequestFactory().post('/api/home/feed/', {'limit': options['limit']}, format='json')
+        force_authenticate(request, user=user)
+        response = HomeFeedView.as_view()(request)
+        if response.status_code != 200:
+            raise CommandError(f'HomeFeedView returned {response.status_code}')
+        return response.data
@@ -0,0 +1,65 @@
+import json
+import statistics
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from api.passwords import check_password_bounded, PasswordHashBusy
+
+
+class Command(BaseCommand):
+    help = 'Measure login password verification latency (p50/p99) under concurrent load using the configured hasher.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=8, help='Simultaneous simulated logins')
+        parser.add_argument('--requests', type=int, default=200, help='Total verifications to run')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        total = options['requests']
+        encoded = make_password('benchmark-password')
+
+        latencies = []
+        busy = 0
+        lock = threading.Lock()
+        remaining = [total]
+
+        def worker():
+            nonlocal busy
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                started = time.perf_counter()
+                try:
+                    check_password_bounded('benchmark-password', encoded)
+                except PasswordHashBusy:
+                    with lock:
+                        busy += 1
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed_ms)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        wall_started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall_seconds = time.perf_counter() - wall_started
+
+        latencies.sort()
+        result = {
+            'hasher': settings.PASSWORD_HASHERS[0].rsplit('.', 1)[-1],
+            'pool_workers': getattr(settings, 'PASSWORD_HASH_WORKERS', 2),
+            'concurrency': concurrency,
+            'completed': len(latencies),
+            'rejected_busy': busy,
+            'throughput_per_sec': round(len(latencies) / wall_seconds, 2) if wall_seconds else None,
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else None,
+            'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2) if latencies else None,
+        }
+        self.stdout.write(json.dumps(result))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from api.query_plans import DEFAULT_SEQ_SCAN_MIN_ROWS, audit_hot_queries
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot feed/profile/chat queries and fail if any does a sequential scan on a large table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows', type=int, default=DEFAULT_SEQ_SCAN_MIN_ROWS,
+            help='Sequential scans on tables with fewer rows than this are allowed'
+        )
+
+    def handle(self, *args, **options):
+        failed = []
+        for result in audit_hot_queries(min_rows=options['min_rows']):
+            if result['violations']:
+                failed.append(result['name'])
+                self.stdout.write(self.style.ERROR(f"{result['name']}: sequential scan on {', '.join(result['violations'])}"))
+            elif result['seq_scans']:
+                self.stdout.write(f"{result['name']}: scans {', '.join(result['seq_scans'])} (below --min-rows)")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{result['name']}: OK"))
+            if options['verbosity'] > 1:
+                self.stdout.write(result['plan'])
+
+        if failed:
+            raise SystemExit(1)
@@ -0,0 +1,39 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from api.maintenance import (
+    DEFAULT_PURGE_BATCH_SIZE, DEFAULT_PENDING_SIGNUP_MAX_AGE,
+    purge_otp_verifications, purge_pending_signups, auth_table_stats
+)
+
+
+class Command(BaseCommand):
+    help = 'Delete expired/verified OTPs and stale pending signups in bounded batches, reporting table sizes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_PURGE_BATCH_SIZE, help='Rows deleted per DELETE statement')
+        parser.add_argument(
+            '--pending-max-age-hours', type=int,
+            default=int(DEFAULT_PENDING_SIGNUP_MAX_AGE.total_seconds() // 3600),
+            help='Pending signups older than this are removed'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            self.stdout.write(self.style.ERROR('--batch-size must be at least 1'))
+            raise SystemExit(1)
+
+        before = auth_table_stats()
+
+        otps_deleted = purge_otp_verifications(batch_size=batch_size)
+        pending_deleted = purge_pending_signups(
+            max_age=timedelta(hours=options['pending_max_age_hours']),
+            batch_size=batch_size
+        )
+
+        after = auth_table_stats()
+
+        self.stdout.write(self.style.SUCCESS(f'Deleted {otps_deleted} OTP rows and {pending_deleted} pending signups'))
+        for table, stats in after.items():
+            size = f", {stats['bytes']} bytes" if stats['bytes'] is not None else ''
+            self.stdout.write(f"{table}: {before[table]['rows']} -> {stats['rows']} rows{size}")
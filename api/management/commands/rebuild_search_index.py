@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Write full-text search documents for every post and user (after enabling search, or to repair the index)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows read per batch')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(self.style.ERROR('--batch-size must be at least 1'))
+            raise SystemExit(1)
+
+        counts = rebuild_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {counts['posts']} posts and {counts['users']} users"))
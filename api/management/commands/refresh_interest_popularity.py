@@ -0,0 +1,26 @@
+import time
+from django.core.management.base import BaseCommand
+from api.interest_ranking import DEFAULT_REFRESH_CHUNK_SIZE, refresh_interest_popularity
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount user interests per pincode area for location-ranked /get-interests/. '
+        'Incremental by default (pincodes with users changed since the last run); run with --full periodically.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rebuild every pincode, dropping areas with no users')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_REFRESH_CHUNK_SIZE, help='Pincodes per query and transaction')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            self.stdout.write(self.style.ERROR('--chunk-size must be at least 1'))
+            raise SystemExit(1)
+
+        started = time.perf_counter()
+        result = refresh_interest_popularity(full=options['full'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recounted {result['pincodes']} pincodes ({result['rows']} interest counts) "
+            f"in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from api.models import UserProfile
+from api.synthetic import (
+    DEFAULT_ZIPF_EXPONENT, SYNTHETIC_PASSWORD, seed_synthetic_data, synthetic_user_id
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert a deterministic synthetic dataset (users, Zipf-distributed posts across pincodes, '
+        'follower edges, likes, comments, chats and messages) into the configured database for profiling.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--followers', type=int, default=1000000, help='Approximate follower edges')
+        parser.add_argument('--likes', type=int, default=2000000, help='Approximate likes')
+        parser.add_argument('--comments', type=int, default=500000)
+        parser.add_argument('--chats', type=int, default=20000)
+        parser.add_argument('--messages', type=int, default=1000000)
+        parser.add_argument('--pincodes', type=int, default=500)
+        parser.add_argument('--days', type=int, default=90, help='Spread timestamps over this many past days')
+        parser.add_argument('--zipf', type=float, default=DEFAULT_ZIPF_EXPONENT, help='Zipf exponent for popularity')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per INSERT/COPY batch')
+        parser.add_argument('--copy', action='store_true', help='Stream rows with COPY (PostgreSQL only)')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive',
+                            help='Do not ask for confirmation')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['pincodes'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--users, --pincodes and --batch-size must be at least 1')
+        if options['copy'] and connection.vendor != 'postgresql':
+            raise CommandError('--copy needs PostgreSQL')
+        if UserProfile.objects.filter(userId=synthetic_user_id(0)).exists():
+            raise CommandError('Synthetic users already exist in this database; use a fresh database')
+
+        if options['interactive']:
+            name = connection.settings_dict['NAME']
+            answer = input(f"This inserts synthetic rows into database '{name}' ({connection.vendor}). Type 'yes' to continue: ")
+            if answer != 'yes':
+                self.stdout.write('Cancelled.')
+                return
+
+        def progress(model, rows, seconds):
+            rate = f'{rows / seconds:,.0f} rows/s' if seconds else 'n/a'
+            self.stdout.write(f'{model._meta.db_table}: {rows:,} rows in {seconds:.1f}s ({rate})')
+
+        dataset = seed_synthetic_data(
+            users=options['users'], posts=options['posts'], followers=options['followers'],
+            likes=options['likes'], comments=options['comments'], chats=options['chats'],
+            messages=options['messages'], pincodes=options['pincodes'], days=options['days'],
+            seed=options['seed'], zipf_exponent=options['zipf'], batch_size=options['batch_size'],
+            use_copy=options['copy'], progress=progress
+        )
+
+        total = sum(dataset.counts.values())
+        self.stdout.write(self.style.SUCCESS(f'Inserted {total:,} rows (seed {options["seed"]})'))
+        self.stdout.write(f"Log in as user0@synthetic.local with password '{SYNTHETIC_PASSWORD}'")
@@ -0,0 +1,63 @@
+"""
+Prometheus metrics served at /api/metrics/.
+
+Under gunicorn each worker is a separate process, so when
+PROMETHEUS_MULTIPROC_DIR is set (gunicorn.conf.py sets it) every worker
+writes its samples to memory-mapped files in that directory and the scrape
+aggregates them. Without it (runserver, tests) the in-process registry is used.
+"""
+import os
+from django.utils import timezone
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+_DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Request latency by route',
+    ['method', 'route', 'status']
+)
+DB_QUERY_SECONDS = Histogram(
+    'db_query_duration_seconds', 'SQL query latency', buckets=_DB_BUCKETS
+)
+OUTBOUND_SECONDS = Histogram(
+    'outbound_request_duration_seconds', 'Latency of calls to external services',
+    ['service']
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Cache lookups by cache and result (hit ratio = hit / all)',
+    ['cache', 'result']
+)
+
+
+def record_cache_lookup(cache_name, hit):
+    CACHE_LOOKUPS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+class OTPBacklogCollector:
+    """Unverified, unexpired OTPs awaiting verification, counted at scrape time"""
+
+    def collect(self):
+        from .models import OTPVerification
+        pending = OTPVerification.objects.filter(is_verified=False, expires_at__gt=timezone.now()).count()
+        gauge = GaugeMetricFamily('otp_pending_verifications', 'OTPs sent and not yet verified or expired')
+        gauge.add_metric([], pending)
+        yield gauge
+
+
+_scrape_time_registry = CollectorRegistry(auto_describe=False)
+_scrape_time_registry.register(OTPBacklogCollector())
+
+
+def render_metrics():
+    """Exposition-format payload and its content type"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry) + generate_latest(_scrape_time_registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,119 @@
+"""
+Project middleware
+"""
+import json
+import logging
+import time
+from django.conf import settings
+from .db_router import request_routing
+from .metrics import REQUEST_SECONDS
+from .instrumentation import (
+    QueryBudgetExceeded, collect_request_metrics, current_metrics, view_query_budget
+)
+
+
+request_logger = logging.getLogger('api.requests')
+
+
+class RequestMetricsMiddleware:
+    """
+    Adds a Server-Timing header (DB, outbound services, rendering, total) and
+    logs one JSON line per request. Views may declare `query_budget`; going
+    over it raises QueryBudgetExceeded when QUERY_BUDGET_STRICT is set (tests)
+    and logs a warning otherwise. Streamed bodies are generated after the view
+    returns, so their queries are counted as the body is read and the request
+    is logged and checked once it has been sent or abandoned.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_request_metrics() as metrics:
+            response = self.get_response(request)
+
+        if response.streaming:
+            # The body, and the queries that produce it, run after this returns:
+            # Server-Timing covers the view, the log line and budget the whole request
+            response['Server-Timing'] = metrics.server_timing((time.perf_counter() - started) * 1000)
+            response.streaming_content = self._stream(request, response, response.streaming_content, metrics, started)
+            return response
+
+        total_ms = (time.perf_counter() - started) * 1000
+        response['Server-Timing'] = metrics.server_timing(total_ms)
+        self._report(request, response, metrics, total_ms)
+        return response
+
+    def _stream(self, request, response, content, metrics, started):
+        try:
+            with collect_request_metrics(metrics):
+                yield from content
+        finally:
+            # Also runs when the server closes the stream early (e.g. the client went away)
+            self._report(request, response, metrics, (time.perf_counter() - started) * 1000)
+
+    def _report(self, request, response, metrics, total_ms):
+        match = getattr(request, 'resolver_match', None)
+        REQUEST_SECONDS.labels(
+            method=request.method,
+            route=match.view_name if match else 'unmatched',
+            status=response.status_code
+        ).observe(total_ms / 1000)
+        request_logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            **metrics.as_dict(),
+        }))
+
+        budget = view_query_budget(request)
+        if budget is not None and metrics.queries > budget:
+            message = f'{request.method} {request.path} ran {metrics.queries} queries, budget is {budget}'
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(message)
+            request_logger.warning(message)
+
+    def process_template_response(self, request, response):
+        # Called just before the response (e.g. a DRF Response) is rendered
+        metrics = current_metrics()
+        if metrics is not None:
+            render_started = time.perf_counter()
+
+            def rendered(rendered_response):
+                metrics.render_ms += (time.perf_counter() - render_started) * 1000
+
+            response.add_post_render_callback(rendered)
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Read-your-writes for replica routing: when a request writes to the
+    primary, the response sets a short-lived cookie and the client's
+    following requests read from the primary until it expires.
+    """
+    COOKIE_NAME = 'db_primary_until'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_routing(pinned_to_primary=self._is_pinned(request)) as state:
+            response = self.get_response(request)
+
+        if state.wrote:
+            window = getattr(settings, 'DB_REPLICA_STICKY_SECONDS', 10)
+            response.set_cookie(
+                self.COOKIE_NAME, str(int(time.time() + window)),
+                max_age=window, httponly=True, samesite='Lax'
+            )
+        return response
+
+    def _is_pinned(self, request):
+        try:
+            return float(request.COOKIES.get(self.COOKIE_NAME, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,75 @@
+"""
+Custom migration operations
+"""
+from django.contrib.postgres.operations import AddIndexConcurrently, RemoveIndexConcurrently
+from django.db.migrations.operations import AddIndex, RemoveIndex
+from django.db.migrations.operations.base import Operation
+
+
+class AddIndexConcurrentlyIfSupported(AddIndexConcurrently):
+    """
+    CREATE INDEX CONCURRENTLY on PostgreSQL so large tables stay writable while
+    the index builds; a plain AddIndex on other backends (SQLite in tests).
+    Migrations using it must set atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        return AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        return AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class RemoveIndexConcurrentlyIfSupported(RemoveIndexConcurrently):
+    """
+    DROP INDEX CONCURRENTLY on PostgreSQL, a plain RemoveIndex elsewhere.
+    Migrations using it must set atomic = False.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        return RemoveIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        return RemoveIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class RunSQLForVendor(Operation):
+    """
+    Raw SQL for schema objects the ORM can't describe (tsvector columns, GIN
+    indexes, FTS5 tables), given per database vendor as
+    {'postgresql': [statements], 'sqlite': [statements]}. Vendors without
+    an entry are skipped.
+    """
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, sql, reverse_sql):
+        self.sql = sql
+        self.reverse_sql = reverse_sql
+
+    def deconstruct(self):
+        return self.__class__.__qualname__, [], {'sql': self.sql, 'reverse_sql': self.reverse_sql}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _run(self, statements, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement, params=None)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._run(self.sql, schema_editor)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        self._run(self.reverse_sql, schema_editor)
+
+    def describe(self):
+        return 'Raw SQL for ' + ', '.join(sorted(self.sql))
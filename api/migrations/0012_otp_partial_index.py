@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_alter_post_mediatype_alter_post_mediaurl_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="timestamp",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name="otpverification",
+            index=models.Index(
+                condition=models.Q(("is_verified", False)),
+                fields=["identifier", "-created_at"],
+                name="otp_ident_created_unverified",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0 on 2026-10-19 14:35
+
+from django.db import migrations, models
+
+from api.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0012_otp_partial_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name="follower",
+            index=models.Index(fields=["followingId"], name="followers_following_idx"),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="followrequest",
+            index=models.Index(
+                fields=["toUserId", "status"], name="followreq_to_status_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="message",
+            index=models.Index(
+                fields=["chatId", "timestamp"], name="messages_chat_ts_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                fields=["pincode", "-timestamp"], name="posts_pincode_ts_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                fields=["pincode", "post_type", "-timestamp"],
+                name="posts_pin_type_ts_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                fields=["userId", "-timestamp"], name="posts_user_ts_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="story",
+            index=models.Index(
+                fields=["userId", "expireAt"], name="stories_user_expire_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="userprofile",
+            index=models.Index(fields=["home_pincode"], name="users_home_pincode_idx"),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.0 on 2026-10-19 14:52
+
+from django.db import migrations, models
+
+from api.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0013_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PincodeArea",
+            fields=[
+                (
+                    "pincode",
+                    models.CharField(max_length=20, primary_key=True, serialize=False),
+                ),
+                ("latitude", models.FloatField(blank=True, null=True)),
+                ("longitude", models.FloatField(blank=True, null=True)),
+                ("users", models.IntegerField(default=0)),
+                ("refreshedAt", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "pincode_areas",
+            },
+        ),
+        migrations.CreateModel(
+            name="PincodeInterest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("pincode", models.CharField(max_length=20)),
+                ("interest_id", models.CharField(max_length=100)),
+                ("users", models.IntegerField()),
+            ],
+            options={
+                "db_table": "pincode_interests",
+                "indexes": [
+                    models.Index(
+                        fields=["pincode", "-users"], name="pincode_interest_rank_idx"
+                    )
+                ],
+                "unique_together": {("pincode", "interest_id")},
+            },
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="userprofile",
+            index=models.Index(fields=["updatedAt"], name="users_updated_at_idx"),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0 on 2026-10-19 14:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_pincode_interest_popularity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostInterest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("interest_id", models.CharField(max_length=100)),
+                ("postId", models.IntegerField()),
+                ("timestamp", models.DateTimeField()),
+                ("pincode", models.CharField(blank=True, max_length=10, null=True)),
+            ],
+            options={
+                "db_table": "post_interests",
+                "indexes": [
+                    models.Index(
+                        fields=["interest_id", "-timestamp", "-postId"],
+                        name="post_interest_recent_idx",
+                    )
+                ],
+                "unique_together": {("interest_id", "postId")},
+            },
+        ),
+    ]
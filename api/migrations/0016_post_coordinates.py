@@ -0,0 +1,76 @@
+# Generated by Django 5.0 on 2026-10-19 14:57
+
+from django.db import migrations, models
+
+from api.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+def _coordinate(value, limit):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not -limit <= value <= limit:
+        return None
+    return float(value)
+
+
+def copy_post_coordinates(apps, schema_editor):
+    """Fill the new columns from Post.location, 1000 posts per UPDATE batch"""
+    Post = apps.get_model("api", "Post")
+    last_id = 0
+    while True:
+        posts = list(
+            Post.objects.filter(postId__gt=last_id).order_by("postId").only("postId", "location")[:1000]
+        )
+        if not posts:
+            return
+        last_id = posts[-1].postId
+        located = []
+        for post in posts:
+            location = post.location if isinstance(post.location, dict) else {}
+            lat = _coordinate(location.get("latitude"), 90)
+            lon = _coordinate(location.get("longitude"), 180)
+            if lat is not None and lon is not None:
+                post.latitude, post.longitude = lat, lon
+                located.append(post)
+        Post.objects.bulk_update(located, ["latitude", "longitude"])
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0015_post_interest_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="latitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="longitude",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_post_coordinates, migrations.RunPython.noop),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                fields=["latitude", "longitude"], name="posts_lat_lon_idx"
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["home_latitude", "home_longitude"],
+                name="users_home_lat_lon_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="userprofile",
+            index=models.Index(
+                fields=["office_latitude", "office_longitude"],
+                name="users_office_lat_lon_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.0 on 2026-10-19 15:01
+
+from django.db import migrations, models
+
+from api.geo_grid import discovery_cell
+from api.migration_operations import AddIndexConcurrentlyIfSupported
+
+
+def fill_geo_cells(apps, schema_editor):
+    """Set geo_cell for existing users, 1000 per UPDATE batch"""
+    UserProfile = apps.get_model("api", "UserProfile")
+    fields = ("userId", "latitude", "longitude", "home_latitude", "home_longitude", "is_guest")
+    last_id = ""
+    while True:
+        users = list(
+            UserProfile.objects.filter(userId__gt=last_id).order_by("userId").only(*fields)[:1000]
+        )
+        if not users:
+            return
+        last_id = users[-1].userId
+        located = []
+        for user in users:
+            user.geo_cell = discovery_cell(
+                user.latitude, user.longitude, user.home_latitude, user.home_longitude, user.is_guest
+            )
+            if user.geo_cell is not None:
+                located.append(user)
+        UserProfile.objects.bulk_update(located, ["geo_cell"])
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0016_post_coordinates"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="geo_cell",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_geo_cells, migrations.RunPython.noop),
+        AddIndexConcurrentlyIfSupported(
+            model_name="userprofile",
+            index=models.Index(fields=["geo_cell"], name="users_geo_cell_idx"),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0 on 2026-10-19 15:03
+
+from django.db import migrations, models
+
+from api.migration_operations import RunSQLForVendor
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0017_user_geo_cell"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("post", "Post"), ("user", "User")], max_length=10
+                    ),
+                ),
+                ("object_id", models.CharField(max_length=255)),
+                ("pincode", models.CharField(blank=True, max_length=20, null=True)),
+                ("updatedAt", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "search_documents",
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+        RunSQLForVendor(
+            sql={
+                "postgresql": [
+                    "ALTER TABLE search_documents ADD COLUMN document tsvector",
+                    "CREATE INDEX search_documents_document_gin ON search_documents USING GIN (document)",
+                ],
+                "sqlite": [
+                    "CREATE VIRTUAL TABLE search_fts USING fts5("
+                    "title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+                ],
+            },
+            reverse_sql={
+                "postgresql": [
+                    "DROP INDEX IF EXISTS search_documents_document_gin",
+                    "ALTER TABLE search_documents DROP COLUMN IF EXISTS document",
+                ],
+                "sqlite": ["DROP TABLE IF EXISTS search_fts"],
+            },
+        ),
+    ]
@@ -0,0 +1,108 @@
+# Generated by Django 5.0 on 2026-10-19 15:09
+
+from django.db import migrations, models
+
+from api.migration_operations import (
+    AddIndexConcurrentlyIfSupported,
+    RemoveIndexConcurrentlyIfSupported,
+)
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("api", "0018_search_documents"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentReportCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "contentType",
+                    models.CharField(
+                        choices=[
+                            ("post", "Post"),
+                            ("user", "User"),
+                            ("comment", "Comment"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("contentId", models.IntegerField()),
+                ("report_count", models.IntegerField(default=0)),
+                ("last_reason", models.TextField(blank=True, default="")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("reviewed", "Reviewed"),
+                            ("action_taken", "Action Taken"),
+                            ("dismissed", "Dismissed"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("first_reported_at", models.DateTimeField()),
+                ("last_reported_at", models.DateTimeField()),
+                ("first_report_epoch", models.FloatField()),
+            ],
+            options={
+                "db_table": "content_report_counts",
+            },
+        ),
+        # A constant default: PostgreSQL adds the column without rewriting posts
+        migrations.AddField(
+            model_name="post",
+            name="hidden",
+            field=models.BooleanField(default=False),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("hidden", False)),
+                fields=["pincode", "-timestamp"],
+                name="posts_visible_pin_ts_idx",
+            ),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("hidden", False)),
+                fields=["pincode", "post_type", "-timestamp"],
+                name="posts_visible_pin_type_ts_idx",
+            ),
+        ),
+        # The partial indexes above replace these once built, so the feed is never unindexed
+        RemoveIndexConcurrentlyIfSupported(
+            model_name="post",
+            name="posts_pincode_ts_idx",
+        ),
+        RemoveIndexConcurrentlyIfSupported(
+            model_name="post",
+            name="posts_pin_type_ts_idx",
+        ),
+        migrations.AddIndex(
+            model_name="contentreportcount",
+            index=models.Index(fields=["status"], name="report_counts_status_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="contentreportcount",
+            constraint=models.UniqueConstraint(
+                fields=("contentType", "contentId"), name="report_counts_content_uniq"
+            ),
+        ),
+    ]
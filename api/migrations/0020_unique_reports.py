@@ -0,0 +1,48 @@
+# Generated by Django 5.0 on 2026-10-19 15:21
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_reports(apps, schema_editor):
+    """Keep each user's first report of an item and recount the items that had duplicates"""
+    ReportedContent = apps.get_model("api", "ReportedContent")
+    ContentReportCount = apps.get_model("api", "ContentReportCount")
+    duplicated = (
+        ReportedContent.objects.values("reporterUserId", "contentType", "contentId")
+        .annotate(first=Min("reportId"), n=Count("reportId"))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    recount = set()
+    for row in duplicated:
+        ReportedContent.objects.filter(
+            reporterUserId=row["reporterUserId"],
+            contentType=row["contentType"],
+            contentId=row["contentId"],
+        ).exclude(reportId=row["first"]).delete()
+        recount.add((row["contentType"], row["contentId"]))
+    for content_type, content_id in recount:
+        ContentReportCount.objects.filter(contentType=content_type, contentId=content_id).update(
+            report_count=ReportedContent.objects.filter(
+                contentType=content_type, contentId=content_id
+            ).count()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0019_moderation"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reports, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="reportedcontent",
+            constraint=models.UniqueConstraint(
+                fields=("reporterUserId", "contentType", "contentId"),
+                name="reports_reporter_content_uniq",
+            ),
+        ),
+    ]
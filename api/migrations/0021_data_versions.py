@@ -0,0 +1,26 @@
+# Generated by Django 5.0 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0020_unique_reports"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataVersion",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=100, primary_key=True, serialize=False),
+                ),
+                ("version", models.CharField(max_length=32)),
+            ],
+            options={
+                "db_table": "data_versions",
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 import json
+from .geo_grid import discovery_cell
 
 # Conditional import for PostgreSQL ArrayField
 try:
@@ -81,11 +83,36 @@ class UserProfile(models.Model):
     
     idCardUrl = models.URLField(blank=True, null=True)
 
+    # Nearby-people grid cell (api/geo_grid.py) of home, else latitude/longitude; null for guests
+    geo_cell = models.BigIntegerField(null=True, blank=True)
+
     class Meta:
         db_table = 'users'
+        indexes = [
+            models.Index(fields=['home_pincode'], name='users_home_pincode_idx'),
+            # Incremental refresh_interest_popularity runs: users changed since the last run
+            models.Index(fields=['updatedAt'], name='users_updated_at_idx'),
+            # Bounding-box lookups around home and office locations
+            models.Index(fields=['home_latitude', 'home_longitude'], name='users_home_lat_lon_idx'),
+            models.Index(fields=['office_latitude', 'office_longitude'], name='users_office_lat_lon_idx'),
+            # Nearby people: geo_cell BETWEEN ... per grid row
+            models.Index(fields=['geo_cell'], name='users_geo_cell_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.userId})" if self.name else f"User {self.userId}"
+
+    GEO_CELL_SOURCE_FIELDS = ('latitude', 'longitude', 'home_latitude', 'home_longitude', 'is_guest')
+
+    def save(self, *args, **kwargs):
+        # Keep geo_cell in step with the location it is derived from
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.GEO_CELL_SOURCE_FIELDS):
+            self.geo_cell = discovery_cell(self.latitude, self.longitude,
+                                           self.home_latitude, self.home_longitude, self.is_guest)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'geo_cell'}
+        super().save(*args, **kwargs)
     
     USERNAME_FIELD = 'userId'
     REQUIRED_FIELDS = []
@@ -114,6 +141,14 @@ class OTPVerification(models.Model):
     class Meta:
         db_table = 'otp_verifications'
         ordering = ['-created_at']
+        indexes = [
+            # Hot path for verify/resend: latest unverified OTP per identifier
+            models.Index(
+                fields=['identifier', '-created_at'],
+                name='otp_ident_created_unverified',
+                condition=Q(is_verified=False),
+            ),
+        ]
     
     def __str__(self):
         return f"OTP for {self.identifier}"
@@ -160,6 +195,51 @@ class Interest(models.Model):
         return self.name
 
 
+class PincodeArea(models.Model):
+    """Per-pincode user count and centroid, rebuilt by refresh_interest_popularity"""
+    pincode = models.CharField(max_length=20, primary_key=True)
+    latitude = models.FloatField(null=True, blank=True)  # Mean of members' coordinates
+    longitude = models.FloatField(null=True, blank=True)
+    users = models.IntegerField(default=0)
+    refreshedAt = models.DateTimeField()
+
+    class Meta:
+        db_table = 'pincode_areas'
+
+    def __str__(self):
+        return f"Area {self.pincode} ({self.users} users)"
+
+
+class PincodeInterest(models.Model):
+    """How many users in a pincode picked an interest, rebuilt by refresh_interest_popularity"""
+    pincode = models.CharField(max_length=20)
+    interest_id = models.CharField(max_length=100)
+    users = models.IntegerField()
+
+    class Meta:
+        db_table = 'pincode_interests'
+        unique_together = ['pincode', 'interest_id']
+        indexes = [
+            # Top interests for an area in one index range scan
+            models.Index(fields=['pincode', '-users'], name='pincode_interest_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.interest_id} in {self.pincode}: {self.users}"
+
+
+class DataVersion(models.Model):
+    """Version token for data that workers keep in memory (api/data_versions.py)"""
+    name = models.CharField(max_length=100, primary_key=True)
+    version = models.CharField(max_length=32)
+
+    class Meta:
+        db_table = 'data_versions'
+
+    def __str__(self):
+        return f"{self.name} {self.version}"
+
+
 class FollowRequest(models.Model):
     """Follow request model"""
     STATUS_CHOICES = [
@@ -177,6 +257,10 @@ class FollowRequest(models.Model):
     class Meta:
         db_table = 'followRequests'
         unique_together = ['fromUserId', 'toUserId']
+        indexes = [
+            # Incoming requests for a user; (fromUserId, toUserId) is covered by unique_together
+            models.Index(fields=['toUserId', 'status'], name='followreq_to_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.fromUserId} -> {self.toUserId} ({self.status})"
@@ -192,6 +276,9 @@ class Follower(models.Model):
     class Meta:
         db_table = 'followers'
         unique_together = ['followerId', 'followingId']
+        indexes = [
+            models.Index(fields=['followingId'], name='followers_following_idx'),
+        ]
 
     def __str__(self):
         return f"{self.followerId} follows {self.followingId}"
@@ -223,15 +310,75 @@ class Post(models.Model):
     
     # Location fields stored as JSON
     location = models.JSONField(default=dict)  # Contains: accuracy, altitude, altitudeAccuracy, heading, latitude, longitude, speed
+    # Copied from location on save (api/nearby.py) so nearby search can use an index
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Set once reports cross REPORT_AUTO_HIDE_THRESHOLD (api/moderation.py); hidden posts leave every feed
+    hidden = models.BooleanField(default=False)
 
     class Meta:
         db_table = 'posts'
         ordering = ['-timestamp']
+        indexes = [
+            # Pincode feed: pincode = X AND NOT hidden [AND post_type IN (...)] ORDER BY timestamp DESC.
+            # Partial, so hidden posts are never read and the feed queries need no extra filter step
+            models.Index(fields=['pincode', '-timestamp'], name='posts_visible_pin_ts_idx',
+                         condition=models.Q(hidden=False)),
+            models.Index(fields=['pincode', 'post_type', '-timestamp'], name='posts_visible_pin_type_ts_idx',
+                         condition=models.Q(hidden=False)),
+            # A user's posts, newest first
+            models.Index(fields=['userId', '-timestamp'], name='posts_user_ts_idx'),
+            # Nearby search: latitude BETWEEN ... AND longitude BETWEEN ...
+            models.Index(fields=['latitude', 'longitude'], name='posts_lat_lon_idx'),
+        ]
 
     def __str__(self):
         return f"Post {self.postId} by {self.userId}"
 
 
+class PostInterest(models.Model):
+    """Inverted index of posts by interest, written when a post is created"""
+    interest_id = models.CharField(max_length=100)
+    postId = models.IntegerField()
+    timestamp = models.DateTimeField()  # Copy of Post.timestamp
+    pincode = models.CharField(max_length=10, blank=True, null=True)  # Copy of Post.pincode, for proximity ranking
+
+    class Meta:
+        db_table = 'post_interests'
+        unique_together = ['interest_id', 'postId']
+        indexes = [
+            # Newest posts for one interest
+            models.Index(fields=['interest_id', '-timestamp', '-postId'], name='post_interest_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Post {self.postId} tagged {self.interest_id}"
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable post or user (api/search.py). The full-text index itself
+    is vendor specific and created by migration 0018: a tsvector `document`
+    column with a GIN index on PostgreSQL, an FTS5 table keyed by id on SQLite.
+    """
+    KIND_CHOICES = [
+        ('post', 'Post'),
+        ('user', 'User'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.CharField(max_length=255)  # postId or userId
+    pincode = models.CharField(max_length=20, blank=True, null=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_documents'
+        unique_together = ['kind', 'object_id']
+
+    def __str__(self):
+        return f"Search document for {self.kind} {self.object_id}"
+
+
 class Story(models.Model):
     """Story model with expiration"""
     MEDIA_TYPE_CHOICES = [
@@ -250,6 +397,10 @@ class Story(models.Model):
     class Meta:
         db_table = 'stories'
         ordering = ['-createdAt']
+        indexes = [
+            # A user's active stories: userId = X AND expireAt > now
+            models.Index(fields=['userId', 'expireAt'], name='stories_user_expire_idx'),
+        ]
 
     def __str__(self):
         return f"Story {self.storyId} by {self.userId}"
@@ -285,6 +436,9 @@ class Message(models.Model):
     class Meta:
         db_table = 'messages'
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['chatId', 'timestamp'], name='messages_chat_ts_idx'),
+        ]
 
     def __str__(self):
         return f"Message {self.messageId} in Chat {self.chatId}"
@@ -381,7 +535,38 @@ class ReportedContent(models.Model):
     class Meta:
         db_table = 'reported_content'
         ordering = ['-createdAt']
+        constraints = [
+            # One report per user and item, so a single user can't push an item past the hide threshold
+            models.UniqueConstraint(fields=['reporterUserId', 'contentType', 'contentId'],
+                                    name='reports_reporter_content_uniq'),
+        ]
 
     def __str__(self):
         return f"Report {self.reportId} - {self.contentType} {self.contentId}"
 
+
+class ContentReportCount(models.Model):
+    """Reports aggregated per reported item (api/moderation.py); the moderation queue reads these"""
+    contentType = models.CharField(max_length=20, choices=ReportedContent.CONTENT_TYPE_CHOICES)
+    contentId = models.IntegerField()
+    report_count = models.IntegerField(default=0)
+    last_reason = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=20, choices=ReportedContent.STATUS_CHOICES, default='pending')
+    first_reported_at = models.DateTimeField()
+    last_reported_at = models.DateTimeField()
+    # first_reported_at as Unix seconds, so report velocity is plain arithmetic in SQL
+    first_report_epoch = models.FloatField()
+
+    class Meta:
+        db_table = 'content_report_counts'
+        constraints = [
+            models.UniqueConstraint(fields=['contentType', 'contentId'], name='report_counts_content_uniq'),
+        ]
+        indexes = [
+            # Moderation queue: status = 'pending'
+            models.Index(fields=['status'], name='report_counts_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.contentType} {self.contentId}: {self.report_count} reports"
+
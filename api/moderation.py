@@ -0,0 +1,165 @@
+"""
+Content reports and the moderation queue.
+
+A report inserts one ReportedContent row (ON CONFLICT DO NOTHING against
+the unique (reporter, item) constraint, so each user counts once however
+many requests race) and, only if a row went in, counts it in the item's
+ContentReportCount row with a single upsert (INSERT ... ON CONFLICT DO
+UPDATE SET report_count = report_count + 1 RETURNING ...), so concurrent
+reports never lose an increment and nothing is read before the write.
+
+When a pending post's count reaches REPORT_AUTO_HIDE_THRESHOLD the post is
+hidden: Post.hidden is set and its pincode's feed version bumped. The feed
+indexes are partial on NOT hidden, so hidden posts are skipped by the index
+itself and hiding adds nothing to feed reads. Once a moderator has resolved
+an item, further reports are still counted but no longer hide it.
+
+The moderation queue lists pending items by report velocity, reports per
+hour since the first one (smoothed by an hour, so a single fresh report
+doesn't outrank a steady stream). Velocity is evaluated at the first page's
+as_of time and pages continue from a keyset cursor of (velocity, id), so
+the order holds still while a moderator pages through it.
+
+Removing a reported comment deletes it (and its direct replies), as comments
+have no hidden flag. Posts are hidden with .update(), which bypasses the Post signals on purpose
+(hiding doesn't reindex search or retag interests); readers of those indexes
+drop hidden posts when loading them.
+"""
+import time
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import ExpressionWrapper
+from django.utils import timezone
+from .conditional import bump_feed_version
+from .feed_common import encode_cursor
+from .models import ContentReportCount, Post, PostComment, ReportedContent
+
+
+# contentId is an integer column, so users (string ids) can't be reported here
+REPORTABLE_TYPES = ('post', 'comment')
+MAX_REASON_LENGTH = 1000
+
+QUEUE_PAGE_SIZE = 20
+QUEUE_MAX_PAGE_SIZE = 100
+VELOCITY_SMOOTHING_SECONDS = 3600.0
+QUEUE_CURSOR_TYPES = (float, float, int)  # (as_of, velocity, id)
+
+# Moderator decisions: action -> (status, whether a reported post stays hidden)
+RESOLUTIONS = {
+    'dismiss': ('dismissed', False),
+    'remove': ('action_taken', True),
+}
+
+
+def is_moderator(user_id):
+    return user_id in settings.MODERATOR_USER_IDS
+
+
+def content_exists(content_type, content_id):
+    if content_type == 'post':
+        return Post.objects.filter(postId=content_id).exists()
+    return PostComment.objects.filter(commentId=content_id).exists()
+
+
+def set_post_hidden(post_id, hidden):
+    """Hide or restore a post; returns True if it changed"""
+    if not Post.objects.filter(postId=post_id, hidden=not hidden).update(hidden=hidden):
+        return False
+    pincode = Post.objects.filter(postId=post_id).values_list('pincode', flat=True).first()
+    if pincode:
+        bump_feed_version(pincode)
+    return True
+
+
+def report_content(reporter_id, content_type, content_id, reason):
+    """
+    Record reporter_id's report and count it, hiding a post that reaches the threshold.
+    Returns: (report count, True if this report hid the post), or None if reporter_id had already reported it
+    """
+    connection = connections[router.db_for_write(ContentReportCount)]
+    now = timezone.now()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        # The unique (reporter, item) constraint makes a repeat report, concurrent or not, insert nothing
+        cursor.execute(
+            'INSERT INTO reported_content ("reporterUserId", "contentType", "contentId", reason, status, "createdAt") '
+            'VALUES (%s, %s, %s, %s, %s, %s) '
+            'ON CONFLICT ("reporterUserId", "contentType", "contentId") DO NOTHING RETURNING "reportId"',
+            [reporter_id, content_type, content_id, reason, 'pending', now],
+        )
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute(
+            'INSERT INTO content_report_counts ("contentType", "contentId", report_count, last_reason, status, '
+            'first_reported_at, last_reported_at, first_report_epoch) VALUES (%s, %s, 1, %s, %s, %s, %s, %s) '
+            'ON CONFLICT ("contentType", "contentId") DO UPDATE SET '
+            'report_count = content_report_counts.report_count + 1, last_reason = excluded.last_reason, '
+            'last_reported_at = excluded.last_reported_at RETURNING report_count, status',
+            [content_type, content_id, reason, 'pending', now, now, now.timestamp()],
+        )
+        count, item_status = cursor.fetchone()
+        hid = (
+            content_type == 'post' and item_status == 'pending'
+            and count >= settings.REPORT_AUTO_HIDE_THRESHOLD and set_post_hidden(content_id, True)
+        )
+    return count, hid
+
+
+def resolve_report(content_type, content_id, action):
+    """
+    Apply a moderator decision (a RESOLUTIONS key) to a reported item and its reports.
+    'remove' keeps a post hidden and deletes a comment.
+    Returns: False if the item has no reports
+    """
+    item_status, keep_hidden = RESOLUTIONS[action]
+    with transaction.atomic():
+        if not ContentReportCount.objects.filter(contentType=content_type, contentId=content_id) \
+                .update(status=item_status):
+            return False
+        ReportedContent.objects.filter(contentType=content_type, contentId=content_id, status='pending') \
+            .update(status=item_status)
+        if content_type == 'post':
+            set_post_hidden(content_id, keep_hidden)
+        elif keep_hidden:
+            # Comments have no hidden flag, so removing one deletes it along with its replies
+            PostComment.objects.filter(Q(commentId=content_id) | Q(parentCommentId=content_id)).delete()
+    return True
+
+
+def moderation_queue(limit=QUEUE_PAGE_SIZE, cursor=None):
+    """
+    Pending reported items, fastest-reported first.
+    cursor: the previous page's next cursor, decoded with QUEUE_CURSOR_TYPES
+    Returns: ([{'content_type', 'content_id', ...}], cursor for the next page or None)
+    """
+    as_of, after = (cursor[0], cursor[1:]) if cursor else (time.time(), None)
+    velocity = ExpressionWrapper(
+        F('report_count') * Value(VELOCITY_SMOOTHING_SECONDS)
+        / (Value(as_of) - F('first_report_epoch') + Value(VELOCITY_SMOOTHING_SECONDS)),
+        output_field=FloatField(),
+    )
+    items = ContentReportCount.objects.filter(status='pending').annotate(velocity=velocity)
+    if after is not None:
+        last_velocity, last_id = after
+        items = items.filter(Q(velocity__lt=last_velocity) | Q(velocity=last_velocity, id__lt=last_id))
+    rows = list(items.order_by('-velocity', '-id')[:limit + 1])
+    page = rows[:limit]
+
+    hidden_posts = set(
+        Post.objects.filter(postId__in=[row.contentId for row in page if row.contentType == 'post'], hidden=True)
+        .values_list('postId', flat=True)
+    )
+    next_cursor = encode_cursor(as_of, page[-1].velocity, page[-1].id) if len(rows) > limit else None
+    return [
+        {
+            'content_type': row.contentType,
+            'content_id': row.contentId,
+            'report_count': row.report_count,
+            'reports_per_hour': round(row.velocity, 3),
+            'last_reason': row.last_reason,
+            'first_reported_at': row.first_reported_at.isoformat(),
+            'last_reported_at': row.last_reported_at.isoformat(),
+            'hidden': row.contentType == 'post' and row.contentId in hidden_posts,
+        }
+        for row in page
+    ], next_cursor
@@ -0,0 +1,123 @@
+"""
+Nearby post search.
+
+Post.location is a JSON blob, so its latitude/longitude are copied into
+plain columns on every save (and by migration 0016 for older posts) where
+posts_lat_lon_idx can serve range scans. A search reads the (postId,
+latitude, longitude) rows inside the radius's bounding box, computes exact
+haversine distances for all candidates in one NumPy pass, and returns them
+nearest first. Pages continue from an opaque cursor holding the last
+(distance, postId), so no page re-sends rows from an earlier one.
+"""
+import math
+import numpy as np
+from django.db.models import Q
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+from .feed_common import encode_cursor
+from .geo_grid import EARTH_RADIUS_KM, KM_PER_DEGREE
+from .models import Post
+
+
+NEARBY_PAGE_SIZE = 20
+NEARBY_MAX_PAGE_SIZE = 50
+NEARBY_DEFAULT_RADIUS_KM = 5
+NEARBY_CURSOR_TYPES = (float, int)  # (distance_km, postId)
+
+
+def _coordinate(value, limit):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not -limit <= value <= limit:
+        return None
+    return float(value)
+
+
+def coordinates(location):
+    """(latitude, longitude) from a location JSON object, or (None, None) if missing/invalid"""
+    if not isinstance(location, dict):
+        return None, None
+    lat = _coordinate(location.get('latitude'), 90)
+    lon = _coordinate(location.get('longitude'), 180)
+    if lat is None or lon is None:
+        return None, None
+    return lat, lon
+
+
+def post_location(requested, fallback=(None, None)):
+    """
+    Location JSON for a new post: the client's location if sent, else the
+    fallback (latitude, longitude), e.g. the author's home or office.
+    Returns: (location, error message or None)
+    """
+    if requested is not None:
+        if coordinates(requested) == (None, None):
+            return None, 'location must have numeric latitude and longitude'
+        return requested, None
+    lat, lon = fallback
+    if lat is None or lon is None:
+        return {}, None
+    return {'latitude': lat, 'longitude': lon}, None
+
+
+@receiver(pre_save, sender=Post)
+def _copy_coordinates(sender, instance, **kwargs):
+    instance.latitude, instance.longitude = coordinates(instance.location)
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Box around every point within radius_km of (lat, lon).
+    Returns: (min_lat, max_lat, [(min_lon, max_lon), ...]); two longitude
+    ranges when the box crosses the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+    # Longitude degrees are shortest at the box edge furthest from the equator
+    widest = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if widest <= 0 or radius_km / (KM_PER_DEGREE * widest) >= 180:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+    delta_lon = radius_km / (KM_PER_DEGREE * widest)
+    low, high = lon - delta_lon, lon + delta_lon
+    if low < -180:
+        return min_lat, max_lat, [(low + 360, 180.0), (-180.0, high)]
+    if high > 180:
+        return min_lat, max_lat, [(low, 180.0), (-180.0, high - 360)]
+    return min_lat, max_lat, [(low, high)]
+
+
+def haversine_km_array(lat, lon, lats, lons):
+    """Distances in km from (lat, lon) to each of the points (lats[i], lons[i])"""
+    lat, lon = math.radians(lat), math.radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat) / 2) ** 2 + math.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def nearby_posts(lat, lon, radius_km, limit=NEARBY_PAGE_SIZE, after=None, excluded_authors=()):
+    """
+    Posts within radius_km of (lat, lon), nearest first (postId breaks ties).
+    after: (distance_km, postId) of the previous page's last post
+    excluded_authors: userIds whose posts are left out (the viewer's block set)
+    Returns: ([(postId, distance_km)], cursor for the next page or None)
+    """
+    min_lat, max_lat, lon_ranges = bounding_box(lat, lon, radius_km)
+    in_box = Q()
+    for low, high in lon_ranges:
+        in_box |= Q(longitude__range=(low, high))
+    rows = Post.objects.filter(in_box, latitude__range=(min_lat, max_lat), hidden=False)
+    if excluded_authors:
+        rows = rows.exclude(userId__in=excluded_authors)
+    rows = rows.order_by().values_list('postId', 'latitude', 'longitude')
+    candidates = np.array(list(rows), dtype=float).reshape(-1, 3)
+
+    ids = candidates[:, 0]
+    distances = haversine_km_array(lat, lon, candidates[:, 1], candidates[:, 2])
+    keep = distances <= radius_km
+    if after is not None:
+        last_distance, last_id = after
+        keep &= (distances > last_distance) | ((distances == last_distance) & (ids > last_id))
+    ids, distances = ids[keep], distances[keep]
+    order = np.lexsort((ids, distances))[:limit + 1]
+
+    page = [(int(ids[i]), float(distances[i])) for i in order[:limit]]
+    next_cursor = encode_cursor(page[-1][1], page[-1][0]) if len(order) > limit else None
+    return page, next_cursor
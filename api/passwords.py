@@ -0,0 +1,60 @@
+"""
+Password hash verification on a dedicated, bounded thread pool.
+
+Hashing is deliberately slow, so a burst of logins can otherwise occupy every
+request thread. Verification runs on at most PASSWORD_HASH_WORKERS threads
+per process (argon2/bcrypt release the GIL while hashing); callers that can't
+get a slot within PASSWORD_HASH_QUEUE_TIMEOUT seconds get PasswordHashBusy
+instead of queueing behind the burst.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import verify_password, make_password, is_password_usable
+
+
+class PasswordHashBusy(Exception):
+    """Raised when every hashing slot is taken"""
+
+
+_executor = None
+_slots = None
+_init_lock = threading.Lock()
+
+
+def _get_pool():
+    global _executor, _slots
+    if _executor is None:
+        with _init_lock:
+            if _executor is None:
+                workers = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+                # Allow a short queue behind the running hashes, no more
+                _slots = threading.BoundedSemaphore(workers * 2)
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+    return _executor, _slots
+
+
+def _run_bounded(fn, *args):
+    executor, slots = _get_pool()
+    if not slots.acquire(timeout=getattr(settings, 'PASSWORD_HASH_QUEUE_TIMEOUT', 2)):
+        raise PasswordHashBusy()
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def check_password_bounded(raw_password, encoded):
+    """
+    Verify raw_password against encoded on the hashing pool.
+    Returns: (is_correct: bool, new_encoded: str|None) where new_encoded is set
+    when the stored hash uses an outdated hasher/work factor and should be
+    replaced (rehash-on-login). The caller persists it on its own DB connection.
+    """
+    if not encoded or not is_password_usable(encoded):
+        return False, None
+
+    is_correct, must_update = _run_bounded(verify_password, raw_password, encoded)
+    if is_correct and must_update:
+        return True, _run_bounded(make_password, raw_password)
+    return is_correct, None
@@ -0,0 +1,114 @@
+"""
+Nearby people discovery.
+
+Profiles are found through UserProfile.geo_cell (see api/geo_grid.py),
+which UserProfile.save() keeps current and which is null for guests, so
+guests never match. Writes that skip save() (.update(), bulk_create) leave
+it stale until backfill_geo_cells() (the backfill_geo_cells command) runs. A page scans rings outwards from the caller in bands
+of doubling width (one indexed query per band) until it holds a page of
+people that are provably nearer than anything in the rings not yet read;
+each page is therefore in exact distance order and costs a handful of
+index range scans whatever the table size. The caller's cached block set
+(api/blocks.py) is excluded in the same queries.
+"""
+import numpy as np
+from django.db.models import Q
+from .blocks import block_set
+from .feed_common import encode_cursor
+from .geo_grid import Rings, discovery_cell
+from .models import UserProfile
+from .nearby import haversine_km_array
+
+
+PEOPLE_PAGE_SIZE = 20
+PEOPLE_MAX_PAGE_SIZE = 50
+PEOPLE_DEFAULT_RADIUS_KM = 5
+# (first ring still to read, distance_km, userId) of the last person returned
+PEOPLE_CURSOR_TYPES = (int, float, str)
+
+
+def _band(rings, start, end, excluded):
+    """(userId, name, profilePhoto, distance_km) for non-guest users in rings start .. end - 1"""
+    in_band = Q()
+    for low, high in rings.band_ranges(start, end):
+        in_band |= Q(geo_cell__range=(low, high))
+    rows = list(
+        UserProfile.objects.filter(in_band).exclude(userId__in=excluded).order_by()
+        .values_list('userId', 'name', 'profilePhoto', 'home_latitude', 'home_longitude', 'latitude', 'longitude')
+    )
+    if not rows:
+        return []
+    # Same location choice as geo_grid.discovery_cell: home, else last known
+    coords = np.array([
+        (home_lat, home_lon) if home_lat is not None and home_lon is not None else (lat, lon)
+        for _, _, _, home_lat, home_lon, lat, lon in rows
+    ], dtype=float)
+    distances = haversine_km_array(rings.lat, rings.lon, coords[:, 0], coords[:, 1])
+    return [(row[0], row[1], row[2], float(km)) for row, km in zip(rows, distances)]
+
+
+def nearby_people(user_id, lat, lon, radius_km, limit=PEOPLE_PAGE_SIZE, cursor=None):
+    """
+    People within radius_km of (lat, lon), nearest first (userId breaks ties),
+    excluding user_id and anyone blocked either way.
+    cursor: the previous page's next cursor, decoded with PEOPLE_CURSOR_TYPES
+    Returns: ([{'user_id', 'name', 'profile_photo', 'distance_km'}], next cursor or None)
+    """
+    ring, after = (cursor[0], cursor[1:]) if cursor else (0, None)
+    rings = Rings(lat, lon)
+    excluded = block_set(user_id) | {user_id}
+
+    found = {}  # userId -> (distance_km, userId, first ring of its band, name, photo)
+    width = 1
+    while True:
+        end = ring + width
+        for other_id, name, photo, km in _band(rings, ring, end, excluded):
+            if km <= radius_km and (after is None or (km, other_id) > after) and other_id not in found:
+                found[other_id] = (km, other_id, ring, name, photo)
+        ring, width = end, width * 2
+        covered_km = rings.covered_km(ring)
+        if covered_km >= radius_km:
+            ready = sorted(found.values())
+            break
+        ready = sorted(entry for entry in found.values() if entry[0] < covered_km)
+        if len(ready) >= limit:
+            break
+
+    page = ready[:limit]
+    returned = {entry[1] for entry in page}
+    rest = [entry for entry in found.values() if entry[1] not in returned]
+    next_cursor = None
+    if page and (rest or covered_km < radius_km):
+        # Resume at the first band still holding someone not yet returned
+        resume = min([entry[2] for entry in rest] + ([ring] if covered_km < radius_km else []))
+        next_cursor = encode_cursor(resume, page[-1][0], page[-1][1])
+    people = [
+        {'user_id': other_id, 'name': name, 'profile_photo': photo, 'distance_km': round(km, 3)}
+        for km, other_id, _, name, photo in page
+    ]
+    return people, next_cursor
+
+
+def backfill_geo_cells(batch_size=1000):
+    """
+    Recompute geo_cell for every user, batch_size users at a time, writing
+    only the ones that changed.
+    Returns: number of users updated
+    """
+    fields = ('userId', 'geo_cell', *UserProfile.GEO_CELL_SOURCE_FIELDS)
+    updated = 0
+    last_id = ''
+    while True:
+        users = list(UserProfile.objects.filter(userId__gt=last_id).order_by('userId').only(*fields)[:batch_size])
+        if not users:
+            return updated
+        last_id = users[-1].userId
+        changed = []
+        for user in users:
+            cell = discovery_cell(user.latitude, user.longitude, user.home_latitude, user.home_longitude,
+                                  user.is_guest)
+            if cell != user.geo_cell:
+                user.geo_cell = cell
+                changed.append(user)
+        UserProfile.objects.bulk_update(changed, ['geo_cell'])
+        updated += len(changed)
@@ -0,0 +1,129 @@
+"""
+Post creation for /create-post and /save-post.
+
+validate_post() checks a request body against the author's profile (the
+cached auth projection, see LazyUserProfile) and the interest catalog, and
+create_post() writes the post with a single INSERT ... RETURNING "postId",
+outside any transaction and without ever writing the author's profile.
+The post's derived data follows:
+- pincode feed version: a data_versions token replaced right after the
+  insert (api/conditional.py)
+- nearby search coordinates: copied from the location before the insert (api/nearby.py)
+- interest feed tags and the search document: written in the background
+  (api/background.py, api/search.py)
+"""
+from .background import run_after_commit
+from .constants import PINCODE_HOME_ID, PINCODE_OFFICE_ID, PINCODE_PREFIX
+from .interest_feed import post_interest_ids, tag_post
+from .models import Post
+from .nearby import post_location
+
+
+POST_TYPES = ['post', 'question', 'alert', 'recommendation']
+MAX_CONTENT_LENGTH = 500
+
+
+def _profile_pincode(user, pincode_type):
+    if pincode_type == 'home':
+        return user.home_pincode or user.pincode
+    return user.office_pincode
+
+
+def _resolve_pincode(user, pincode_id, profile_ids):
+    """
+    (pincode, pincode type or None) for pincode_id, or an error.
+    profile_ids: accept PINCODE_HOME_ID / PINCODE_OFFICE_ID and take any
+    `pincode_<type>_<pincode>` id as is (/save-post); otherwise the id must
+    name the user's own home or office pincode (/create-post)
+    Returns: ((pincode, pincode type), error message or None)
+    """
+    from_profile = profile_ids and pincode_id in (PINCODE_HOME_ID, PINCODE_OFFICE_ID)
+    if from_profile:
+        pincode_type = 'home' if pincode_id == PINCODE_HOME_ID else 'office'
+        pincode = _profile_pincode(user, pincode_type)
+        if not pincode:
+            return None, f'User has no {pincode_type} pincode set'
+        pincode = str(pincode)
+    else:
+        parts = pincode_id.split('_') if isinstance(pincode_id, str) else []
+        if len(parts) < 3 or parts[0] != PINCODE_PREFIX:
+            return None, 'Invalid pincode_id format'
+        pincode_type, pincode = parts[1], parts[-1].strip()
+    if not pincode.isdigit() or len(pincode) != 6:
+        return None, 'Invalid pincode format'
+    if from_profile:
+        return (pincode, pincode_type), None
+    if profile_ids:
+        # Legacy ids aren't checked against the profile, nor used for the location fallback
+        return (pincode, None), None
+
+    if pincode_type not in ('home', 'office'):
+        return None, 'pincode_id must reference home or office'
+    expected = _profile_pincode(user, pincode_type)
+    if not expected:
+        return None, f'User has no {pincode_type} pincode set'
+    if str(expected).strip() != pincode:
+        return None, f'Provided pincode does not match user {pincode_type} pincode'
+    return (pincode, pincode_type), None
+
+
+def validate_post(user, data, profile_ids=False):
+    """
+    Check a post request body from user.
+    profile_ids: see _resolve_pincode()
+    Returns: (draft dict for create_post(), error message or None)
+    """
+    post_type = data.get('post_type')
+    content = data.get('content', '')
+    content = content.strip() if isinstance(content, str) else ''
+    pincode_id = data.get('pincode_id')
+    photo_url = data.get('photo_url')
+
+    if not post_type or post_type not in POST_TYPES:
+        return None, f'post_type is required and must be one of: {", ".join(POST_TYPES)}'
+    if not content:
+        return None, 'content is required'
+    if len(content) > MAX_CONTENT_LENGTH:
+        return None, f'content must not exceed {MAX_CONTENT_LENGTH} characters'
+    if not pincode_id:
+        return None, 'pincode_id is required'
+
+    resolved, error = _resolve_pincode(user, pincode_id, profile_ids)
+    if error:
+        return None, error
+    pincode, pincode_type = resolved
+
+    # Interests the post is indexed under for the interest feed
+    interest_ids, error = post_interest_ids(data.get('interests'), user.interests)
+    if error:
+        return None, error
+
+    # Where the post was made: the client's location, else the home/office it is posted to
+    if pincode_type == 'home':
+        fallback = (user.home_latitude, user.home_longitude)
+    elif pincode_type == 'office':
+        fallback = (user.office_latitude, user.office_longitude)
+    else:
+        fallback = (None, None)
+    location, error = post_location(data.get('location'), fallback)
+    if error:
+        return None, error
+
+    has_photo = isinstance(photo_url, str) and photo_url.strip()
+    return {
+        'post_type': post_type,
+        'description': content,
+        'mediaType': 'image' if has_photo else 'text',
+        'mediaURL': photo_url.strip() if has_photo else None,
+        'pincode': pincode,
+        'location': location,
+        'interest_ids': interest_ids,
+    }, None
+
+
+def create_post(user_id, draft):
+    """Insert the post from validate_post()'s draft; its interest tags follow after commit"""
+    fields = {key: value for key, value in draft.items() if key != 'interest_ids'}
+    post = Post.objects.create(userId=user_id, **fields)
+    run_after_commit(tag_post, post, draft['interest_ids'])
+    return post
@@ -0,0 +1,61 @@
+"""
+Short-TTL cache of the slim profile projection used by JWT authentication.
+
+Entries are keyed by a schema version (bump AUTH_PROFILE_CACHE_VERSION when
+the cached column set changes) and the userId. Any save/delete of a
+UserProfile drops its entry once the transaction commits; bulk .update()
+callers must call invalidate_auth_profile() themselves.
+
+Only used with a shared cache (SHARED_CACHE): invalidation runs in the
+worker that wrote, so a per-process copy elsewhere would keep serving the
+old interests and pincodes until it expired. Views that save a principal
+rebuilt from the cache must pass update_fields, so cached values are never
+written back.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import UserProfile
+from .metrics import record_cache_lookup
+
+
+AUTH_PROFILE_CACHE_VERSION = 4
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTH_PROFILE_CACHE_ALIAS', 'default')]
+
+
+def _cache_key(user_id):
+    return f"authprofile:v{AUTH_PROFILE_CACHE_VERSION}:{user_id}"
+
+
+def get_cached_auth_profile(user_id):
+    """Cached {field: value} projection for user_id, or None on miss (always, without a shared cache)"""
+    if not settings.SHARED_CACHE:
+        return None
+    payload = _cache().get(_cache_key(user_id))
+    record_cache_lookup('auth_profile', payload is not None)
+    return payload
+
+
+def set_cached_auth_profile(user_id, payload):
+    ttl = getattr(settings, 'AUTH_PROFILE_CACHE_TTL', 60)
+    if ttl and settings.SHARED_CACHE:
+        _cache().set(_cache_key(user_id), payload, timeout=ttl)
+
+
+def invalidate_auth_profile(user_id):
+    """Drop the cached projection after the current transaction commits"""
+    if not settings.SHARED_CACHE:
+        return
+    key = _cache_key(user_id)
+    transaction.on_commit(lambda: _cache().delete(key))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def _invalidate_on_profile_change(sender, instance, **kwargs):
+    invalidate_auth_profile(instance.userId)
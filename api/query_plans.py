@@ -0,0 +1,88 @@
+"""
+EXPLAIN checks for the hot read paths in feed_views.py and views.py
+"""
+import re
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from .models import ContentReportCount, Post, Story, Message, FollowRequest, Follower, UserProfile, PincodeInterest, PostInterest
+
+
+# Tables smaller than this may legitimately be scanned (the planner prefers it)
+DEFAULT_SEQ_SCAN_MIN_ROWS = 10000
+
+SAMPLE_PINCODE = '560001'
+SAMPLE_USER_ID = 'explain-sample-user'
+
+_SEQ_SCAN_PATTERNS = {
+    'postgresql': re.compile(r'Seq Scan on "?(\w+)"?'),
+    'sqlite': re.compile(r'\bSCAN "?(\w+)"?'),
+}
+
+
+def hot_queries():
+    """
+    Querysets shaped like the production queries, keyed by name.
+    Filter values are samples; only the plan shape matters.
+    """
+    return {
+        'home_feed_by_pincode': Post.objects.filter(pincode=SAMPLE_PINCODE, hidden=False).order_by('-timestamp')[:20],
+        'home_feed_by_pincode_and_type': Post.objects.filter(
+            pincode=SAMPLE_PINCODE, hidden=False, post_type__in=['question', 'alert']
+        ).order_by('-timestamp')[:20],
+        'user_posts': Post.objects.filter(userId=SAMPLE_USER_ID),
+        'user_active_stories': Story.objects.filter(userId=SAMPLE_USER_ID, expireAt__gt=timezone.now()),
+        'chat_messages': Message.objects.filter(chatId=1),
+        'incoming_follow_requests': FollowRequest.objects.filter(toUserId=SAMPLE_USER_ID, status='pending'),
+        'user_followers': Follower.objects.filter(followingId=SAMPLE_USER_ID),
+        'users_by_home_pincode': UserProfile.objects.filter(home_pincode=SAMPLE_PINCODE),
+        'area_interest_counts': PincodeInterest.objects.filter(pincode=SAMPLE_PINCODE),
+        'interest_feed_candidates': PostInterest.objects.filter(interest_id='music').order_by('-timestamp', '-postId')[:50],
+        'nearby_posts_bbox': Post.objects.filter(
+            latitude__range=(12.9, 13.0), longitude__range=(77.5, 77.6)
+        ).values_list('postId', 'latitude', 'longitude'),
+        'nearby_people_band': UserProfile.objects.filter(
+            Q(geo_cell__range=(3852925750, 3852925760)) | Q(geo_cell__range=(3852961750, 3852961760))
+        ).values_list('userId', 'home_latitude', 'home_longitude'),
+        'moderation_queue': ContentReportCount.objects.filter(status='pending'),
+        'users_changed_since': UserProfile.objects.filter(updatedAt__gte=timezone.now()),
+    }
+
+
+def seq_scanned_tables(plan, vendor=None):
+    """Tables read by a full scan in an EXPLAIN output"""
+    pattern = _SEQ_SCAN_PATTERNS.get(vendor or connection.vendor)
+    if pattern is None:
+        return set()
+    return set(pattern.findall(plan))
+
+
+def estimated_rows(table):
+    """Planner row estimate on PostgreSQL (exact count elsewhere or if never analyzed)"""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+            row = cursor.fetchone()
+            if row and row[0] >= 0:
+                return row[0]
+        cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+        return cursor.fetchone()[0]
+
+
+def audit_hot_queries(min_rows=DEFAULT_SEQ_SCAN_MIN_ROWS):
+    """
+    EXPLAIN every hot query.
+    Returns: list of {'name', 'plan', 'seq_scans': [tables], 'violations': [tables]}
+    where violations are full scans of tables with at least min_rows rows.
+    """
+    results = []
+    for name, queryset in hot_queries().items():
+        plan = queryset.explain()
+        scanned = sorted(seq_scanned_tables(plan))
+        results.append({
+            'name': name,
+            'plan': plan,
+            'seq_scans': scanned,
+            'violations': [table for table in scanned if estimated_rows(table) >= min_rows],
+        })
+    return results
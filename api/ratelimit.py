@@ -0,0 +1,192 @@
+"""
+Sliding-window rate limiting for OTP sends and logins.
+
+Counters are kept per (scope, dimension, key) where dimension is one of
+'identifier', 'device' or 'ip'. Each window is split into fixed buckets and
+the effective count is the current bucket plus the weighted tail of the
+previous one (sliding window counter), so memory stays at two integers per
+key regardless of traffic.
+
+Stores are pluggable through settings.RATE_LIMIT_STORE:
+- LocalMemoryRateLimitStore: per-process, used in tests
+- CacheRateLimitStore: Django cache backend, shared across gunicorn workers
+  when CACHES points at Redis/Memcached
+"""
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class LocalMemoryRateLimitStore:
+    """In-process counter store (not shared between workers)"""
+
+    # Expired entries are swept once the table grows past this size
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key, ttl):
+        now = time.monotonic()
+        with self._lock:
+            value, expires_at = self._counters.get(key, (0, 0))
+            if expires_at <= now:
+                value = 0
+            value += 1
+            self._counters[key] = (value, now + ttl)
+            if len(self._counters) > self.MAX_ENTRIES:
+                self._sweep(now)
+            return value
+
+    def get(self, key):
+        with self._lock:
+            value, expires_at = self._counters.get(key, (0, 0))
+            return value if expires_at > time.monotonic() else 0
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+    def _sweep(self, now):
+        for key in [k for k, (_, expires_at) in self._counters.items() if expires_at <= now]:
+            del self._counters[key]
+
+
+class CacheRateLimitStore:
+    """Counter store backed by a Django cache alias (settings.RATE_LIMIT_CACHE_ALIAS)"""
+
+    def __init__(self):
+        self.cache = caches[getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', 'default')]
+
+    def incr(self, key, ttl):
+        # add() is a no-op when the key exists, so incr() stays atomic on shared backends
+        self.cache.add(key, 0, timeout=ttl)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Key expired between add() and incr()
+            self.cache.set(key, 1, timeout=ttl)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+    def clear(self):
+        self.cache.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_rate_limit_store():
+    """Return the configured store instance (created once per process)"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store_path = getattr(settings, 'RATE_LIMIT_STORE', 'api.ratelimit.CacheRateLimitStore')
+                _store = import_string(store_path)()
+    return _store
+
+
+@receiver(setting_changed)
+def _reset_store_on_settings_change(setting, **kwargs):
+    global _store
+    if setting in ('RATE_LIMIT_STORE', 'RATE_LIMIT_CACHE_ALIAS', 'CACHES'):
+        _store = None
+
+
+def get_client_ip(request):
+    """
+    Client IP. Behind RATE_LIMIT_TRUSTED_PROXY_COUNT trusted proxies (with
+    RATE_LIMIT_TRUST_FORWARDED_FOR set) this is the X-Forwarded-For entry the
+    outermost one appended; entries left of it come from the client and could
+    be anything. Falls back to REMOTE_ADDR.
+    """
+    if getattr(settings, 'RATE_LIMIT_TRUST_FORWARDED_FOR', False):
+        hops = [hop.strip() for hop in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if hop.strip()]
+        proxy_count = max(getattr(settings, 'RATE_LIMIT_TRUSTED_PROXY_COUNT', 1), 1)
+        if len(hops) >= proxy_count:
+            return hops[-proxy_count]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _counter_key(scope, dimension, value, bucket):
+    # Hash the raw value so emails/phones never end up in cache keys
+    digest = hashlib.sha1(str(value).encode('utf-8')).hexdigest()
+    return f"rl:{scope}:{dimension}:{digest}:{bucket}"
+
+
+def hit(scope, dimension, value, limit, window, now=None):
+    """
+    Record one attempt and check it against the sliding window.
+    Returns: (allowed: bool, retry_after_seconds: int)
+    """
+    store = get_rate_limit_store()
+    now = time.time() if now is None else now
+    bucket = int(now // window)
+    elapsed_fraction = (now % window) / window
+
+    current = store.incr(_counter_key(scope, dimension, value, bucket), ttl=window * 2)
+    previous = store.get(_counter_key(scope, dimension, value, bucket - 1))
+    estimated = current + previous * (1 - elapsed_fraction)
+
+    if estimated > limit:
+        retry_after = max(1, int(window * (1 - elapsed_fraction)))
+        return False, retry_after
+    return True, 0
+
+
+def check_rate_limit(scope, identifier=None, device_id=None, ip=None):
+    """
+    Apply every configured rule for scope (settings.RATE_LIMITS[scope]).
+    Dimensions with no value (e.g. missing device id) are skipped.
+    Returns: (allowed: bool, retry_after_seconds: int)
+    """
+    if not getattr(settings, 'RATE_LIMIT_ENABLED', True):
+        return True, 0
+
+    rules = getattr(settings, 'RATE_LIMITS', {}).get(scope, {})
+    values = {'identifier': identifier, 'device': device_id, 'ip': ip}
+
+    retry_after = 0
+    for dimension, (limit, window) in rules.items():
+        value = values.get(dimension)
+        if not value:
+            continue
+        allowed, wait = hit(scope, dimension, value, limit, window)
+        if not allowed:
+            retry_after = max(retry_after, wait)
+
+    return retry_after == 0, retry_after
+
+
+def rate_limit_response(request, scope, identifier=None, device_id=None):
+    """
+    Return a 429 Response when the caller is over any limit for scope, else None.
+    Call this before doing any DB or network work in the view.
+    """
+    allowed, retry_after = check_rate_limit(
+        scope,
+        identifier=identifier,
+        device_id=device_id,
+        ip=get_client_ip(request)
+    )
+    if allowed:
+        return None
+
+    response = Response(
+        {'error': 'Too many requests. Please try again later.', 'retry_after': retry_after},
+        status=status.HTTP_429_TOO_MANY_REQUESTS
+    )
+    response['Retry-After'] = str(retry_after)
+    return response
@@ -0,0 +1,41 @@
+"""
+orjson-backed JSON renderer.
+
+Output matches rest_framework.renderers.JSONRenderer (compact separators,
+UTF-8, U+2028/U+2029 escaped) but encoding runs in C, which matters for the
+large nested feed payloads. Types orjson doesn't encode the same way as DRF
+(datetimes, Decimal, lazy translation strings, querysets...) go through DRF's
+JSONEncoder.default, and anything orjson refuses outright (e.g. integers
+wider than 64 bits) falls back to the stdlib renderer.
+"""
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+_default = JSONEncoder().default
+
+
+def encode_json(data, indent=False):
+    """bytes: data encoded as DRF's JSONRenderer would"""
+    options = _OPTIONS | orjson.OPT_INDENT_2 if indent else _OPTIONS
+    try:
+        body = orjson.dumps(data, default=_default, option=options)
+    except orjson.JSONEncodeError:
+        return JSONRenderer().render(data, renderer_context={'indent': 2 if indent else None})
+    # Valid JSON but not valid JavaScript; escaped like JSONRenderer does
+    return body.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = JSONRenderer().get_indent(accepted_media_type, renderer_context)
+        return encode_json(data, indent=bool(indent))
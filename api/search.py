@@ -0,0 +1,231 @@
+"""
+Full-text search over posts and users.
+
+Each searchable post (description) and registered user (name, bio) has a
+SearchDocument row. The text index is per vendor (migration 0018):
+- PostgreSQL: search_documents.document, a weighted tsvector ('simple'
+  config, so prefixes match unstemmed words) with a GIN index, ranked by
+  ts_rank
+- SQLite (local runs): the FTS5 table search_fts keyed by the document id,
+  with prefix indexes for type-ahead, ranked by bm25
+Titles (user names) weigh more than bodies.
+
+Documents are written by post_save/post_delete receivers in the background
+(api/background.py) once the surrounding transaction commits: reindex()
+reads the row as it is then and upserts (or removes) its search_documents
+row, so tasks that run out of order still leave the latest state.
+There are no triggers on the posts or users tables, so a write there never
+waits on index maintenance; the index trails commits by a moment.
+rebuild_search_index() (the rebuild_search_index command) indexes
+existing rows.
+
+Queries are AND-ed prefix terms. Results are ordered by rank then document
+id, and pages continue from a keyset cursor of the last (rank, id). Hidden
+posts (hiding bypasses the signals, so their documents stay) and the
+viewer's blocked users and their posts are filtered inside the ranked
+query, before LIMIT, so they never take a page slot.
+"""
+import re
+from django.db import connections, router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .background import run_after_commit
+from .feed_common import encode_cursor
+from .models import Post, SearchDocument, UserProfile
+
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 50
+MAX_QUERY_TERMS = 8
+MIN_QUERY_LENGTH = 2
+SEARCH_CURSOR_TYPES = (float, int)  # (rank, document id)
+
+_TERM_RE = re.compile(r'\w+')
+
+# title weighs 10x body in bm25; ts_rank uses its default A (title) / B (body) weights
+_SQLITE_RANK = '-bm25(search_fts, 10.0, 1.0)'
+
+
+# ---- Writing ----
+
+def post_document(post):
+    """(title, body, pincode) indexed for a post"""
+    return '', post.description or '', post.pincode
+
+
+def user_document(user):
+    """(title, body, pincode) indexed for a user, or None if the user isn't searchable"""
+    if user.is_guest or not (user.name or user.bio):
+        return None
+    return user.name or '', user.bio or '', user.home_pincode or user.pincode
+
+
+def index_document(kind, object_id, title, body, pincode):
+    """Insert or replace the document for (kind, object_id)"""
+    connection = connections[router.db_for_write(SearchDocument)]
+    now = timezone.now()
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'INSERT INTO search_documents (kind, object_id, pincode, "updatedAt", document) '
+                "VALUES (%s, %s, %s, %s, setweight(to_tsvector('simple', %s), 'A') "
+                "|| setweight(to_tsvector('simple', %s), 'B')) "
+                'ON CONFLICT (kind, object_id) DO UPDATE SET pincode = EXCLUDED.pincode, '
+                '"updatedAt" = EXCLUDED."updatedAt", document = EXCLUDED.document',
+                [kind, str(object_id), pincode, now, title, body],
+            )
+        else:
+            cursor.execute(
+                'INSERT INTO search_documents (kind, object_id, pincode, "updatedAt") VALUES (%s, %s, %s, %s) '
+                'ON CONFLICT (kind, object_id) DO UPDATE SET pincode = excluded.pincode, '
+                '"updatedAt" = excluded."updatedAt" RETURNING id',
+                [kind, str(object_id), pincode, now],
+            )
+            document_id = cursor.fetchone()[0]
+            cursor.execute('DELETE FROM search_fts WHERE rowid = %s', [document_id])
+            cursor.execute('INSERT INTO search_fts (rowid, title, body) VALUES (%s, %s, %s)',
+                           [document_id, title, body])
+
+
+def remove_document(kind, object_id):
+    connection = connections[router.db_for_write(SearchDocument)]
+    documents = SearchDocument.objects.using(connection.alias).filter(kind=kind, object_id=str(object_id))
+    with transaction.atomic(using=connection.alias):
+        if connection.vendor != 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'DELETE FROM search_fts WHERE rowid IN '
+                    '(SELECT id FROM search_documents WHERE kind = %s AND object_id = %s)',
+                    [kind, str(object_id)],
+                )
+        documents.delete()
+
+
+def _index_post(post):
+    index_document('post', post.postId, *post_document(post))
+
+
+def _index_user(user):
+    document = user_document(user)
+    if document is None:
+        remove_document('user', user.userId)
+    else:
+        index_document('user', user.userId, *document)
+
+
+def reindex(kind, object_id):
+    """
+    Bring the document for (kind, object_id) in line with the row as it is
+    now, removing it if the row is gone. Reading the row here rather than
+    when it was written makes the result the same whatever order these run in.
+    """
+    if kind == 'post':
+        post = Post.objects.filter(postId=object_id).only('postId', 'description', 'pincode').first()
+        if post is None:
+            remove_document('post', object_id)
+        else:
+            _index_post(post)
+    else:
+        user = UserProfile.objects.filter(userId=object_id) \
+            .only('userId', 'name', 'bio', 'is_guest', 'home_pincode', 'pincode').first()
+        if user is None:
+            remove_document('user', object_id)
+        else:
+            _index_user(user)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def _post_changed(sender, instance, **kwargs):
+    run_after_commit(reindex, 'post', instance.postId)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def _user_changed(sender, instance, **kwargs):
+    run_after_commit(reindex, 'user', instance.userId)
+
+
+def rebuild_search_index(batch_size=1000):
+    """
+    Index every post and user, batch_size rows at a time.
+    Returns: {'posts': documents written, 'users': documents written}
+    """
+    counts = {'posts': 0, 'users': 0}
+    for post in Post.objects.order_by().only('postId', 'description', 'pincode').iterator(chunk_size=batch_size):
+        _index_post(post)
+        counts['posts'] += 1
+    users = UserProfile.objects.order_by().only('userId', 'name', 'bio', 'is_guest', 'home_pincode', 'pincode')
+    for user in users.iterator(chunk_size=batch_size):
+        _index_user(user)
+        counts['users'] += user_document(user) is not None
+    return counts
+
+
+# ---- Querying ----
+
+def query_terms(query):
+    """Lower-cased word terms of a user query, at most MAX_QUERY_TERMS"""
+    return [term.lower() for term in _TERM_RE.findall(query or '')][:MAX_QUERY_TERMS]
+
+
+def search(terms, kind=None, pincode=None, limit=SEARCH_PAGE_SIZE, after=None, excluded_authors=()):
+    """
+    Documents matching every term as a word prefix, best match first, leaving out hidden posts.
+    kind: 'post' or 'user' to search only one of them
+    after: (rank, document id) of the previous page's last hit
+    excluded_authors: userIds left out, along with their posts (the viewer's block set)
+    Returns: ([(kind, object_id, rank)], cursor for the next page or None)
+    """
+    if not terms:
+        return [], None
+    connection = connections[router.db_for_read(SearchDocument)]
+    filters, params = [], []
+    if connection.vendor == 'postgresql':
+        # Terms are \w+ words, so they can't carry tsquery operators
+        inner = (
+            # float8 so the rank round-trips exactly through the cursor
+            'SELECT d.id, d.kind, d.object_id, ts_rank(d.document, q)::float8 AS rank '
+            "FROM search_documents d, to_tsquery('simple', %s) q WHERE d.document @@ q"
+        )
+        params.append(' & '.join(f'{term}:*' for term in terms))
+    else:
+        inner = (
+            f'SELECT d.id, d.kind, d.object_id, {_SQLITE_RANK} AS rank '
+            'FROM search_fts JOIN search_documents d ON d.id = search_fts.rowid WHERE search_fts MATCH %s'
+        )
+        params.append(' AND '.join(f'"{term}"*' for term in terms))
+    if kind:
+        inner += ' AND d.kind = %s'
+        params.append(kind)
+    if pincode:
+        inner += ' AND d.pincode = %s'
+        params.append(pincode)
+    excluded = sorted(excluded_authors)
+    placeholders = ', '.join(['%s'] * len(excluded))
+    # A primary key lookup per candidate; CASE keeps user ids out of the integer cast
+    inner += (
+        ' AND NOT EXISTS (SELECT 1 FROM posts p WHERE p."postId" = '
+        "CASE WHEN d.kind = 'post' THEN CAST(d.object_id AS INTEGER) END AND (p.hidden"
+        + (f' OR p."userId" IN ({placeholders})' if excluded else '') + '))'
+    )
+    params.extend(excluded)
+    if excluded:
+        inner += f" AND (d.kind <> 'user' OR d.object_id NOT IN ({placeholders}))"
+        params.extend(excluded)
+    if after is not None:
+        filters.append('(hits.rank < %s OR (hits.rank = %s AND hits.id < %s))')
+        params.extend([after[0], after[0], after[1]])
+    sql = f'SELECT hits.id, hits.kind, hits.object_id, hits.rank FROM ({inner}) hits'
+    if filters:
+        sql += ' WHERE ' + ' AND '.join(filters)
+    sql += ' ORDER BY hits.rank DESC, hits.id DESC LIMIT %s'
+    params.append(limit + 1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1][3], page[-1][0]) if len(rows) > limit else None
+    return [(row_kind, object_id, rank) for _, row_kind, object_id, rank in page], next_cursor
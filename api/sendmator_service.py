@@ -5,6 +5,7 @@ Handles sending and verifying OTPs via Sendmator API
 import requests
 from django.conf import settings
 import os
+from .instrumentation import track_external
 
 
 class SendmatorService:
@@ -64,7 +65,8 @@ class SendmatorService:
             print(f"Sandbox: {sandbox_mode}")
             print(f"{'='*60}\n")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            with track_external('sendmator'):
+                response = requests.post(url, json=payload, headers=headers, timeout=10)
             print(f"DEBUG: Sendmator response status: {response.status_code}")
             
             if response.status_code == 200:
@@ -149,7 +151,8 @@ class SendmatorService:
             print(f"Sandbox: {sandbox_mode}")
             print(f"{'='*60}\n")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            with track_external('sendmator'):
+                response = requests.post(url, json=payload, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -213,7 +216,8 @@ class SendmatorService:
             print(f"OTP: {otp_code}")
             print(f"{'='*60}\n")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=10)
+            with track_external('sendmator'):
+                response = requests.post(url, json=payload, headers=headers, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,55 @@
+"""
+Streaming JSON array responses for large lists.
+
+The queryset is read with .iterator(chunk_size) and each row is serialized
+and encoded on its own, so worker memory stays flat however many rows there
+are. The body is byte-for-byte what the configured JSON renderer would
+produce for the same list. The queryset runs while the body is sent, after
+the view has returned; RequestMetricsMiddleware still counts those queries
+against the view's query_budget.
+"""
+from django.http import StreamingHttpResponse
+from .renderers import encode_json
+
+
+STREAM_CHUNK_SIZE = 2000
+
+# Rows encoded per yielded chunk; keeps write() calls reasonably sized
+_ROWS_PER_WRITE = 100
+
+
+def stream_json_list(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE, status=200):
+    """StreamingHttpResponse with queryset serialized as a JSON array"""
+    # Resolve the database now: the body is generated after the view (and its
+    # replica routing scope) has returned
+    queryset = queryset.using(queryset.db)
+    serializer = serializer_class(context=context or {})
+
+    def generate():
+        yield b'['
+        separator = b''
+        pending = []
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            pending.append(encode_json(serializer.to_representation(obj)))
+            if len(pending) >= _ROWS_PER_WRITE:
+                yield separator + b','.join(pending)
+                separator = b','
+                pending = []
+        if pending:
+            yield separator + b','.join(pending)
+        yield b']'
+
+    return StreamingHttpResponse(generate(), content_type='application/json', status=status)
+
+
+class StreamingListMixin:
+    """ViewSet mixin: stream list() responses unless a paginator is configured"""
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator is not None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return stream_json_list(
+            queryset, self.get_serializer_class(), self.get_serializer_context(), self.stream_chunk_size
+        )
@@ -0,0 +1,338 @@
+"""
+Deterministic synthetic data for benchmarks and profiling (see the
+seed_synthetic and bench_endpoints commands).
+
+Popularity is Zipfian: a few pincodes hold most users and posts, and a few
+users/posts attract most follows and likes. Each entity type draws from its
+own RNG seeded from `seed`, so the same seed and volumes always produce the
+same rows. Rows are written with bulk_create in large batches or, on
+PostgreSQL with use_copy=True, streamed with COPY FROM STDIN. Only compact
+arrays of ids are kept in memory, so millions of rows are fine.
+
+Synthetic users have ids `syn_00000000...` and emails `userN@synthetic.local`,
+and all share SYNTHETIC_PASSWORD. Each pincode gets a centroid within
+SYNTHETIC_AREA_DEGREES of SYNTHETIC_CENTER; users live, and mostly post,
+within about a kilometre of theirs. Rows are bulk written, so geo_cell and
+the post coordinate columns are filled in here rather than by save().
+"""
+import csv
+import io
+import itertools
+import json
+import random
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from .geo_grid import discovery_cell
+from .models import UserProfile, Post, PostLike, PostComment, Follower, Chat, Message
+
+
+SYNTHETIC_PASSWORD = 'synthetic-password'
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_ZIPF_EXPONENT = 1.1
+
+POST_TYPE_MIX = ['post', 'post', 'post', 'question', 'alert', 'recommendation']
+
+# Pincode centroids spread over roughly 55 x 55 km around Bengaluru
+SYNTHETIC_CENTER = (12.97, 77.59)
+SYNTHETIC_AREA_DEGREES = 0.25
+# Standard deviation of a user's or post's offset from its pincode centroid (about 1 km)
+LOCATION_JITTER_DEGREES = 0.01
+
+
+def synthetic_user_id(index):
+    return f'syn_{index:08d}'
+
+
+def synthetic_pincodes(count):
+    """count distinct 6-digit pincodes"""
+    return [str(560001 + i) for i in range(count)]
+
+
+def synthetic_centroids(count, rng):
+    """(latitude, longitude) of each of count pincodes"""
+    lat, lon = SYNTHETIC_CENTER
+    return [
+        (lat + rng.uniform(-SYNTHETIC_AREA_DEGREES, SYNTHETIC_AREA_DEGREES),
+         lon + rng.uniform(-SYNTHETIC_AREA_DEGREES, SYNTHETIC_AREA_DEGREES))
+        for _ in range(count)
+    ]
+
+
+def _near(point, rng):
+    lat, lon = point
+    return (round(lat + rng.gauss(0, LOCATION_JITTER_DEGREES), 6),
+            round(lon + rng.gauss(0, LOCATION_JITTER_DEGREES), 6))
+
+
+class ZipfSampler:
+    """Draws ranks 0..n-1 with P(rank k) proportional to 1 / (k + 1) ** exponent"""
+
+    def __init__(self, n, exponent, rng):
+        self._ranks = range(n)
+        # array('d') keeps this at 8 bytes per rank for millions of ranks
+        self._cum_weights = array('d', itertools.accumulate(1 / (k + 1) ** exponent for k in range(n)))
+        self._rng = rng
+
+    def sample(self):
+        return self._rng.choices(self._ranks, cum_weights=self._cum_weights)[0]
+
+
+class SyntheticDataset:
+    """What seed_synthetic_data inserted"""
+
+    def __init__(self, pincodes, user_pincodes, chat_ids, counts):
+        self.pincodes = pincodes
+        self._user_pincodes = user_pincodes  # pincode index per user index
+        self.chat_ids = chat_ids
+        self.counts = counts
+
+    def users(self, limit=None):
+        """[(userId, home_pincode)] for the first `limit` users"""
+        count = len(self._user_pincodes) if limit is None else min(limit, len(self._user_pincodes))
+        return [(synthetic_user_id(i), self.pincodes[self._user_pincodes[i]]) for i in range(count)]
+
+
+@contextmanager
+def _explicit_timestamps(*fields):
+    """Let generated values through for auto_now_add fields while seeding"""
+    previous = [field.auto_now_add for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in zip(fields, previous):
+            field.auto_now_add = value
+
+
+class _Writer:
+    """Writes row dicts (keyed by column attname) in batches"""
+
+    def __init__(self, batch_size, use_copy, progress=None):
+        self.batch_size = batch_size
+        self.use_copy = use_copy
+        self.progress = progress
+
+    def write(self, model, rows, pks=None):
+        """
+        Insert rows; appends new primary keys to the `pks` array if given.
+        Returns: number of rows written
+        """
+        started = time.perf_counter()
+        last_pk = None
+        if pks is not None and self.use_copy:
+            last_pk = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+        total = 0
+        for batch in self._batches(rows):
+            if self.use_copy:
+                self._copy(model, batch)
+            else:
+                objs = model.objects.bulk_create([model(**row) for row in batch])
+                if pks is not None:
+                    pks.extend(obj.pk for obj in objs)
+            total += len(batch)
+
+        if last_pk is not None:
+            # COPY doesn't return keys; read back what was just appended
+            pks.extend(model.objects.filter(pk__gt=last_pk).order_by('pk')
+                       .values_list('pk', flat=True).iterator(chunk_size=self.batch_size))
+        if self.progress:
+            self.progress(model, total, time.perf_counter() - started)
+        return total
+
+    def _batches(self, rows):
+        iterator = iter(rows)
+        while True:
+            batch = list(itertools.islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _copy(self, model, batch):
+        columns = list(batch[0])
+        fields = [model._meta.get_field(column) for column in columns]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow([self._copy_value(row[column]) for column in columns])
+        buffer.seek(0)
+        quote = connection.ops.quote_name
+        sql = (
+            f'COPY {quote(model._meta.db_table)} ({", ".join(quote(field.column) for field in fields)}) '
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+
+    @staticmethod
+    def _copy_value(value):
+        if value is None:
+            return '\\N'
+        if isinstance(value, (list, dict)):
+            return json.dumps(value)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value
+
+
+def seed_synthetic_data(users=1000, posts=10000, followers=5000, likes=20000, comments=5000,
+                        chats=100, messages=5000, pincodes=20, days=90, seed=42,
+                        zipf_exponent=DEFAULT_ZIPF_EXPONENT, batch_size=DEFAULT_BATCH_SIZE,
+                        use_copy=False, progress=None):
+    """
+    Insert a synthetic dataset. followers/likes are approximate totals (each
+    user draws its own count; duplicates within a user are dropped).
+    progress(model, rows, seconds) is called after each table.
+    Returns: SyntheticDataset
+    """
+    if use_copy and connection.vendor != 'postgresql':
+        raise ValueError('COPY is only available on PostgreSQL')
+
+    def rng_for(name):
+        return random.Random(f'{seed}:{name}')
+
+    writer = _Writer(batch_size, use_copy, progress)
+    pins = synthetic_pincodes(pincodes)
+    centroids = synthetic_centroids(pincodes, rng_for('pincodes'))
+    now = timezone.now()
+    span_seconds = days * 86400
+    counts = {}
+
+    # Users: home pincodes are Zipf-distributed across the pincode list
+    rng = rng_for('users')
+    pin_sampler = ZipfSampler(pincodes, zipf_exponent, rng)
+    user_pincodes = array('I', (pin_sampler.sample() for _ in range(users)))
+    # One hash for everyone: hashing each row would dominate seeding time
+    password = make_password(SYNTHETIC_PASSWORD)
+    # Separate RNGs for locations, so the rows drawn from the others don't change
+    location_rng = rng_for('user_locations')
+    home_lats, home_lons = array('d'), array('d')
+    for i in range(users):
+        lat, lon = _near(centroids[user_pincodes[i]], location_rng)
+        home_lats.append(lat)
+        home_lons.append(lon)
+
+    def user_rows():
+        for i in range(users):
+            lat, lon = home_lats[i], home_lons[i]
+            yield {
+                'userId': synthetic_user_id(i), 'name': f'User {i}', 'email': f'user{i}@synthetic.local',
+                'password': password, 'home_pincode': pins[user_pincodes[i]], 'pincode': pins[user_pincodes[i]],
+                'home_latitude': lat, 'home_longitude': lon, 'latitude': lat, 'longitude': lon,
+                'geo_cell': discovery_cell(lat, lon, lat, lon, False),
+                'interests': [], 'activePincodes': [], 'additional_pincodes': [],
+                'followers': [], 'following': [], 'is_guest': False, 'updatedAt': now,
+            }
+    counts['users'] = writer.write(UserProfile, user_rows())
+
+    def timestamp_at(position, total, rng):
+        # Spread over the last `days`, increasing with position, plus jitter
+        offset = span_seconds * (1 - (position + rng.random()) / max(total, 1))
+        return now - timedelta(seconds=offset)
+
+    def random_timestamp(rng):
+        return now - timedelta(seconds=rng.random() * span_seconds)
+
+    # Posts: popular authors post more; mostly in the author's home pincode
+    rng = rng_for('posts')
+    author_sampler = ZipfSampler(users, zipf_exponent, rng)
+    post_pin_sampler = ZipfSampler(pincodes, zipf_exponent, rng)
+    location_rng = rng_for('post_locations')
+
+    def post_rows():
+        for i in range(posts):
+            author = author_sampler.sample()
+            pin_index = user_pincodes[author] if rng.random() < 0.9 else post_pin_sampler.sample()
+            home = (home_lats[author], home_lons[author])
+            lat, lon = _near(home if pin_index == user_pincodes[author] else centroids[pin_index], location_rng)
+            yield {
+                'userId': synthetic_user_id(author), 'pincode': pins[pin_index], 'mediaType': 'text',
+                'post_type': rng.choice(POST_TYPE_MIX), 'description': f'Synthetic post {i}',
+                'location': {'latitude': lat, 'longitude': lon}, 'latitude': lat, 'longitude': lon,
+                'timestamp': timestamp_at(i, posts, rng),
+            }
+    post_ids = array('q')
+    with _explicit_timestamps(Post._meta.get_field('timestamp')):
+        counts['posts'] = writer.write(Post, post_rows(), pks=post_ids)
+
+    def per_user_edges(name, total, target_count):
+        """(user index, set of target ranks) per user, Zipf over targets"""
+        rng = rng_for(name)
+        if not target_count or not total:
+            return
+        sampler = ZipfSampler(target_count, zipf_exponent, rng)
+        mean = total / users
+        for user_index in range(users):
+            k = min(int(rng.expovariate(1 / mean)), target_count)
+            yield user_index, {sampler.sample() for _ in range(k)}, rng
+
+    def follower_rows():
+        for user_index, targets, rng in per_user_edges('followers', followers, users):
+            for target in sorted(targets - {user_index}):
+                yield {
+                    'followerId': synthetic_user_id(user_index), 'followingId': synthetic_user_id(target),
+                    'createdAt': random_timestamp(rng),
+                }
+
+    def like_rows():
+        for user_index, targets, rng in per_user_edges('likes', likes, len(post_ids)):
+            for target in sorted(targets):
+                yield {
+                    'postId': post_ids[target], 'userId': synthetic_user_id(user_index),
+                    'createdAt': random_timestamp(rng),
+                }
+
+    with _explicit_timestamps(Follower._meta.get_field('createdAt'), PostLike._meta.get_field('createdAt')):
+        counts['followers'] = writer.write(Follower, follower_rows())
+        counts['likes'] = writer.write(PostLike, like_rows())
+
+    rng = rng_for('comments')
+    commented_post = ZipfSampler(len(post_ids), zipf_exponent, rng) if post_ids else None
+
+    def comment_rows():
+        for i in range(comments if post_ids else 0):
+            target = commented_post.sample()
+            yield {
+                'postId': post_ids[target], 'userId': synthetic_user_id(rng.randrange(users)),
+                'content': f'Synthetic comment {i}', 'parentCommentId': None,
+                'createdAt': random_timestamp(rng),
+            }
+    with _explicit_timestamps(PostComment._meta.get_field('createdAt')):
+        counts['comments'] = writer.write(PostComment, comment_rows())
+
+    # Chats between a random user and a (Zipf-)popular one
+    rng = rng_for('chats')
+    chat_partner = ZipfSampler(users, zipf_exponent, rng)
+    chat_members = []
+
+    def chat_rows():
+        for _ in range(chats):
+            members = sorted({rng.randrange(users), chat_partner.sample()})
+            chat_members.append(members)
+            yield {
+                'users': [synthetic_user_id(m) for m in members],
+                'lastMessage': None, 'lastMessageTime': None,
+            }
+    chat_ids = array('q')
+    counts['chats'] = writer.write(Chat, chat_rows(), pks=chat_ids)
+
+    rng = rng_for('messages')
+
+    def message_rows():
+        for i in range(messages if chat_ids else 0):
+            chat_index = rng.randrange(len(chat_ids))
+            yield {
+                'chatId': chat_ids[chat_index],
+                'senderId': synthetic_user_id(rng.choice(chat_members[chat_index])),
+                'content': f'Synthetic message {i}', 'timestamp': timestamp_at(i, messages, rng),
+            }
+    with _explicit_timestamps(Message._meta.get_field('timestamp')):
+        counts['messages'] = writer.write(Message, message_rows())
+
+    return SyntheticDataset(pins, user_pincodes, list(chat_ids), counts)
@@ -0,0 +1,92 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from unittest.mock import patch
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.interest_catalog import get_catalog
+from api.interest_ranking import get_area_index
+from api.models import Interest, UserProfile
+
+
+class LazyJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = UserProfile.objects.create(userId='auth_user', name='Auth User', pincode='560001')
+        Interest.objects.create(interest_id='music', name='Music')
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_id_only_view_skips_profile_query(self):
+        # Catalog and area index are in memory once warm, checked by version; the token user is never loaded
+        get_catalog()
+        get_area_index()
+        with self.assertNumQueries(2):
+            resp = self.client.post(reverse('get-interests'), {'lat': '12.9', 'long': '77.6'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_profile_is_loaded_once_per_request(self):
+        with self.assertNumQueries(1):
+            resp = self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['user']['name'], 'Auth User')
+
+    def test_missing_credentials_keep_view_error_body(self):
+        self.client.credentials()
+        resp = self.client.post(reverse('get-interests'), {'lat': '12.9', 'long': '77.6'}, format='json')
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.data['error'], 'No authentication token provided')
+
+    def test_deleted_user_is_rejected(self):
+        self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')  # warm the cache
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+        resp = self.client.post(reverse('get-feed'), {'lat': '12.9', 'long': '77.6'}, format='json')
+        self.assertEqual(resp.status_code, 401)
+
+    def test_save_interests_updates_without_reading_profile(self):
+        with self.assertNumQueries(3):  # catalog version and load, single UPDATE
+            resp = self.client.post(reverse('save-interests'), {'interests': ['music']}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.interests, ['music'])
+
+    @override_settings(SHARED_CACHE=True)
+    def test_cached_profile_authenticates_without_queries(self):
+        self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        with self.assertNumQueries(0):
+            resp = self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        self.assertEqual(resp.data['user']['name'], 'Auth User')
+
+    def test_profile_is_not_cached_per_process(self):
+        self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        # Another worker's write, whose invalidation would never reach this process's cache
+        UserProfile.objects.filter(userId='auth_user').update(name='Renamed')
+        resp = self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        self.assertEqual(resp.data['user']['name'], 'Renamed')
+
+    @override_settings(SHARED_CACHE=True)
+    def test_profile_save_invalidates_cache(self):
+        self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = 'Renamed'
+            self.user.save()
+        resp = self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')
+        self.assertEqual(resp.data['user']['name'], 'Renamed')
+
+    @override_settings(SHARED_CACHE=True)
+    def test_saving_the_principal_writes_only_changed_columns(self):
+        self.client.post(reverse('app-init'), format='json', HTTP_X_DEVICE_ID='device-auth')  # cache the profile
+        # Changed elsewhere after the projection was cached; .update() skips invalidation
+        UserProfile.objects.filter(userId='auth_user').update(followers=['fan'], interests=['music'])
+        location = {'pincode': '560002', 'city': 'Bengaluru', 'state': 'Karnataka', 'country': 'India'}
+        with patch('api.views.get_location_details', return_value=location), self.assertNumQueries(1):
+            resp = self.client.post(reverse('save-pincode'), {
+                'home-address': {'lat': 12.9, 'long': 77.6, 'address': '1 MG Road'}
+            }, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.home_pincode, self.user.personal_address), ('560002', '1 MG Road'))
+        self.assertEqual((self.user.followers, self.user.interests), (['fan'], ['music']))
@@ -0,0 +1,89 @@
+import json
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.blocks import block_set, block_user, unblock_user
+from api.interest_feed import build_interest_feed, tag_post
+from api.models import BlockedUser, Interest, Post, UserProfile
+
+
+def _authors(resp):
+    return [result['post_card_snippet_type_1']['top_container']['left']['title']['text']
+            for result in resp.data['results']]
+
+
+class BlockSetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.me = UserProfile.objects.create(userId='me', name='Me', home_pincode='560001')
+        for user_id in ('friend', 'troll', 'stalker'):
+            UserProfile.objects.create(userId=user_id, name=user_id.title(), home_pincode='560001')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.me).access_token}')
+
+    def test_set_is_read_from_the_db_without_a_shared_cache(self):
+        block_set('me')
+        # A block made through another worker, whose on-commit invalidation never reaches this one
+        BlockedUser.objects.create(blockerUserId='troll', blockedUserId='me')
+        with self.assertNumQueries(1):
+            self.assertEqual(block_set('me'), frozenset({'troll'}))
+
+    @override_settings(SHARED_CACHE=True)
+    def test_set_is_bidirectional_cached_and_invalidated_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            block_user('me', 'troll')
+            block_user('stalker', 'me')
+        self.assertEqual(block_set('me'), frozenset({'troll', 'stalker'}))
+        self.assertEqual(block_set('troll'), frozenset({'me'}))
+        with self.assertNumQueries(0):
+            self.assertEqual(block_set('me'), frozenset({'troll', 'stalker'}))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(unblock_user('me', 'troll'))
+            self.assertFalse(unblock_user('me', 'troll'))
+        self.assertEqual(block_set('me'), frozenset({'stalker'}))
+        self.assertEqual(block_set('troll'), frozenset())
+
+    def test_feeds_exclude_blocked_authors_and_pages_stay_full(self):
+        for i in range(6):
+            Post.objects.create(userId='troll', mediaType='text', description=f'troll {i}', pincode='560001')
+        for i in range(3):
+            Post.objects.create(userId='friend', mediaType='text', description=f'friend {i}', pincode='560001')
+        with self.captureOnCommitCallbacks(execute=True):
+            BlockedUser.objects.create(blockerUserId='troll', blockedUserId='me')
+
+        resp = self.client.post(reverse('home-feed'), {'limit': 3}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(_authors(resp), ['Friend'] * 3)
+
+        Interest.objects.create(interest_id='music', name='Music')
+        for post in Post.objects.all():
+            tag_post(post, ['music'])
+        items = build_interest_feed(['music'], 12.97, 77.59, excluded_authors=block_set('me'))
+        self.assertEqual({item['author']['name'] for item in items}, {'Friend'})
+
+        resp = self.client.get(reverse('user-posts', args=['troll']))
+        self.assertEqual(json.loads(b''.join(resp.streaming_content)), [])
+        resp = self.client.get(reverse('user-posts', args=['friend']))
+        self.assertEqual(len(json.loads(b''.join(resp.streaming_content))), 3)
+
+    def test_block_endpoints(self):
+        resp = self.client.post(reverse('block-user'), {'user_id': 'troll'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['message'], 'User blocked')
+        resp = self.client.post(reverse('block-user'), {'user_id': 'troll'}, format='json')
+        self.assertEqual(resp.data['message'], 'User already blocked')
+        self.assertEqual([row['user_id'] for row in self.client.get(reverse('blocked-users')).data['results']],
+                         ['troll'])
+
+        self.assertEqual(self.client.post(reverse('block-user'), {'user_id': 'me'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(reverse('block-user'), {}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(reverse('block-user'), {'user_id': 'ghost'}, format='json').status_code, 404)
+        self.assertEqual(APIClient().post(reverse('block-user'), {'user_id': 'troll'}, format='json').status_code, 401)
+
+        resp = self.client.post(reverse('unblock-user'), {'user_id': 'troll'}, format='json')
+        self.assertEqual(resp.data['message'], 'User unblocked')
+        self.assertFalse(BlockedUser.objects.exists())
@@ -0,0 +1,65 @@
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Interest, Post, UserProfile
+
+
+class ConditionalRequestTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserProfile.objects.create(userId='etag_user', email='etag@example.com', home_pincode='560001')
+        Post.objects.create(userId='etag_user', mediaType='text', description='first', pincode='560001')
+        Interest.objects.create(interest_id='tech', name='Tech')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _feed(self, **headers):
+        return self.client.post(reverse('home-feed'), {'limit': 10}, format='json', **headers)
+
+    def test_feed_304_skips_post_queries_until_a_post_is_added(self):
+        etag = self._feed()['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self._feed(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+        self.assertFalse([q for q in queries.captured_queries if 'posts' in q['sql']])
+
+        # No cache write or on-commit hook involved, so the new version reaches every worker
+        Post.objects.create(userId='etag_user', mediaType='text', description='second', pincode='560001')
+        cache.clear()
+        resp = self._feed(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp['ETag'], etag)
+        self.assertEqual(len(resp.data['results']), 2)
+
+    def test_interests_304_until_catalog_changes(self):
+        body = {'lat': '12.97', 'long': '77.59'}
+        etag = self.client.post(reverse('get-interests'), body, format='json')['ETag']
+        resp = self.client.post(reverse('get-interests'), body, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Interest.objects.create(interest_id='music', name='Music')
+        resp = self.client.post(reverse('get-interests'), body, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(json.loads(resp.content)['interests']), 2)
+
+    def test_profile_last_modified(self):
+        url = reverse('user-detail', args=['etag_user'])
+        resp = self.client.get(url)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('no-cache', resp['Cache-Control'])
+
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=resp['Last-Modified']).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{resp["ETag"]}').status_code, 304)
+
+        self.user.name = 'Renamed'
+        self.user.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=resp['ETag']).status_code, 200)
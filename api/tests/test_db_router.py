@@ -0,0 +1,65 @@
+import json
+from django.test import SimpleTestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest.mock import patch
+
+from api.db_router import PrimaryReplicaRouter, request_routing, tolerates_replica_lag
+from api.middleware import ReplicaStickinessMiddleware
+from api.models import Post, UserProfile
+
+
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+
+    def test_reads_outside_a_request_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_request_reads_use_replica_until_the_request_writes(self):
+        with request_routing():
+            self.assertEqual(self.router.db_for_read(Post), 'replica')
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_pinned_client_reads_primary_unless_view_tolerates_lag(self):
+        @tolerates_replica_lag
+        def read():
+            return self.router.db_for_read(Post)
+
+        with request_routing(pinned_to_primary=True):
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+            self.assertEqual(read(), 'replica')
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+
+
+class ReplicaStickinessTest(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def test_write_pins_following_reads_to_primary(self):
+        user = UserProfile.objects.create(userId='router_user', email='router@example.com', home_pincode='560001')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+
+        resp = client.get(reverse('user-posts', args=['router_user']))
+        self.assertNotIn(ReplicaStickinessMiddleware.COOKIE_NAME, resp.cookies)
+
+        resp = client.post(reverse('create-post'), {
+            'post_type': 'post', 'content': 'hello', 'pincode_id': 'pincode_home_560001'
+        }, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertIn(ReplicaStickinessMiddleware.COOKIE_NAME, resp.cookies)
+
+        seen = []
+        original = PrimaryReplicaRouter.db_for_read
+
+        def spy(router, model, **hints):
+            alias = original(router, model, **hints)
+            seen.append(alias)
+            return alias
+
+        with patch.object(PrimaryReplicaRouter, 'db_for_read', spy):
+            resp = client.get(reverse('user-posts', args=['router_user']))
+        self.assertEqual(len(json.loads(b''.join(resp.streaming_content))), 1)
+        self.assertEqual(set(seen), {'default'})
@@ -0,0 +1,57 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+
+from api.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from api.health import reset_readiness_cache
+
+
+class ReadinessTest(TestCase):
+    def setUp(self):
+        reset_readiness_cache()
+        self.client = APIClient()
+
+    def tearDown(self):
+        reset_readiness_cache()
+
+    def test_ready_and_cached_between_probes(self):
+        resp = self.client.get(reverse('health-ready'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data['status'], 'ready')
+        self.assertTrue(resp.data['checks']['database']['ok'])
+        self.assertIn('rtt_ms', resp.data['checks']['database'])
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('health-ready'))
+
+    @patch('api.health.check_database', return_value={'ok': False, 'error': 'OperationalError: gone'})
+    def test_dead_database_fails_readiness(self, _):
+        resp = self.client.get(reverse('health-ready'))
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.data['status'], 'not_ready')
+
+    def test_liveness_touches_nothing(self):
+        with self.assertNumQueries(0):
+            resp = self.client.get(reverse('health-live'))
+        self.assertEqual(resp.status_code, 200)
+
+
+@override_settings(CIRCUIT_BREAKER_FAILURE_THRESHOLD=2, CIRCUIT_BREAKER_RESET_SECONDS=30)
+class CircuitBreakerTest(SimpleTestCase):
+    def test_opens_after_consecutive_failures_and_recovers(self):
+        breaker = CircuitBreaker('sendmator')
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        with patch('api.circuit_breaker.time.monotonic', return_value=breaker._opened_at + 31):
+            self.assertEqual(breaker.state, HALF_OPEN)
+            breaker.before_call()  # the single trial call
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_call()
+            breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
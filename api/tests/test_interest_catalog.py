@@ -0,0 +1,46 @@
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.interest_catalog import get_catalog
+from api.interest_ranking import get_area_index
+from api.models import Interest, UserProfile
+from api.serializers import InterestSerializer
+
+
+class InterestCatalogTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Interest.objects.create(interest_id='music', name='Music', image='https://example.com/music.png')
+        Interest.objects.create(interest_id='tech', name='Tech')
+        self.user = UserProfile.objects.create(userId='catalog_user', pincode='560001')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_warm_catalog_serves_interests_and_validates_with_version_reads(self):
+        get_catalog()
+        get_area_index()
+        with self.assertNumQueries(2):  # catalog and area grid versions
+            resp = self.client.post(reverse('get-interests'), {'lat': '12.9', 'long': '77.6'}, format='json')
+        self.assertEqual(resp['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(resp.content), {'interests': InterestSerializer(Interest.objects.all(), many=True).data})
+
+        with self.assertNumQueries(2):  # catalog version, the UPDATE
+            resp = self.client.post(reverse('save-interests'), {'interests': ['tech', 'music']}, format='json')
+        self.assertEqual(resp.data['interests'], [{'id': 'tech', 'name': 'Tech'}, {'id': 'music', 'name': 'Music'}])
+
+        resp = self.client.post(reverse('save-interests'), {'interests': ['tech', 'cooking']}, format='json')
+        self.assertEqual(resp.status_code, 404)
+
+    def test_interest_change_reloads_catalog(self):
+        first = get_catalog()
+        self.assertIs(get_catalog(), first)
+
+        Interest.objects.create(interest_id='cooking', name='Cooking')
+        catalog = get_catalog()
+        self.assertNotEqual(catalog.version, first.version)
+        self.assertEqual(catalog.get('cooking')['name'], 'Cooking')
+        self.assertIsNone(catalog.get(['unhashable']))
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.interest_feed import build_interest_feed
+from api.interest_ranking import refresh_interest_popularity
+from api.models import Interest, Post, PostInterest, PostLike, UserProfile
+
+
+class InterestFeedTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for interest_id in ('music', 'tech', 'food'):
+            Interest.objects.create(interest_id=interest_id, name=interest_id.title())
+        self.author = UserProfile.objects.create(userId='author', name='Author', home_pincode='560001',
+                                                 home_latitude=12.97, home_longitude=77.59, interests=['music'])
+        UserProfile.objects.create(userId='far_author', home_pincode='110001', home_latitude=28.63, home_longitude=77.21)
+        self.reader = UserProfile.objects.create(userId='reader', home_pincode='560001', interests=['music', 'tech'])
+        self.client = APIClient()
+
+    def _post(self, user, content, interests=None):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        body = {'post_type': 'post', 'content': content, 'pincode_id': f'pincode_home_{user.home_pincode}'}
+        if interests is not None:
+            body['interests'] = interests
+        # Interest tags are written after commit
+        with self.captureOnCommitCallbacks(execute=True):
+            return client.post(reverse('create-post'), body, format='json')
+
+    def test_posts_are_tagged_at_creation(self):
+        resp = self._post(self.author, 'tagged explicitly', ['tech', 'food'])
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data['data']['interests'], ['tech', 'food'])
+
+        resp = self._post(self.author, 'tagged from profile')
+        post_id = resp.data['data']['post_id']
+        self.assertEqual(list(PostInterest.objects.filter(postId=post_id).values_list('interest_id', flat=True)), ['music'])
+
+        self.assertEqual(self._post(self.author, 'bad', ['knitting']).status_code, 400)
+
+    def test_feed_merges_interests_and_ranks_nearby_posts_first(self):
+        now = timezone.now()
+
+        def make(user_id, pincode, interest_id, hours_ago):
+            post = Post.objects.create(userId=user_id, mediaType='text', description=f'{interest_id} {pincode}', pincode=pincode)
+            Post.objects.filter(postId=post.postId).update(timestamp=now - timedelta(hours=hours_ago))
+            PostInterest.objects.create(interest_id=interest_id, postId=post.postId, pincode=pincode,
+                                        timestamp=now - timedelta(hours=hours_ago))
+            return post
+
+        near_old = make('author', '560001', 'music', 6)
+        far_new = make('far_author', '110001', 'tech', 1)
+        make('author', '560001', 'food', 0)  # not one of the reader's interests
+        PostLike.objects.create(postId=near_old.postId, userId='reader')
+        PostInterest.objects.create(interest_id='tech', postId=near_old.postId, pincode='560001', timestamp=now - timedelta(hours=6))
+        refresh_interest_popularity(full=True)
+
+        with self.assertNumQueries(10):  # catalog and area index versions and loads, 2 interest scans, posts, authors, likes, comments
+            items = build_interest_feed(['music', 'tech'], 12.97, 77.59)
+        self.assertEqual([item['id'] for item in items], [str(near_old.postId), str(far_new.postId)])
+        self.assertEqual(items[0]['engagement']['likes'], 1)
+        self.assertEqual(items[0]['location']['distance'], '0.0 km away')
+        self.assertEqual(items[0]['author']['name'], 'Author')
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.reader).access_token}')
+        resp = self.client.post(reverse('get-feed'), {'lat': '12.97', 'long': '77.59'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data['feed']), 2)
+
+    def test_backfill_tags_untagged_posts(self):
+        post = Post.objects.create(userId='author', mediaType='text', description='old', pincode='560001')
+        call_command('backfill_post_interests', stdout=StringIO())
+        self.assertEqual(list(PostInterest.objects.filter(postId=post.postId).values_list('interest_id', flat=True)), ['music'])
+
+        post.delete()
+        self.assertFalse(PostInterest.objects.filter(postId=post.postId).exists())
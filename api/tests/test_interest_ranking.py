@@ -0,0 +1,60 @@
+import json
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.interest_ranking import AreaIndex, refresh_interest_popularity
+from api.models import Interest, PincodeArea, PincodeInterest, UserProfile
+
+
+class InterestRankingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        for interest_id in ('art', 'music', 'tech'):
+            Interest.objects.create(interest_id=interest_id, name=interest_id.title())
+        # Bengaluru area likes tech, Delhi area likes music
+        for i in range(3):
+            UserProfile.objects.create(userId=f'blr_{i}', home_pincode='560001', home_latitude=12.97 + i / 1000,
+                                       home_longitude=77.59, interests=['tech', 'music'] if i else ['tech'])
+        UserProfile.objects.create(userId='del_0', pincode='110001', latitude=28.63, longitude=77.21, interests=['music'])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(UserProfile.objects.get(userId="del_0")).access_token}')
+
+    def _ranked_ids(self, lat, long):
+        resp = self.client.post(reverse('get-interests'), {'lat': lat, 'long': long}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        return [interest['id'] for interest in json.loads(resp.content)['interests']]
+
+    def test_interests_are_ranked_for_the_nearest_area(self):
+        call_command('refresh_interest_popularity', stdout=StringIO())
+        self.assertEqual(PincodeInterest.objects.get(pincode='560001', interest_id='tech').users, 3)
+        self.assertAlmostEqual(PincodeArea.objects.get(pincode='560001').latitude, 12.971)
+
+        self.assertEqual(self._ranked_ids('12.98', '77.60'), ['tech', 'music', 'art'])
+        with self.assertNumQueries(3):  # catalog and area grid versions, the area's counts
+            self.assertEqual(self._ranked_ids('28.62', '77.20'), ['music', 'art', 'tech'])
+        # Nothing within range: catalog order
+        self.assertEqual(self._ranked_ids('19.07', '72.87'), ['art', 'music', 'tech'])
+
+    def test_incremental_refresh_recounts_only_changed_areas(self):
+        refresh_interest_popularity()
+        self.assertEqual(refresh_interest_popularity(), {'pincodes': 0, 'rows': 0})
+
+        UserProfile.objects.filter(userId='del_0').update(interests=['art'], updatedAt=PincodeArea.objects.get(pincode='110001').refreshedAt)
+        result = refresh_interest_popularity()
+        self.assertEqual(result['pincodes'], 1)
+        self.assertEqual(list(PincodeInterest.objects.filter(pincode='110001').values_list('interest_id', flat=True)), ['art'])
+
+        UserProfile.objects.filter(userId='del_0').delete()
+        refresh_interest_popularity(full=True)
+        self.assertFalse(PincodeArea.objects.filter(pincode='110001').exists())
+        self.assertFalse(PincodeInterest.objects.filter(pincode='110001').exists())
+
+    def test_area_index_respects_max_distance(self):
+        index = AreaIndex('v1', [('560001', 12.97, 77.59), ('560002', 12.99, 77.61)])
+        self.assertEqual(index.nearest(12.985, 77.605, 15), '560002')
+        self.assertIsNone(index.nearest(13.5, 77.59, 15))
@@ -0,0 +1,46 @@
+from django.contrib.auth.hashers import get_hasher, identify_hasher, make_password
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+
+from api.models import UserProfile
+from api.passwords import PasswordHashBusy
+
+
+class LoginPasswordHashingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = UserProfile.objects.create(
+            userId='login_user',
+            email='login@example.com',
+            password=make_password('secret-pass', hasher='pbkdf2_sha1')
+        )
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        resp = self.client.post(reverse('auth-login'), {'email_id': 'login@example.com', 'password': 'secret-pass'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, get_hasher().algorithm)
+
+    def test_wrong_password_is_rejected(self):
+        resp = self.client.post(reverse('auth-login'), {'email_id': 'login@example.com', 'password': 'nope'}, format='json')
+        self.assertEqual(resp.status_code, 401)
+
+    @patch('api.auth_views.check_password_bounded', side_effect=PasswordHashBusy)
+    def test_saturated_hash_pool_returns_503(self, _):
+        resp = self.client.post(reverse('auth-login'), {'email_id': 'login@example.com', 'password': 'secret-pass'}, format='json')
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp['Retry-After'], '1')
+
+    def test_non_string_identifiers_are_rejected(self):
+        for body in ({'email_id': 123, 'password': 'x'}, {'email_id': ['a@example.com'], 'password': 'x'},
+                     {'number': 9876543210, 'password': 'x'}):
+            resp = self.client.post(reverse('auth-login'), body, format='json')
+            self.assertEqual(resp.status_code, 400)
+            self.assertEqual(resp.data['error'], 'email_id and number must be strings')
+            resp = self.client.post(reverse('auth-signup'), {**body, 'lat': '12.9', 'long': '77.6'}, format='json',
+                                    HTTP_X_DEVICE_ID='device-login')
+            self.assertEqual(resp.data, {'error': 'email_id and number must be strings'})
@@ -0,0 +1,40 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import OTPVerification
+
+
+class MetricsEndpointTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    @override_settings(DEBUG=True)
+    def test_exposes_request_db_and_otp_metrics(self):
+        now = timezone.now()
+        OTPVerification.objects.create(identifier='a@example.com', otp_code='111111', expires_at=now + timedelta(minutes=5))
+        OTPVerification.objects.create(identifier='b@example.com', otp_code='222222', expires_at=now - timedelta(minutes=1))
+        # Streamed, so the request is recorded once its body has been read
+        b''.join(self.client.get(reverse('user-posts', args=['nobody'])).streaming_content)
+
+        resp = self.client.get(reverse('metrics'))
+        self.assertEqual(resp.status_code, 200)
+        body = resp.content.decode()
+        self.assertIn('http_request_duration_seconds_bucket{', body)
+        self.assertIn('route="user-posts"', body)
+        self.assertIn('db_query_duration_seconds_count', body)
+        self.assertIn('otp_pending_verifications 1.0', body)
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape-secret')
+    def test_token_is_required_when_configured(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secreT').status_code, 403)
+        resp = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(resp.status_code, 200)
+
+    def test_not_served_without_a_token_unless_debugging(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 404)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
@@ -0,0 +1,111 @@
+import time
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import ContentReportCount, Post, PostComment, ReportedContent, UserProfile
+from api.feed_common import decode_cursor
+from api.moderation import QUEUE_CURSOR_TYPES, moderation_queue, report_content
+
+
+def _client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+@override_settings(REPORT_AUTO_HIDE_THRESHOLD=3, MODERATOR_USER_IDS={'mod'})
+class ModerationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.reader = UserProfile.objects.create(userId='reader', home_pincode='560001')
+        self.moderator = UserProfile.objects.create(userId='mod')
+        self.spam = Post.objects.create(userId='spammer', mediaType='text', description='spam', pincode='560001')
+        self.fine = Post.objects.create(userId='author', mediaType='text', description='fine', pincode='560001')
+
+    def _feed_ids(self):
+        resp = _client(self.reader).post(reverse('home-feed'), {'limit': 10}, format='json')
+        return resp.data['results']
+
+    def test_threshold_hides_post_from_feed_until_dismissed(self):
+        self.assertEqual(len(self._feed_ids()), 2)
+        for i in range(2):
+            self.assertEqual(report_content(f'r{i}', 'post', self.spam.postId, 'spam'), (i + 1, False))
+        self.assertIsNone(report_content('r0', 'post', self.spam.postId, 'again'))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ReportedContent.objects.create(reporterUserId='r0', contentType='post', contentId=self.spam.postId,
+                                           reason='bypassing report_content')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = _client(self.reader).post(reverse('report-content'), {
+                'content_type': 'post', 'content_id': self.spam.postId, 'reason': 'scam link'
+            }, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.spam.refresh_from_db()
+        self.assertTrue(self.spam.hidden)
+        self.assertEqual(len(self._feed_ids()), 1)
+        counter = ContentReportCount.objects.get(contentType='post', contentId=self.spam.postId)
+        self.assertEqual((counter.report_count, counter.last_reason), (3, 'scam link'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = _client(self.moderator).post(reverse('moderation-resolve'), {
+                'content_type': 'post', 'content_id': self.spam.postId, 'action': 'dismiss'
+            }, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(self._feed_ids()), 2)
+        self.assertFalse(ReportedContent.objects.filter(status='pending').exists())
+        # Resolved items keep counting but aren't hidden again
+        self.assertEqual(report_content('r9', 'post', self.spam.postId, 'spam'), (4, False))
+
+    def test_remove_hides_posts_and_deletes_comments(self):
+        comment = PostComment.objects.create(postId=self.fine.postId, userId='spammer', content='buy now')
+        reply = PostComment.objects.create(postId=self.fine.postId, userId='author', content='no',
+                                           parentCommentId=comment.commentId)
+        for content_type, content_id in (('post', self.spam.postId), ('comment', comment.commentId)):
+            report_content('r0', content_type, content_id, 'spam')
+            with self.captureOnCommitCallbacks(execute=True):
+                resp = _client(self.moderator).post(reverse('moderation-resolve'), {
+                    'content_type': content_type, 'content_id': content_id, 'action': 'remove'
+                }, format='json')
+            self.assertEqual(resp.status_code, 200)
+        self.assertFalse(PostComment.objects.filter(commentId__in=[comment.commentId, reply.commentId]).exists())
+
+        url = reverse('post-detail', args=[self.spam.postId])
+        self.assertEqual(_client(self.reader).get(url).status_code, 404)
+        self.assertEqual(APIClient().get(url).status_code, 404)
+        self.assertEqual(_client(self.moderator).get(url).status_code, 200)
+
+    def test_queue_orders_by_velocity_and_pages(self):
+        report_content('r0', 'post', self.fine.postId, 'rude')
+        for i in range(2):
+            report_content(f'r{i}', 'post', self.spam.postId, 'spam')
+        # An older item with more reports but a lower rate
+        ContentReportCount.objects.filter(contentId=self.fine.postId).update(
+            report_count=10, first_report_epoch=time.time() - 24 * 3600
+        )
+
+        items, cursor = moderation_queue(limit=1)
+        self.assertEqual(items[0]['content_id'], self.spam.postId)
+        items, cursor = moderation_queue(limit=1, cursor=decode_cursor(cursor, *QUEUE_CURSOR_TYPES))
+        self.assertEqual([item['content_id'] for item in items], [self.fine.postId])
+        self.assertIsNone(cursor)
+
+        resp = _client(self.moderator).post(reverse('moderation-queue'), {'limit': 5}, format='json')
+        self.assertEqual([item['content_id'] for item in resp.data['results']], [self.spam.postId, self.fine.postId])
+        self.assertEqual(_client(self.reader).post(reverse('moderation-queue'), {}, format='json').status_code, 403)
+
+    def test_report_validation(self):
+        client = _client(self.reader)
+        url = reverse('report-content')
+        self.assertEqual(client.post(url, {'content_type': 'user', 'content_id': 1, 'reason': 'x'},
+                                     format='json').status_code, 400)
+        self.assertEqual(client.post(url, {'content_type': 'post', 'content_id': '1', 'reason': 'x'},
+                                     format='json').status_code, 400)
+        self.assertEqual(client.post(url, {'content_type': 'post', 'content_id': self.fine.postId, 'reason': ' '},
+                                     format='json').status_code, 400)
+        self.assertEqual(client.post(url, {'content_type': 'post', 'content_id': 999, 'reason': 'x'},
+                                     format='json').status_code, 404)
+        self.assertEqual(APIClient().post(url, {}, format='json').status_code, 401)
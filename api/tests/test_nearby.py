@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import Post, UserProfile
+from api.nearby import bounding_box, nearby_posts
+
+
+class NearbyPostsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserProfile.objects.create(userId='nearby_user', name='Near', home_pincode='560001',
+                                               home_latitude=12.97, home_longitude=77.59)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _make(self, lat, lon):
+        return Post.objects.create(userId='nearby_user', mediaType='text', description=f'{lat},{lon}',
+                                   location={'latitude': lat, 'longitude': lon, 'accuracy': 5})
+
+    def test_coordinates_copied_on_save_and_at_creation(self):
+        post = self._make(12.98, 77.6)
+        self.assertEqual((post.latitude, post.longitude), (12.98, 77.6))
+        post.location = {'latitude': 'north'}
+        post.save()
+        post.refresh_from_db()
+        self.assertIsNone(post.latitude)
+
+        body = {'post_type': 'post', 'content': 'hello', 'pincode_id': 'pincode_home_560001'}
+        resp = self.client.post(reverse('create-post'), body, format='json')
+        self.assertEqual(resp.status_code, 201)
+        created = Post.objects.get(postId=resp.data['data']['post_id'])
+        self.assertEqual((created.latitude, created.longitude), (12.97, 77.59))
+
+        body['location'] = {'latitude': 12.5, 'longitude': 77.0}
+        resp = self.client.post(reverse('create-post'), body, format='json')
+        self.assertEqual(Post.objects.get(postId=resp.data['data']['post_id']).latitude, 12.5)
+
+        body['location'] = {'latitude': 'x'}
+        self.assertEqual(self.client.post(reverse('create-post'), body, format='json').status_code, 400)
+
+    def test_search_orders_by_distance_and_pages_with_cursor(self):
+        closest = self._make(12.971, 77.591)
+        middle = self._make(12.99, 77.59)
+        farthest = self._make(13.0, 77.62)
+        self._make(13.2, 77.59)  # ~25 km away
+        self._make(None, None)
+
+        page, cursor = nearby_posts(12.97, 77.59, 5, limit=2)
+        self.assertEqual([post_id for post_id, _ in page], [closest.postId, middle.postId])
+        self.assertLess(page[0][1], page[1][1])
+
+        with self.assertNumQueries(4):  # block set, candidates, posts, authors
+            resp = self.client.post(reverse('nearby-posts'), {'lat': 12.97, 'long': 77.59, 'radius_km': 5, 'cursor': cursor},
+                                    format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([item['post_id'] for item in resp.data['results']], [farthest.postId])
+        self.assertIsNone(resp.data['next_cursor'])
+        self.assertEqual(resp.data['results'][0]['author']['name'], 'Near')
+
+        bad = {'lat': 12.97, 'long': 77.59, 'radius_km': 500}
+        self.assertEqual(self.client.post(reverse('nearby-posts'), bad, format='json').status_code, 400)
+        bad = {'lat': 12.97, 'long': 77.59, 'cursor': 'not-a-cursor'}
+        self.assertEqual(self.client.post(reverse('nearby-posts'), bad, format='json').status_code, 400)
+
+    def test_search_across_the_antimeridian(self):
+        west = self._make(0.0, -179.99)
+        self._make(0.0, 179.0)  # ~111 km away
+        min_lat, max_lat, lon_ranges = bounding_box(0.0, 179.99, 10)
+        self.assertEqual(len(lon_ranges), 2)
+        page, _ = nearby_posts(0.0, 179.99, 10)
+        self.assertEqual([post_id for post_id, _ in page], [west.postId])
@@ -0,0 +1,67 @@
+import random
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.feed_common import decode_cursor
+from api.geo_grid import Rings, grid_cell, haversine_km
+from api.models import BlockedUser, UserProfile
+from api.people_nearby import PEOPLE_CURSOR_TYPES, nearby_people
+
+
+class NearbyPeopleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.me = UserProfile.objects.create(userId='me', name='Me', home_latitude=12.97, home_longitude=77.59)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.me).access_token}')
+
+    def test_geo_cell_follows_profile_saves(self):
+        user = UserProfile.objects.create(userId='mover', latitude=12.9, longitude=77.5)
+        self.assertEqual(user.geo_cell, grid_cell(12.9, 77.5))
+        user.home_latitude, user.home_longitude = 13.0, 77.6
+        user.save(update_fields=['home_latitude', 'home_longitude'])
+        user.refresh_from_db()
+        self.assertEqual(user.geo_cell, grid_cell(13.0, 77.6))
+        guest = UserProfile.objects.create(userId='guest', latitude=12.97, longitude=77.59, is_guest=True)
+        self.assertIsNone(guest.geo_cell)
+
+    def test_pages_are_in_distance_order_and_skip_blocked_and_guests(self):
+        rng = random.Random(7)
+        for i in range(40):
+            UserProfile.objects.create(userId=f'u{i:02d}', latitude=12.97 + rng.uniform(-0.05, 0.05),
+                                       longitude=77.59 + rng.uniform(-0.05, 0.05))
+        UserProfile.objects.create(userId='guest', latitude=12.97, longitude=77.59, is_guest=True)
+        BlockedUser.objects.create(blockerUserId='me', blockedUserId='u00')
+        BlockedUser.objects.create(blockerUserId='u01', blockedUserId='me')
+        expected = sorted(
+            (haversine_km(12.97, 77.59, u.latitude, u.longitude), u.userId)
+            for u in UserProfile.objects.exclude(userId__in=['me', 'u00', 'u01', 'guest'])
+        )
+        expected = [user_id for km, user_id in expected if km <= 5]
+
+        seen, cursor = [], None
+        while True:
+            people, next_cursor = nearby_people('me', 12.97, 77.59, 5, limit=7, cursor=cursor)
+            seen.extend(person['user_id'] for person in people)
+            if next_cursor is None:
+                break
+            cursor = decode_cursor(next_cursor, *PEOPLE_CURSOR_TYPES)
+        self.assertEqual(seen, expected)
+
+        with self.assertNumQueries(5):  # profile, block set, ring bands 0, 1-2, 3-6
+            resp = self.client.post(reverse('nearby-people'), {'limit': 50}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([person['user_id'] for person in resp.data['results']], expected)
+        self.assertFalse(resp.data['has_more'])
+
+    def test_ring_bands_tile_the_grid(self):
+        rings = Rings(12.97, 77.59)
+        cells = [cell for low, high in rings.band_ranges(0, 3) for cell in range(low, high + 1)]
+        split = [cell for start, end in ((0, 1), (1, 3)) for low, high in rings.band_ranges(start, end)
+                 for cell in range(low, high + 1)]
+        self.assertEqual(sorted(cells), sorted(split))
+        self.assertEqual(len(cells), len(set(cells)))
+        self.assertGreater(rings.covered_km(3), 2 * 1.1)
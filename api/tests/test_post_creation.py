@@ -0,0 +1,105 @@
+import threading
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest.mock import patch
+
+from api.background import run_after_commit
+from api.constants import PINCODE_HOME_ID
+from api.models import Interest, Post, PostInterest, SearchDocument, UserProfile
+
+
+class PostCreationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        Interest.objects.create(interest_id='music', name='Music')
+        self.user = UserProfile.objects.create(userId='poster', name='Poster', home_pincode='560001',
+                                               office_pincode='110001', interests=['music'])
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def _create(self, url='create-post', **body):
+        return self.client.post(reverse(url), {'post_type': 'post', 'content': 'hello', **body}, format='json')
+
+    def test_creation_is_one_write_with_side_effects_after_commit(self):
+        self._create(pincode_id='pincode_home_560001')  # warms the interest catalog
+        updated_at = UserProfile.objects.get(userId='poster').updatedAt
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertNumQueries(4):  # auth profile, catalog version, insert, feed version
+                resp = self._create(pincode_id='pincode_home_560001')
+        self.assertEqual(resp.status_code, 201)
+        post_id = resp.data['data']['post_id']
+        self.assertFalse(PostInterest.objects.filter(postId=post_id).exists())
+        self.assertFalse(SearchDocument.objects.filter(kind='post', object_id=str(post_id)).exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(list(PostInterest.objects.filter(postId=post_id).values_list('interest_id', flat=True)),
+                         ['music'])
+        self.assertTrue(SearchDocument.objects.filter(kind='post', object_id=str(post_id)).exists())
+        self.assertEqual(UserProfile.objects.get(userId='poster').updatedAt, updated_at)
+
+    def test_create_and_save_share_validation(self):
+        for url in ('create-post', 'save-post'):
+            self.assertEqual(self._create(url, pincode_id='pincode_home_560001', content=' ').status_code, 400)
+            self.assertEqual(self._create(url, pincode_id='pincode_home_560001', post_type='x').status_code, 400)
+            self.assertEqual(self._create(url, pincode_id='pincode_home_56').status_code, 400)
+            self.assertEqual(self._create(url, pincode_id='home_560001').status_code, 400)
+
+        # /create-post only takes the user's own home/office pincode
+        resp = self._create(pincode_id='pincode_office_999999')
+        self.assertEqual(resp.data['error']['message'], 'Provided pincode does not match user office pincode')
+        self.assertEqual(self._create(pincode_id=PINCODE_HOME_ID).status_code, 400)
+
+        # /save-post resolves the profile ids and accepts any legacy id
+        resp = self._create('save-post', pincode_id=PINCODE_HOME_ID, photo_url=' https://example.com/a.jpg ')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(resp.data['message'], 'Post saved successfully')
+        post = Post.objects.get(postId=resp.data['data']['post_id'])
+        self.assertEqual((post.pincode, post.mediaType, post.mediaURL), ('560001', 'image', 'https://example.com/a.jpg'))
+        self.assertEqual(self._create('save-post', pincode_id='pincode_other_999999').data['data']['pincode'], '999999')
+
+    def test_tagging_after_delete_leaves_no_rows(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post_id = self._create(pincode_id='pincode_home_560001').data['data']['post_id']
+        Post.objects.filter(postId=post_id).delete()
+        for callback in callbacks:
+            callback()
+        self.assertFalse(PostInterest.objects.filter(postId=post_id).exists())
+
+    def test_insert_failure_is_logged(self):
+        with patch('api.feed_views.create_post', side_effect=RuntimeError('db down')):
+            with self.assertLogs('api.feed_views', 'ERROR') as logs:
+                resp = self._create('save-post', pincode_id='pincode_home_560001')
+        self.assertEqual(resp.status_code, 500)
+        self.assertEqual(resp.data['error']['message'], 'Failed to save post')
+        self.assertIn('db down', logs.output[0])
+
+    def test_posts_endpoint_tags_interests(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self.client.post(reverse('post-list'), {'post_type': 'post', 'description': 'hi', 'mediaType': 'text',
+                                                           'pincode': '560001'}, format='json')
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(list(PostInterest.objects.filter(postId=resp.data['postId'])
+                              .values_list('interest_id', flat=True)), ['music'])
+
+        resp = self.client.post(reverse('post-list'), {'description': 'hi', 'mediaType': 'text',
+                                                       'interests': ['cooking']}, format='json')
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('interests', resp.data)
+
+    @override_settings(BACKGROUND_TASKS_INLINE=False)
+    def test_background_tasks_run_on_the_pool(self):
+        done = threading.Event()
+
+        def fail():
+            raise RuntimeError('lost, not raised')
+
+        with self.assertLogs('api.background', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                run_after_commit(fail)
+                run_after_commit(done.set)
+            self.assertTrue(done.wait(5))
@@ -0,0 +1,43 @@
+from django.test import TestCase
+from django.utils import timezone
+from datetime import timedelta
+
+from api.models import OTPVerification, PendingSignup
+from api.maintenance import purge_otp_verifications, purge_pending_signups
+
+
+class PurgeAuthTablesTest(TestCase):
+    def _pending(self, identifier):
+        return PendingSignup.objects.create(
+            identifier=identifier,
+            email=identifier,
+            password='hashed_dummy',
+            latitude=12.0,
+            longitude=77.0,
+            pincode='560001',
+            city='Bengaluru',
+            state='Karnataka',
+            country='India'
+        )
+
+    def test_purges_expired_and_verified_otps_in_batches(self):
+        now = timezone.now()
+        for i in range(5):
+            OTPVerification.objects.create(identifier=f'old{i}@example.com', otp_code='111111', expires_at=now - timedelta(minutes=1))
+        OTPVerification.objects.create(identifier='done@example.com', otp_code='222222', expires_at=now + timedelta(minutes=5), is_verified=True)
+        live = OTPVerification.objects.create(identifier='live@example.com', otp_code='333333', expires_at=now + timedelta(minutes=5))
+
+        deleted = purge_otp_verifications(batch_size=2, now=now)
+
+        self.assertEqual(deleted, 6)
+        self.assertEqual(list(OTPVerification.objects.values_list('pk', flat=True)), [live.pk])
+
+    def test_purges_only_stale_pending_signups(self):
+        stale = self._pending('stale@example.com')
+        PendingSignup.objects.filter(pk=stale.pk).update(created_at=timezone.now() - timedelta(days=2))
+        fresh = self._pending('fresh@example.com')
+
+        deleted = purge_pending_signups(max_age=timedelta(days=1))
+
+        self.assertEqual(deleted, 1)
+        self.assertEqual(list(PendingSignup.objects.values_list('pk', flat=True)), [fresh.pk])
@@ -0,0 +1,27 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from api.query_plans import seq_scanned_tables
+
+
+class SeqScanParsingTest(SimpleTestCase):
+    def test_postgres_plan(self):
+        plan = (
+            'Limit  (cost=0.29..8.31 rows=1 width=64)\n'
+            '  ->  Seq Scan on "followRequests"  (cost=0.00..35.50 rows=10 width=64)\n'
+            '  ->  Index Scan using posts_pincode_ts_idx on posts  (cost=0.29..8.31 rows=1 width=64)'
+        )
+        self.assertEqual(seq_scanned_tables(plan, 'postgresql'), {'followRequests'})
+
+    def test_sqlite_plan(self):
+        self.assertEqual(seq_scanned_tables('2 0 0 SCAN posts', 'sqlite'), {'posts'})
+        self.assertEqual(seq_scanned_tables('4 0 0 SEARCH posts USING INDEX posts_user_ts_idx (userId=?)', 'sqlite'), set())
+
+
+class CheckQueryPlansCommandTest(TestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        # --min-rows 0 turns any full scan into a failure, even on empty tables
+        call_command('check_query_plans', '--min-rows', '0', stdout=out)
+        self.assertNotIn('sequential scan', out.getvalue())
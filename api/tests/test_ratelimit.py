@@ -0,0 +1,53 @@
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from unittest.mock import patch
+
+from api.ratelimit import get_client_ip, get_rate_limit_store, hit
+
+
+@override_settings(
+    RATE_LIMIT_STORE='api.ratelimit.LocalMemoryRateLimitStore',
+    RATE_LIMITS={'otp_send': {'identifier': (2, 3600), 'device': (3, 3600)}},
+)
+class RateLimitTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        get_rate_limit_store().clear()
+
+    def test_sliding_window_weights_previous_bucket(self):
+        # 3 hits at the very end of one window, limit 4
+        for _ in range(3):
+            self.assertTrue(hit('t', 'identifier', 'x', 4, 100, now=199.0)[0])
+        # Early in the next window most of the previous bucket still counts
+        self.assertTrue(hit('t', 'identifier', 'x', 4, 100, now=201.0)[0])
+        self.assertFalse(hit('t', 'identifier', 'x', 4, 100, now=202.0)[0])
+        # Late in the window the previous bucket has mostly slid out
+        self.assertTrue(hit('t', 'identifier', 'x', 4, 100, now=290.0)[0])
+
+    @patch('api.auth_views.handle_otp')
+    def test_resend_rejected_before_sending_once_over_limit(self, mock_handle_otp):
+        mock_handle_otp.return_value = {'show_otp': False}
+        url = reverse('resend-otp')
+        for _ in range(2):
+            resp = self.client.post(url, {'identifier': 'spam@example.com'}, format='json', HTTP_X_DEVICE_ID='device-rl')
+            self.assertEqual(resp.status_code, 200)
+
+        resp = self.client.post(url, {'identifier': 'spam@example.com'}, format='json', HTTP_X_DEVICE_ID='device-rl')
+        self.assertEqual(resp.status_code, 429)
+        self.assertIn('Retry-After', resp)
+        self.assertEqual(mock_handle_otp.call_count, 2)
+
+        # Device limit still applies across identifiers
+        resp = self.client.post(url, {'identifier': 'other@example.com'}, format='json', HTTP_X_DEVICE_ID='device-rl')
+        self.assertEqual(resp.status_code, 429)
+
+    def test_client_ip_ignores_client_supplied_forwarded_hops(self):
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='6.6.6.6, 1.2.3.4, 10.0.0.2', REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(get_client_ip(request), '10.0.0.3')
+        with self.settings(RATE_LIMIT_TRUST_FORWARDED_FOR=True):
+            self.assertEqual(get_client_ip(request), '10.0.0.2')
+            with self.settings(RATE_LIMIT_TRUSTED_PROXY_COUNT=2):
+                self.assertEqual(get_client_ip(request), '1.2.3.4')
+            with self.settings(RATE_LIMIT_TRUSTED_PROXY_COUNT=4):
+                self.assertEqual(get_client_ip(request), '10.0.0.3')
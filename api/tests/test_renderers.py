@@ -0,0 +1,38 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from uuid import UUID
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_output_matches_drf_json_renderer(self):
+        data = {
+            'when': datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'price': Decimal('12.50'),
+            'label': gettext_lazy('Posts'),
+            'id': UUID('12345678-1234-5678-1234-567812345678'),
+            'text': 'café   line',
+            1: [1.5, None, True],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_oversized_int_falls_back_and_indent_is_honoured(self):
+        self.assertEqual(ORJSONRenderer().render({'n': 2 ** 70}), b'{"n":1180591620717411303424}')
+        body = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(body, b'{\n  "a": 1\n}')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def test_parses_and_rejects_invalid_json(self):
+        parser = ORJSONParser()
+        self.assertEqual(parser.parse(BytesIO('{"a": "ü"}'.encode())), {'a': 'ü'})
+        with self.assertRaises(ParseError):
+            parser.parse(BytesIO(b'{"a": NaN}'))
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from unittest.mock import patch
+
+from api.feed_views import HomeFeedView
+from api.instrumentation import QueryBudgetExceeded, collect_request_metrics, track_external
+from api.models import Post, UserProfile
+
+
+class RequestMetricsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserProfile.objects.create(userId='metrics_user', email='metrics@example.com', home_pincode='560001')
+        for i in range(5):
+            author = UserProfile.objects.create(userId=f'author_{i}', name=f'Author {i}')
+            Post.objects.create(userId=author.userId, mediaType='text', description='hi', pincode='560001')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_home_feed_stays_within_query_budget(self):
+        # One author query for the whole page, however many authors it has
+        resp = self.client.post(reverse('home-feed'), {'limit': 10}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('db;dur=', resp['Server-Timing'])
+        self.assertIn('render;dur=', resp['Server-Timing'])
+
+    def test_home_feed_pages_without_counting(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.post(reverse('home-feed'), {'limit': 4}, format='json')
+        self.assertFalse([q for q in queries.captured_queries if 'COUNT(' in q['sql'].upper()])
+        self.assertEqual(len(resp.data['results']), 4)
+        self.assertTrue(resp.data['has_more'])
+        resp = self.client.post(reverse('home-feed'), {'limit': 5}, format='json')
+        self.assertEqual(len(resp.data['results']), 5)
+        self.assertFalse(resp.data['has_more'])
+
+    def test_exceeding_query_budget_fails(self):
+        with patch.object(HomeFeedView, 'query_budget', 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.post(reverse('home-feed'), {'limit': 10}, format='json')
+
+    def test_external_calls_are_timed(self):
+        with collect_request_metrics() as metrics:
+            with track_external('sendmator'):
+                pass
+            UserProfile.objects.count()
+        self.assertEqual(metrics.queries, 1)
+        self.assertIn('sendmator', metrics.external_ms)
+        self.assertIn('sendmator;dur=', metrics.server_timing(1.0))
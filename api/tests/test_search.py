@@ -0,0 +1,106 @@
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.models import BlockedUser, Post, SearchDocument, UserProfile
+from api.feed_common import decode_cursor
+from api.search import SEARCH_CURSOR_TYPES, search
+
+
+class SearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = UserProfile.objects.create(userId='searcher', name='Yoga Teacher', bio='Morning classes',
+                                                   home_pincode='560001')
+            UserProfile.objects.create(userId='guest_1', name='Yoga Guest', is_guest=True)
+            self.posts = [
+                Post.objects.create(userId='searcher', mediaType='text', pincode='560001',
+                                    description=f'Yoga class number {i} in the park')
+                for i in range(5)
+            ]
+            Post.objects.create(userId='searcher', mediaType='text', pincode='110001', description='Yoga in Delhi')
+            Post.objects.create(userId='searcher', mediaType='text', pincode='560001', description='Lost cat')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_prefix_terms_pincode_scope_and_keyset_pages(self):
+        hits, _ = search(['yog', 'cla'], pincode='560001', limit=50)
+        self.assertEqual(sorted(int(object_id) for kind, object_id, _ in hits if kind == 'post'),
+                         sorted(post.postId for post in self.posts))
+        self.assertIn(('user', 'searcher'), [(kind, object_id) for kind, object_id, _ in hits])
+
+        seen, after = [], None
+        while True:
+            hits, cursor = search(['yoga'], kind='post', limit=2, after=after)
+            seen.extend(object_id for _, object_id, _ in hits)
+            if cursor is None:
+                break
+            after = decode_cursor(cursor, *SEARCH_CURSOR_TYPES)
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(len(set(seen)), 6)
+
+    def test_index_follows_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[0].description = 'Chess club'
+            self.posts[0].save()
+            self.posts[1].delete()
+        ids = {object_id for _, object_id, _ in search(['yoga'], kind='post', limit=50)[0]}
+        self.assertNotIn(str(self.posts[0].postId), ids)
+        self.assertNotIn(str(self.posts[1].postId), ids)
+        self.assertEqual(search(['chess'])[0][0][1], str(self.posts[0].postId))
+        self.assertFalse(SearchDocument.objects.filter(kind='user', object_id='guest_1').exists())
+
+        # Tasks that run out of order still end on the latest state
+        with self.captureOnCommitCallbacks() as created:
+            post = Post.objects.create(userId='searcher', mediaType='text', pincode='560001', description='Chess')
+        with self.captureOnCommitCallbacks() as deleted:
+            post.delete()
+        for callback in deleted + created:
+            callback()
+        self.assertFalse(SearchDocument.objects.filter(kind='post', object_id=str(post.postId)).exists())
+
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(SearchDocument.objects.filter(kind='post').count(), 6)
+
+    def test_search_endpoint(self):
+        with self.assertNumQueries(4):  # block set, search, posts, users
+            resp = self.client.post(reverse('search'), {'q': 'yoga'}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(resp.data['results']), 7)
+        self.assertEqual(resp.data['results'][0]['type'], 'user')  # name matches rank above post text
+        self.assertEqual(resp.data['results'][0]['name'], 'Yoga Teacher')
+
+        resp = self.client.post(reverse('search'), {'q': 'yoga', 'type': 'posts', 'limit': 4}, format='json')
+        self.assertEqual(len(resp.data['results']), 4)
+        self.assertTrue(resp.data['has_more'])
+        self.assertEqual(resp.data['results'][0]['author']['name'], 'Yoga Teacher')
+        resp = self.client.post(reverse('search'), {'q': 'yoga', 'type': 'posts', 'cursor': resp.data['next_cursor']},
+                                format='json')
+        self.assertEqual(len(resp.data['results']), 2)
+
+        self.assertEqual(self.client.post(reverse('search'), {'q': 'y'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(reverse('search'), {'q': 'yoga', 'type': 'x'}, format='json').status_code, 400)
+
+    def test_hidden_posts_and_blocked_users_take_no_page_slots(self):
+        Post.objects.filter(postId__in=[post.postId for post in self.posts[:3]]).update(hidden=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.create(userId='troll', name='Yoga Troll')
+            troll_post = Post.objects.create(userId='troll', mediaType='text', pincode='560001', description='Yoga spam')
+        BlockedUser.objects.create(blockerUserId='searcher', blockedUserId='troll')
+
+        delhi = Post.objects.get(pincode='110001')
+        hits, _ = search(['yoga'], limit=50, excluded_authors={'troll'})
+        self.assertEqual({object_id for _, object_id, _ in hits},
+                         {'searcher', str(self.posts[3].postId), str(self.posts[4].postId), str(delhi.postId)})
+        hits, _ = search(['yoga'], limit=50)
+        self.assertEqual(len(hits), 6)  # blocks only apply when passed; hidden posts never match
+
+        resp = self.client.post(reverse('search'), {'q': 'yoga', 'limit': 3}, format='json')
+        self.assertEqual(len(resp.data['results']), 3)
+        self.assertNotIn(troll_post.postId, [result.get('post_id') for result in resp.data['results']])
@@ -0,0 +1,62 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from unittest.mock import patch
+
+from api.instrumentation import QueryBudgetExceeded
+from api.models import Chat, Message, Post
+from api.serializers import MessageSerializer, PostSerializer
+from api.streaming import stream_json_list
+from api.views import UserPostsView
+
+
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+class StreamJsonListTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_matches_json_renderer_output(self):
+        Post.objects.create(userId='streamer', mediaType='text', description='café   line', pincode='560001')
+        Post.objects.create(userId='streamer', mediaType='text', description='second', pincode='560001')
+        posts = Post.objects.filter(userId='streamer')
+
+        expected = JSONRenderer().render(PostSerializer(posts, many=True).data)
+        self.assertEqual(_body(stream_json_list(posts, PostSerializer)), expected)
+
+    def test_empty_and_multi_chunk_lists(self):
+        self.assertEqual(_body(self.client.get(reverse('user-posts', args=['nobody']))), b'[]')
+
+        chat = Chat.objects.create(users=['a', 'b'])
+        Message.objects.bulk_create(
+            Message(chatId=chat.chatId, senderId='a', content=f'm{i}') for i in range(250)
+        )
+        resp = self.client.get(reverse('chat-messages', args=[chat.chatId]))
+        self.assertEqual(resp['Content-Type'], 'application/json')
+        chunks = list(resp.streaming_content)
+        self.assertGreater(len(chunks), 3)
+
+        messages = json.loads(b''.join(chunks))
+        self.assertEqual(len(messages), 250)
+        self.assertEqual(messages, MessageSerializer(Message.objects.filter(chatId=chat.chatId), many=True).data)
+
+    def test_viewset_list_streams(self):
+        Post.objects.create(userId='streamer', mediaType='text', description='hi', pincode='560001')
+        resp = self.client.get(reverse('post-list'))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(json.loads(_body(resp))), 1)
+
+    def test_body_queries_count_against_the_budget(self):
+        Post.objects.create(userId='streamer', mediaType='text', description='hi', pincode='560001')
+        with self.assertLogs('api.requests', 'INFO') as logs:
+            _body(self.client.get(reverse('user-posts', args=['streamer'])))
+        self.assertEqual(json.loads(logs.records[-1].getMessage())['queries'], 1)
+
+        with patch.object(UserPostsView, 'query_budget', 0):
+            resp = self.client.get(reverse('user-posts', args=['streamer']))
+            with self.assertRaises(QueryBudgetExceeded):
+                _body(resp)
@@ -0,0 +1,62 @@
+from collections import Counter
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.models import Chat, Follower, Message, Post, PostComment, PostLike, UserProfile
+from api.people_nearby import backfill_geo_cells, nearby_people
+from api.synthetic import seed_synthetic_data
+
+
+VOLUMES = dict(users=200, posts=1000, followers=600, likes=1500, comments=300, chats=20, messages=200, pincodes=10, batch_size=128)
+
+
+class SeedSyntheticTest(TestCase):
+    def _snapshot(self):
+        return (
+            list(Post.objects.order_by('postId').values_list('userId', 'pincode', 'post_type')),
+            list(Follower.objects.order_by('followerId', 'followingId').values_list('followerId', 'followingId')),
+        )
+
+    def test_same_seed_gives_same_rows(self):
+        seed_synthetic_data(seed=7, **VOLUMES)
+        first = self._snapshot()
+        for model in (UserProfile, Post, Follower, PostLike, PostComment, Chat, Message):
+            model.objects.all().delete()
+
+        seed_synthetic_data(seed=7, **VOLUMES)
+        self.assertEqual(self._snapshot(), first)
+
+    def test_pincode_popularity_is_skewed_and_timestamps_spread(self):
+        dataset = seed_synthetic_data(seed=1, **VOLUMES)
+        self.assertEqual(dataset.counts['posts'], 1000)
+        self.assertEqual(Message.objects.count(), 200)
+
+        per_pincode = Counter(Post.objects.values_list('pincode', flat=True)).most_common()
+        self.assertGreater(per_pincode[0][1], 3 * per_pincode[-1][1])
+
+        newest = Post.objects.order_by('-timestamp').first().timestamp
+        oldest = Post.objects.order_by('timestamp').first().timestamp
+        self.assertGreater((newest - oldest).days, 30)
+
+    def test_command_refuses_to_seed_twice(self):
+        call_command('seed_synthetic', '--noinput', '--users', '5', '--posts', '5', '--followers', '5',
+                     '--likes', '5', '--comments', '5', '--chats', '2', '--messages', '5', '--pincodes', '2',
+                     stdout=StringIO())
+        with self.assertRaisesMessage(Exception, 'already exist'):
+            call_command('seed_synthetic', '--noinput', '--users', '5', stdout=StringIO())
+
+    def test_users_and_posts_are_located(self):
+        seed_synthetic_data(seed=3, **VOLUMES)
+        self.assertFalse(UserProfile.objects.filter(geo_cell__isnull=True).exists())
+        self.assertFalse(Post.objects.filter(latitude__isnull=True).exists())
+        self.assertEqual(backfill_geo_cells(), 0)  # already what save() would have set
+
+        user = UserProfile.objects.get(userId='syn_00000000')
+        people, _ = nearby_people(user.userId, user.home_latitude, user.home_longitude, 5)
+        self.assertTrue(people)
+
+        UserProfile.objects.filter(userId=user.userId).update(geo_cell=None)
+        call_command('backfill_geo_cells', '--batch-size', '50', stdout=StringIO())
+        user.refresh_from_db()
+        self.assertIsNotNone(user.geo_cell)
@@ -1,4 +1,4 @@
-from .views import HealthCheckView
+from .views import HealthCheckView, ReadinessView, MetricsView
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
@@ -14,7 +14,10 @@ from .auth_views import (
     VerifyOTPView, SaveInterestsView, AppInitView, ResendOTPView, DebugGetOTPView
 )
 from .auth_views import InternalCheckSMTPView
-from .feed_views import HomeFeedView, CreatePostView, SavePostView
+from .feed_views import (
+    HomeFeedView, CreatePostView, SavePostView, NearbyPostsView, NearbyPeopleView, SearchView,
+    BlockUserView, ReportContentView, ModerationQueueView
+)
 
 # Create router for ViewSets
 router = DefaultRouter()
@@ -29,6 +32,9 @@ router.register(r'chats', ChatViewSet, basename='chat')
 urlpatterns = [
     # Health check endpoint
     path('health/', HealthCheckView.as_view(), name='health'),
+    path('health/live/', HealthCheckView.as_view(), name='health-live'),
+    path('health/ready/', ReadinessView.as_view(), name='health-ready'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     # App initialization
     path('app-init/', AppInitView.as_view(), name='app-init'),
 
@@ -54,6 +60,19 @@ urlpatterns = [
     
     # Home Feed endpoint
     path('home-feed/', HomeFeedView.as_view(), name='home-feed'),
+    path('nearby-posts/', NearbyPostsView.as_view(), name='nearby-posts'),
+    path('nearby-people/', NearbyPeopleView.as_view(), name='nearby-people'),
+    path('search/', SearchView.as_view(), name='search'),
+
+    # Blocking
+    path('block-user/', BlockUserView.as_view(), name='block-user'),
+    path('unblock-user/', BlockUserView.as_view(unblock=True), name='unblock-user'),
+    path('blocked-users/', BlockUserView.as_view(), name='blocked-users'),
+
+    # Reports and moderation
+    path('report-content/', ReportContentView.as_view(), name='report-content'),
+    path('moderation-queue/', ModerationQueueView.as_view(), name='moderation-queue'),
+    path('moderation-queue/resolve/', ModerationQueueView.as_view(resolve=True), name='moderation-resolve'),
     
     # Create Post endpoints
     path('create-post/', CreatePostView.as_view(), name='create-post'),
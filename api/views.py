@@ -1,11 +1,53 @@
+import hmac
 from rest_framework.views import APIView, Response
+from django.conf import settings
+from django.http import HttpResponse
+from .metrics import render_metrics
+from .health import readiness
 
-# Health check endpoint
+# Health check endpoint (liveness: the process is up; touches no dependencies)
 class HealthCheckView(APIView):
     authentication_classes = []
     permission_classes = []
     def get(self, request):
         return Response({'status': 'ok'}, status=200)
+
+
+class ReadinessView(APIView):
+    """
+    GET /health/ready - 200 when this worker can serve traffic, 503 otherwise
+    Response: {"status": "ready"|"not_ready", "checks": {database, cache, otp_backlog, replicas, circuit_breakers}}
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        ready, checks = readiness()
+        return Response(
+            {'status': 'ready' if ready else 'not_ready', 'checks': checks},
+            status=200 if ready else 503
+        )
+
+
+class MetricsView(APIView):
+    """
+    GET /metrics - Prometheus exposition of request, DB, outbound call and cache metrics
+    Requires `Authorization: Bearer <METRICS_AUTH_TOKEN>`; without that setting
+    the endpoint is only served with DEBUG on
+    """
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        token = getattr(settings, 'METRICS_AUTH_TOKEN', None)
+        if not token and not settings.DEBUG:
+            return Response({'error': 'Not found'}, status=404)
+        # Constant-time comparison, so response timing doesn't reveal how much of the token matched
+        provided = request.META.get('HTTP_AUTHORIZATION', '')
+        if token and not hmac.compare_digest(provided.encode(), f'Bearer {token}'.encode()):
+            return Response({'error': 'Invalid metrics token'}, status=403)
+        payload, content_type = render_metrics()
+        return HttpResponse(payload, content_type=content_type)
 from rest_framework.views import APIView, Response
 from rest_framework.permissions import IsAuthenticated
 from django.conf import settings
@@ -72,6 +114,8 @@ class SavePincodeView(APIView):
         office_address = request.data.get('office-address')
         
         user = request.user
+        # Only the columns set here are written, so a concurrent change to the rest of the row isn't overwritten
+        updated_fields = []
         
         if home_address:
             lat = home_address.get('lat')
@@ -89,8 +133,11 @@ class SavePincodeView(APIView):
                     user.home_city = location_details['city']
                     user.home_state = location_details['state']
                     user.home_country = location_details['country']
+                    updated_fields += ['home_latitude', 'home_longitude', 'home_pincode', 'home_city', 'home_state',
+                                       'home_country']
                     if address:
                         user.personal_address = address
+                        updated_fields.append('personal_address')
                 except (ValueError, TypeError):
                     return Response({'error': 'Invalid lat/long for home'}, status=400)
         
@@ -110,13 +157,17 @@ class SavePincodeView(APIView):
                     user.office_city = location_details['city']
                     user.office_state = location_details['state']
                     user.office_country = location_details['country']
+                    updated_fields += ['office_latitude', 'office_longitude', 'office_pincode', 'office_city',
+                                       'office_state', 'office_country']
                     if address:
                         user.work_address = address
+                        updated_fields.append('work_address')
                 except (ValueError, TypeError):
                     return Response({'error': 'Invalid lat/long for office'}, status=400)
         
         try:
-            user.save()
+            if updated_fields:
+                user.save(update_fields=[*updated_fields, 'updatedAt'])
         except Exception as e:
             return Response({'error': f'Failed to save user: {str(e)}'}, status=500)
         
@@ -140,6 +191,7 @@ class SavePincodeView(APIView):
         return Response(response_data, status=200)
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
@@ -152,11 +204,17 @@ from .serializers import (
     ChatWithMessagesSerializer
 )
 from .utils import create_follower_relationship
+from .streaming import StreamingListMixin, stream_json_list
+from .conditional import not_modified, set_validators
+from .background import run_after_commit
+from .blocks import block_set
+from .interest_feed import post_interest_ids, tag_post
+from .moderation import is_moderator
 
 
 # ========== USER VIEWS ==========
 
-class UserProfileViewSet(viewsets.ModelViewSet):
+class UserProfileViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for UserProfile
     GET /users/{userId} - Retrieve user profile
@@ -165,6 +223,17 @@ class UserProfileViewSet(viewsets.ModelViewSet):
     serializer_class = UserProfileSerializer
     lookup_field = 'userId'
     
+    def retrieve(self, request, *args, **kwargs):
+        """GET /users/{userId} - 304 when the profile is unchanged since If-None-Match/If-Modified-Since"""
+        updated_at = UserProfile.objects.filter(userId=kwargs['userId']).values_list('updatedAt', flat=True).first()
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = f"{kwargs['userId']}:{updated_at.isoformat()}"
+        unchanged = not_modified(request, etag, updated_at)
+        if unchanged is not None:
+            return unchanged
+        return set_validators(super().retrieve(request, *args, **kwargs), etag, updated_at)
+    
     @action(detail=True, methods=['get'], url_path='following')
     def following(self, request, userId=None):
         """GET /users/{userId}/following - Get list of users this user is following"""
@@ -274,7 +343,7 @@ class UserProfileViewSet(viewsets.ModelViewSet):
 
 # ========== FOLLOW REQUEST VIEWS ==========
 
-class FollowRequestViewSet(viewsets.ModelViewSet):
+class FollowRequestViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for FollowRequest
     GET /followRequests/{documentId}
@@ -301,7 +370,7 @@ class FollowRequestViewSet(viewsets.ModelViewSet):
 
 # ========== FOLLOWER VIEWS ==========
 
-class FollowerViewSet(viewsets.ReadOnlyModelViewSet):
+class FollowerViewSet(StreamingListMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Follower
     GET /followers/{documentId}
@@ -313,7 +382,7 @@ class FollowerViewSet(viewsets.ReadOnlyModelViewSet):
 
 # ========== POST VIEWS ==========
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Post
     GET /posts/{postId}
@@ -328,25 +397,40 @@ class PostViewSet(viewsets.ModelViewSet):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [IsAuthenticated()]
         return []
+
+    def get_queryset(self):
+        """Posts hidden after reports are only visible to moderators"""
+        if self.request.user.is_authenticated and is_moderator(self.request.user.userId):
+            return Post.objects.all()
+        return Post.objects.filter(hidden=False)
     
     def perform_create(self, serializer):
-        """Set the userId from the authenticated user when creating a post"""
-        serializer.save(userId=self.request.user.userId)
+        """Set the userId from the authenticated user and tag the post for the interest feed"""
+        user = self.request.user
+        interest_ids, error = post_interest_ids(self.request.data.get('interests'), user.interests)
+        if error:
+            raise ValidationError({'interests': error})
+        post = serializer.save(userId=user.userId)
+        run_after_commit(tag_post, post, interest_ids)
 
 
 class UserPostsView(APIView):
     """
-    GET /users/{userId}/posts - Get all posts by a user
+    GET /users/{userId}/posts - Get all posts by a user, except ones hidden after reports
+    Empty when the caller and the user have blocked each other (either way)
     """
+    query_budget = 2  # block set, posts
+
     def get(self, request, userId):
-        posts = Post.objects.filter(userId=userId)
-        serializer = PostSerializer(posts, many=True)
-        return Response(serializer.data)
+        posts = Post.objects.filter(userId=userId, hidden=False)
+        if request.user.is_authenticated and userId in block_set(request.user.userId):
+            posts = posts.none()
+        return stream_json_list(posts, PostSerializer)
 
 
 # ========== STORY VIEWS ==========
 
-class StoryViewSet(viewsets.ModelViewSet):
+class StoryViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Story
     GET /stories/{storyId}
@@ -361,6 +445,8 @@ class UserStoriesView(APIView):
     """
     GET /users/{userId}/stories - Get all active (not expired) stories for user
     """
+    query_budget = 1
+
     def get(self, request, userId):
         now = timezone.now()
         stories = Story.objects.filter(userId=userId, expireAt__gt=now)
@@ -370,7 +456,7 @@ class UserStoriesView(APIView):
 
 # ========== CHAT VIEWS ==========
 
-class ChatViewSet(viewsets.ModelViewSet):
+class ChatViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Chat
     GET /chats/{chatId}
@@ -414,8 +500,7 @@ class ChatMessagesView(APIView):
     def get(self, request, chatId):
         """Get all messages for a chat"""
         messages = Message.objects.filter(chatId=chatId)
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        return stream_json_list(messages, MessageSerializer)
     
     def post(self, request, chatId):
         """Send a message and update chat's lastMessage and lastMessageTime"""
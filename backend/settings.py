@@ -57,6 +57,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -66,6 +67,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.ReplicaStickinessMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -99,20 +101,144 @@ SUPABASE_DB_PASSWORD = os.getenv('SUPABASE_DB_PASSWORD', '955Fp4x0TrLoWjha')
 logger.info(f"Database URL: {SUPABASE_URL}")
 logger.info(f"Database password configured: {'Yes' if SUPABASE_DB_PASSWORD else 'No'}")
 
-# Session Pooler connection to Supabase PostgreSQL
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "postgres",
-        "USER": "postgres.qzhfqngedeadnyeqtoqp",
-        "PASSWORD": SUPABASE_DB_PASSWORD,
-        "HOST": "aws-1-ap-southeast-1.pooler.supabase.com",
-        "PORT": "5432",
-        "OPTIONS": {
-            'connect_timeout': 15,
+# DB_ENGINE=sqlite runs against a local two-database SQLite stand-in
+# (default + mirrored replica). Test runs use it unless DB_ENGINE is set.
+# DJANGO_TEST_MODE marks a test run (`manage.py test` sets it; other runners
+# should export it) and switches the test defaults below.
+RUNNING_TESTS = os.getenv('DJANGO_TEST_MODE', 'false').lower() in ['true', '1', 'yes']
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite' if RUNNING_TESTS else 'postgresql').lower()
+
+# Keep connections open between requests instead of paying a fresh TLS
+# handshake to the pooler on every request; health checks drop dead ones.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 15000))
+
+# Optional read replica (same credentials as primary). Request reads go to it;
+# after a client writes, its reads stay on the primary for
+# DB_REPLICA_STICKY_SECONDS (should exceed worst-case replication lag)
+DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST')
+DB_REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 10))
+
+# Views declaring `query_budget` fail the request (and the test) when they run
+# more SQL queries than that under tests; in production they only log a warning
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', str(RUNNING_TESTS)).lower() in ['true', '1', 'yes']
+
+if DB_ENGINE == 'sqlite':
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+        },
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            "TEST": {"MIRROR": "default"},
         },
     }
-}
+else:
+    # Session Pooler connection to Supabase PostgreSQL
+    _pg_options = {
+        'connect_timeout': 15,
+    }
+    if DB_STATEMENT_TIMEOUT_MS:
+        _pg_options['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
+
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv('DB_NAME', "postgres"),
+            "USER": os.getenv('DB_USER', "postgres.qzhfqngedeadnyeqtoqp"),
+            "PASSWORD": SUPABASE_DB_PASSWORD,
+            "HOST": os.getenv('DB_HOST', "aws-1-ap-southeast-1.pooler.supabase.com"),
+            "PORT": os.getenv('DB_PORT', "5432"),
+            "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+            "CONN_HEALTH_CHECKS": True,
+            # Supabase's transaction pooler (port 6543) can't hold server-side cursors
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv('DB_PORT', "5432") == "6543",
+            "OPTIONS": _pg_options,
+        }
+    }
+
+    # Driver-level pooling needs Django >= 5.1 with psycopg 3
+    if os.getenv('DB_POOL', 'False').lower() in ['true', '1', 'yes']:
+        import django
+        if django.VERSION >= (5, 1):
+            DATABASES["default"]["CONN_MAX_AGE"] = 0
+            DATABASES["default"]["OPTIONS"]["pool"] = True
+        else:
+            logger.warning("DB_POOL requested but needs Django >= 5.1; using persistent connections instead")
+
+    if DB_REPLICA_HOST:
+        DATABASES["replica"] = {
+            **DATABASES["default"],
+            "HOST": DB_REPLICA_HOST,
+            "PORT": os.getenv('DB_REPLICA_PORT', DATABASES["default"]["PORT"]),
+            "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+            # Test databases (tests, bench_endpoints) only exist on the primary
+            "TEST": {"MIRROR": "default"},
+        }
+
+DATABASE_ROUTERS = ['api.db_router.PrimaryReplicaRouter']
+
+logger.info(f"Database engine: {DB_ENGINE}, replica configured: {'Yes' if 'replica' in DATABASES else 'No'}")
+
+
+# Cache Configuration
+# Set REDIS_URL to share caches (rate limits etc.) across gunicorn workers;
+# otherwise each worker gets its own in-process cache.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Caches whose invalidation must reach every worker (block sets, auth profiles) are only used with a shared cache
+SHARED_CACHE = bool(REDIS_URL)
+
+logger.info(f"Shared cache configured: {'Yes' if REDIS_URL else 'No'}")
+
+# Seconds the slim auth profile projection is cached for JWT lookups (0 disables; needs SHARED_CACHE)
+AUTH_PROFILE_CACHE_TTL = int(os.getenv('AUTH_PROFILE_CACHE_TTL', 60))
+AUTH_PROFILE_CACHE_ALIAS = 'default'
+
+# /api/metrics/ requires `Authorization: Bearer <token>`; unset, it is only served with DEBUG on
+METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN')
+
+# /api/health/ready/: results are reused for READINESS_CACHE_SECONDS; the worker
+# reports not ready above READINESS_DB_MAX_MS round trip or, when set, more
+# than READINESS_MAX_OTP_BACKLOG pending OTPs
+READINESS_CACHE_SECONDS = int(os.getenv('READINESS_CACHE_SECONDS', 5))
+READINESS_DB_MAX_MS = int(os.getenv('READINESS_DB_MAX_MS', 1000))
+READINESS_MAX_OTP_BACKLOG = int(os.getenv('READINESS_MAX_OTP_BACKLOG')) if os.getenv('READINESS_MAX_OTP_BACKLOG') else None
+
+# Outbound integrations fail fast after this many consecutive errors, for this long
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_BREAKER_FAILURE_THRESHOLD', 5))
+CIRCUIT_BREAKER_RESET_SECONDS = int(os.getenv('CIRCUIT_BREAKER_RESET_SECONDS', 30))
+
+# Home feed ETags change at least this often, bounding how stale a 304'd page
+# (relative post times, author names) can be
+FEED_ETAG_MAX_AGE = int(os.getenv('FEED_ETAG_MAX_AGE', 300))
+
+# /api/get-interests/ ranks by popularity in the nearest pincode area within this distance
+INTEREST_AREA_MAX_KM = float(os.getenv('INTEREST_AREA_MAX_KM', 15))
+
+# Largest radius /api/nearby-posts/ and /api/nearby-people/ accept; bounds the index scans
+NEARBY_MAX_RADIUS_KM = float(os.getenv('NEARBY_MAX_RADIUS_KM', 25))
+
+# A post is hidden from feeds once this many users have reported it, pending review
+REPORT_AUTO_HIDE_THRESHOLD = int(os.getenv('REPORT_AUTO_HIDE_THRESHOLD', 5))
+# Comma-separated userIds allowed to read and resolve /api/moderation-queue/
+MODERATOR_USER_IDS = set(filter(None, os.getenv('MODERATOR_USER_IDS', '').split(',')))
 
 
 # Password validation
@@ -134,6 +260,32 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# PASSWORD_HASHER picks the hasher for new hashes; the rest stay listed so
+# existing hashes still verify and are upgraded on the next successful login.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'argon2').lower()
+_PASSWORD_HASHER_CHOICES = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CHOICES.get(PASSWORD_HASHER, _PASSWORD_HASHER_CHOICES['pbkdf2'])]
+PASSWORD_HASHERS += [h for h in _PASSWORD_HASHER_CHOICES.values() if h not in PASSWORD_HASHERS]
+PASSWORD_HASHERS.append('django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher')
+
+# Login hash verification runs on a bounded per-process pool
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_HASH_QUEUE_TIMEOUT', 2))
+
+# Post-commit side effects (search indexing, interest tags) run on this many
+# threads per process, or inline in the committing thread (tests)
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', 2))
+BACKGROUND_TASKS_INLINE = os.getenv('BACKGROUND_TASKS_INLINE', str(RUNNING_TESTS)).lower() in ['true', '1', 'yes']
+
+logger.info(f"Password hasher: {PASSWORD_HASHERS[0]}")
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -160,12 +312,12 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # REST Framework Configuration
 REST_FRAMEWORK = {
+    # orjson-backed JSON in and out; the browsable API only in development
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ],
+        'api.renderers.ORJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'api.parsers.ORJSONParser',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'api.authentication.UserProfileJWTAuthentication',
@@ -229,6 +381,28 @@ SENDMATOR_API_KEY = os.getenv('SENDMATOR_API_KEY', '')
 
 logger.info(f"Sendmator API key configured: {'Yes' if SENDMATOR_API_KEY else 'No'}")
 
+# Rate Limiting (OTP sends and logins)
+# Each rule is dimension -> (max attempts, window in seconds)
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True').lower() in ['true', '1', 'yes']
+RATE_LIMIT_STORE = 'api.ratelimit.CacheRateLimitStore'
+RATE_LIMIT_CACHE_ALIAS = 'default'
+# Behind a proxy, set RATE_LIMIT_TRUST_FORWARDED_FOR and the number of proxies
+# that append to X-Forwarded-For; the client's IP is the entry the outermost one added
+RATE_LIMIT_TRUST_FORWARDED_FOR = os.getenv('RATE_LIMIT_TRUST_FORWARDED_FOR', 'False').lower() in ['true', '1', 'yes']
+RATE_LIMIT_TRUSTED_PROXY_COUNT = int(os.getenv('RATE_LIMIT_TRUSTED_PROXY_COUNT', 1))
+RATE_LIMITS = {
+    'otp_send': {
+        'identifier': (5, 60 * 60),
+        'device': (10, 60 * 60),
+        'ip': (30, 60 * 60),
+    },
+    'login': {
+        'identifier': (10, 15 * 60),
+        'device': (20, 15 * 60),
+        'ip': (60, 15 * 60),
+    },
+}
+
 # Google Maps API Configuration
 GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
 
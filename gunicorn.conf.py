@@ -0,0 +1,17 @@
+# Loaded automatically by gunicorn from the working directory.
+import os
+import shutil
+import tempfile
+
+# Workers write Prometheus samples here so /api/metrics/ can aggregate them
+# (see api/metrics.py). Cleared on every master start.
+multiproc_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'prometheus_multiproc')
+)
+shutil.rmtree(multiproc_dir, ignore_errors=True)
+os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -7,6 +7,9 @@ import sys
 def main():
     """Run administrative tasks."""
     os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+    if sys.argv[1:2] == ["test"]:
+        # Test defaults (SQLite, strict query budgets, inline background tasks)
+        os.environ.setdefault("DJANGO_TEST_MODE", "true")
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc: